@@ -1,3 +1,14 @@
+import os
+
+# Each serverless instance is short-lived and there can be many of them:
+# open connections per request (through the provider's pooler) instead of
+# keeping a pool per instance. Override with DB_POOL_PROFILE=server.
+os.environ.setdefault("DB_POOL_PROFILE", "serverless")
+# Cold starts: import routers on first use, and serve the schema written by
+# `python db_manager.py openapi api/openapi.json` at build time if present
+os.environ.setdefault("LAZY_ROUTERS", "true")
+os.environ.setdefault("OPENAPI_SCHEMA_FILE", os.path.join(os.path.dirname(os.path.abspath(__file__)), "openapi.json"))
+
 from app.main import app
 
 # Vercel's Python runtime will look for an ASGI application object named `app`.
@@ -1,18 +1,28 @@
-from fastapi import APIRouter, Depends, status, Request
+from fastapi import APIRouter, Depends, status, Request, Response, Query
 from sqlalchemy.orm import Session
 from uuid import UUID
+from typing import Literal, Optional
 from app.database import get_db
+from app.services.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE
+from app.services.fast_json import json_response
+from app.schemas.Page import Page
+from app.schemas.BulkImport import BulkImportResponse
 
-from app.schemas.Users import UserResponse, UserResponseWithID,TeacherCreate, StudentCreate, TeacherAssignSubject, TeacherAssignSubjectResponse, TeacherAssignClass, TeacherAssignClassResponse, TeacherListItem, StudentAssignClassResponse, StudentAssignClass, StudentListItem
+from app.schemas.Users import UserResponse, UserResponseWithID, UserRoleUpdate, TeacherCreate, StudentCreate, TeacherAssignSubject, TeacherAssignSubjectResponse, TeacherAssignClass, TeacherAssignClassResponse, TeacherListItem, StudentAssignClassResponse, StudentAssignClass, StudentListItem
 from app.schemas.Notice import NoticeCreate, NoticeResponse, NoticeResponseWithID
 from app.schemas.Class import ClassCreate, ClassResponse, ClassResponseWithID
 from app.schemas.Subject import SubjectCreate, SubjectResponse, SubjectResponseWithID
 from app.services.admin import create_teacher,  create_student, create_class, create_subject
 from app.services.admin import all_classes, all_users, all_subjects, assign_sub_to_teacher, assign_class_to_teacher, all_teachers , all_student
-from app.services.admin import delete_class, delete_subject, delete_user, teacher_of_class, assing_class_to_student
-from app.services.admin import create_notice, delete_notice, all_notices
+from app.services.admin import delete_class, delete_subject, delete_user, change_user_role, teacher_of_class, assing_class_to_student
+from app.services.admin import assign_subjects_to_teachers, assign_classes_to_teachers, assign_classes_to_students
+from app.services.admin import create_notice, delete_notice, all_notices, hashing_stats, cache_stats, slow_queries, db_health
+from app.services.bulk_import import bulk_import
+from app.services.export import export_rows
 
 
+# List routes return their trusted rows through json_response, skipping
+# response_model validation (see app/services/fast_json.py)
 admin_router = APIRouter()
 
 
@@ -25,21 +35,64 @@ def register_teacher(newTeacherData:TeacherCreate, request:Request, db:Session=D
 def register_student(newStudentData:StudentCreate, request:Request, db:Session=Depends(get_db)):
     return create_student(newStudentUser=newStudentData, db=db, request=request)
 
-@admin_router.get('/all_users', response_model=list[UserResponseWithID], status_code=status.HTTP_200_OK)
-def get_all_users(request:Request, db:Session=Depends(get_db)):
-    return all_users(db=db, request=request)
+# Body is CSV (Content-Type: text/csv, header row first) or JSON lines, one user per line
+@admin_router.post('/bulk_import/students', response_model=BulkImportResponse, status_code=status.HTTP_200_OK)
+async def bulk_import_students(request:Request, db:Session=Depends(get_db)):
+    return await bulk_import('students', db=db, request=request)
+
+@admin_router.post('/bulk_import/teachers', response_model=BulkImportResponse, status_code=status.HTTP_200_OK)
+async def bulk_import_teachers(request:Request, db:Session=Depends(get_db)):
+    return await bulk_import('teachers', db=db, request=request)
+
+# Full roster downloads, streamed row by row: ?format=ndjson (default) or csv
+@admin_router.get('/export/users', status_code=status.HTTP_200_OK)
+def export_users(request:Request, format: Literal["ndjson", "csv"] = "ndjson", db:Session=Depends(get_db)):
+    return export_rows('users', format=format, db=db, request=request)
+
+@admin_router.get('/export/students', status_code=status.HTTP_200_OK)
+def export_students(request:Request, format: Literal["ndjson", "csv"] = "ndjson", db:Session=Depends(get_db)):
+    return export_rows('students', format=format, db=db, request=request)
+
+@admin_router.get('/export/teachers', status_code=status.HTTP_200_OK)
+def export_teachers(request:Request, format: Literal["ndjson", "csv"] = "ndjson", db:Session=Depends(get_db)):
+    return export_rows('teachers', format=format, db=db, request=request)
+
+@admin_router.get('/all_users', response_model=Page[UserResponseWithID], status_code=status.HTTP_200_OK)
+def get_all_users(request:Request, limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE), cursor: Optional[str] = None,
+                  role: Optional[Literal["admin", "teacher", "student"]] = None, db:Session=Depends(get_db)):
+    return json_response(all_users(db=db, request=request, limit=limit, cursor=cursor, role=role))
 
 @admin_router.delete('/delete_user/{user_id}', status_code=status.HTTP_204_NO_CONTENT)
 def remove_user(user_id: UUID, request:Request, db:Session=Depends(get_db)):
     return delete_user(user_id=user_id,db=db,request=request)
 
+@admin_router.patch('/user_role/{user_id}', response_model=UserResponseWithID, status_code=status.HTTP_200_OK)
+def update_user_role(user_id: UUID, role_data: UserRoleUpdate, request:Request, db:Session=Depends(get_db)):
+    return change_user_role(user_id=user_id, role_data=role_data, db=db, request=request)
+
+@admin_router.get('/hashing_stats', status_code=status.HTTP_200_OK)
+def get_hashing_stats(request:Request, db:Session=Depends(get_db)):
+    return hashing_stats(db=db, request=request)
+
+@admin_router.get('/cache_stats', status_code=status.HTTP_200_OK)
+def get_cache_stats(request:Request, db:Session=Depends(get_db)):
+    return cache_stats(db=db, request=request)
+
+@admin_router.get('/slow_queries', status_code=status.HTTP_200_OK)
+def get_slow_queries(request:Request, limit: Optional[int] = Query(None, ge=1), db:Session=Depends(get_db)):
+    return slow_queries(db=db, request=request, limit=limit)
+
+@admin_router.get('/db_health', status_code=status.HTTP_200_OK)
+def get_db_health(request:Request, db:Session=Depends(get_db)):
+    return db_health(db=db, request=request)
+
 @admin_router.get('/all_teachers', response_model=list[TeacherListItem], status_code=status.HTTP_200_OK)
-def get_all_teachers(request:Request, db:Session=Depends(get_db)):
-    return all_teachers(db=db, request=request)
+def get_all_teachers(request:Request, response:Response, db:Session=Depends(get_db)):
+    return json_response(all_teachers(db=db, request=request, response=response), response)
 
 @admin_router.get('/all_students', response_model=list[StudentListItem])
 def get_all_students(request: Request, db: Session = Depends(get_db)):
-    return all_student(db=db, request=request)
+    return json_response(all_student(db=db, request=request))
 
 
 # Class Related Services
@@ -47,9 +100,10 @@ def get_all_students(request: Request, db: Session = Depends(get_db)):
 def add_class(classData: ClassCreate, request:Request, db: Session=Depends(get_db)):
     return create_class(newClass=classData, db=db, request=request)
 
-@admin_router.get('/all_classes', response_model=list[ClassResponseWithID], status_code=status.HTTP_200_OK)
-def get_all_classes(request:Request, db:Session=Depends(get_db)):
-    return all_classes(db=db, request=request)
+@admin_router.get('/all_classes', response_model=Page[ClassResponseWithID], status_code=status.HTTP_200_OK)
+def get_all_classes(request:Request, response:Response, limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE), cursor: Optional[str] = None,
+                    standard: Optional[int] = None, section: Optional[str] = None, db:Session=Depends(get_db)):
+    return json_response(all_classes(db=db, request=request, limit=limit, cursor=cursor, standard=standard, section=section, response=response), response)
 
 @admin_router.delete('/delete_class/{class_id}', status_code=status.HTTP_204_NO_CONTENT)
 def remove_class(class_id: UUID, request:Request, db:Session=Depends(get_db)):
@@ -64,9 +118,10 @@ def add_class(subjectdata: SubjectCreate, request:Request, db: Session=Depends(g
     return create_subject(newSubject =subjectdata, db=db, request=request)
 
 
-@admin_router.get('/all_subjects', response_model=list[SubjectResponseWithID], status_code=status.HTTP_200_OK)
-def get_all_subjects(request:Request, db:Session=Depends(get_db)):
-    return all_subjects(db=db, request=request)
+@admin_router.get('/all_subjects', response_model=Page[SubjectResponseWithID], status_code=status.HTTP_200_OK)
+def get_all_subjects(request:Request, response:Response, limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE), cursor: Optional[str] = None,
+                     name: Optional[str] = None, db:Session=Depends(get_db)):
+    return json_response(all_subjects(db=db, request=request, limit=limit, cursor=cursor, name=name, response=response), response)
 
 @admin_router.delete('/delete_subject/{subject_id}', status_code=status.HTTP_204_NO_CONTENT)
 def remove_subject(subject_id: UUID, request:Request, db:Session=Depends(get_db)):
@@ -85,6 +140,15 @@ def assign_subject(teacher_data: TeacherAssignSubject,request: Request,  db: Ses
 def assign_class(teacher_data: TeacherAssignClass, request: Request, db: Session=Depends(get_db)):
     return assign_class_to_teacher(teacher_data=teacher_data, db=db, request=request)
 
+# Batch versions: every assignment in one transaction, all or nothing
+@admin_router.post('/assign_subjects', response_model=list[TeacherAssignSubjectResponse], status_code=status.HTTP_201_CREATED)
+def assign_subjects(assignments: list[TeacherAssignSubject], request: Request, db: Session=Depends(get_db)):
+    return assign_subjects_to_teachers(assignments=assignments, db=db, request=request)
+
+@admin_router.post('/assign_classes', response_model=list[TeacherAssignClassResponse], status_code=status.HTTP_201_CREATED)
+def assign_classes(assignments: list[TeacherAssignClass], request: Request, db: Session=Depends(get_db)):
+    return assign_classes_to_teachers(assignments=assignments, db=db, request=request)
+
 @admin_router.get('/teacher_of_class/{class_id}', response_model=TeacherAssignClassResponse, status_code=status.HTTP_200_OK)
 def teacher_of_the_class(class_id: UUID, request: Request, db: Session=Depends(get_db)):
     return teacher_of_class(class_id=class_id, db=db, request=request)
@@ -95,6 +159,10 @@ def teacher_of_the_class(class_id: UUID, request: Request, db: Session=Depends(g
 def assign_class_student(student_data:StudentAssignClass, request: Request, db:Session=Depends(get_db)):
     return assing_class_to_student(student_data=student_data, request=request, db=db)
 
+@admin_router.post('/assign_classes_to_students', response_model=list[StudentAssignClassResponse], status_code=status.HTTP_201_CREATED)
+def assign_classes_students(assignments: list[StudentAssignClass], request: Request, db: Session=Depends(get_db)):
+    return assign_classes_to_students(assignments=assignments, request=request, db=db)
+
 @admin_router.post('/notice',response_model=NoticeResponse,status_code=status.HTTP_201_CREATED)
 def add_notice(noticedata:NoticeCreate,request:Request ,db:Session=Depends(get_db)):
     return create_notice(noticedata=noticedata, request=request, db=db)
@@ -103,6 +171,7 @@ def add_notice(noticedata:NoticeCreate,request:Request ,db:Session=Depends(get_d
 def remove_notice(notice_id:UUID, request:Request, db:Session=Depends(get_db)):
     return delete_notice(notice_id=notice_id, db=db,request=request)
 
-@admin_router.get('/notice', response_model=list[NoticeResponseWithID], status_code=status.HTTP_200_OK)
-def get_all_notices(request:Request, db:Session=Depends(get_db)):
-    return all_notices(db=db, request=request)
\ No newline at end of file
+@admin_router.get('/notice', response_model=Page[NoticeResponseWithID], status_code=status.HTTP_200_OK)
+def get_all_notices(request:Request, limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE), cursor: Optional[str] = None,
+                    class_id: Optional[UUID] = None, standard: Optional[int] = None, created_by: Optional[UUID] = None, db:Session=Depends(get_db)):
+    return json_response(all_notices(db=db, request=request, limit=limit, cursor=cursor, class_id=class_id, standard=standard, created_by=created_by))
\ No newline at end of file
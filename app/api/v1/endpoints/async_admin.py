@@ -0,0 +1,47 @@
+from fastapi import APIRouter, Depends, status, Request, Response, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+from uuid import UUID
+from typing import Literal, Optional
+from app.database import get_async_db
+from app.services.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE
+from app.services.fast_json import json_response
+from app.schemas.Page import Page
+
+from app.schemas.Users import UserResponseWithID, TeacherListItem, StudentListItem
+from app.schemas.Notice import NoticeResponseWithID
+from app.schemas.Class import ClassResponseWithID
+from app.schemas.Subject import SubjectResponseWithID
+from app.services.async_admin import all_users, all_teachers, all_student, all_classes, all_subjects, all_notices
+
+# Read routes of app/api/v1/endpoints/admin.py served from the AsyncEngine.
+# Mounted ahead of the sync router when DATABASE_ASYNC is on; writes stay sync.
+admin_router = APIRouter()
+
+
+@admin_router.get('/all_users', response_model=Page[UserResponseWithID], status_code=status.HTTP_200_OK)
+async def get_all_users(request:Request, limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE), cursor: Optional[str] = None,
+                        role: Optional[Literal["admin", "teacher", "student"]] = None, db:AsyncSession=Depends(get_async_db)):
+    return json_response(await all_users(db=db, request=request, limit=limit, cursor=cursor, role=role))
+
+@admin_router.get('/all_teachers', response_model=list[TeacherListItem], status_code=status.HTTP_200_OK)
+async def get_all_teachers(request:Request, response:Response, db:AsyncSession=Depends(get_async_db)):
+    return json_response(await all_teachers(db=db, request=request, response=response), response)
+
+@admin_router.get('/all_students', response_model=list[StudentListItem])
+async def get_all_students(request: Request, db: AsyncSession = Depends(get_async_db)):
+    return json_response(await all_student(db=db, request=request))
+
+@admin_router.get('/all_classes', response_model=Page[ClassResponseWithID], status_code=status.HTTP_200_OK)
+async def get_all_classes(request:Request, response:Response, limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE), cursor: Optional[str] = None,
+                          standard: Optional[int] = None, section: Optional[str] = None, db:AsyncSession=Depends(get_async_db)):
+    return json_response(await all_classes(db=db, request=request, limit=limit, cursor=cursor, standard=standard, section=section, response=response), response)
+
+@admin_router.get('/all_subjects', response_model=Page[SubjectResponseWithID], status_code=status.HTTP_200_OK)
+async def get_all_subjects(request:Request, response:Response, limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE), cursor: Optional[str] = None,
+                           name: Optional[str] = None, db:AsyncSession=Depends(get_async_db)):
+    return json_response(await all_subjects(db=db, request=request, limit=limit, cursor=cursor, name=name, response=response), response)
+
+@admin_router.get('/notice', response_model=Page[NoticeResponseWithID], status_code=status.HTTP_200_OK)
+async def get_all_notices(request:Request, limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE), cursor: Optional[str] = None,
+                          class_id: Optional[UUID] = None, standard: Optional[int] = None, created_by: Optional[UUID] = None, db:AsyncSession=Depends(get_async_db)):
+    return json_response(await all_notices(db=db, request=request, limit=limit, cursor=cursor, class_id=class_id, standard=standard, created_by=created_by))
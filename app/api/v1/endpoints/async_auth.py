@@ -0,0 +1,20 @@
+from fastapi import APIRouter, Depends, status, Request
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.database import get_async_db
+from app.schemas.Users import UserCreate, UserResponse, UserLogin, UserResponseWithID
+from app.services.async_auth import register, login, is_authenticated
+
+# Same paths as app/api/v1/endpoints/auth.py, mounted ahead of it when DATABASE_ASYNC is on
+auth_router = APIRouter()
+
+@auth_router.post('/register',response_model=UserResponse, status_code=status.HTTP_201_CREATED)
+async def register_new_user(newuser:UserCreate, db: AsyncSession=Depends(get_async_db)):
+    return await register(newuser=newuser, db=db)
+
+@auth_router.post('/login', status_code=status.HTTP_200_OK)
+async def login_user(userdata:UserLogin, db: AsyncSession=Depends(get_async_db)):
+    return await login(userdata=userdata, db=db)
+
+@auth_router.post("/is_auth", status_code=status.HTTP_200_OK, response_model=UserResponseWithID)
+async def is_auth(request: Request, db: AsyncSession=Depends(get_async_db)):
+    return await is_authenticated(request=request, db=db)
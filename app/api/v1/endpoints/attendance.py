@@ -0,0 +1,32 @@
+from fastapi import APIRouter, Depends, status, Request
+from sqlalchemy.orm import Session
+from uuid import UUID
+from datetime import date
+from typing import Optional
+from app.database import get_db
+from app.schemas.Attendance import AttendanceMark, AttendanceMarkResponse, StudentAttendanceReport, ClassStudentAttendance, ClassDailyAttendance
+from app.services.attendance import mark_attendance, student_attendance_report, class_attendance_report, class_daily_report
+
+attendance_router = APIRouter()
+
+
+@attendance_router.post('/mark', response_model=AttendanceMarkResponse, status_code=status.HTTP_200_OK)
+def mark_class_attendance(attendance: AttendanceMark, request: Request, db: Session=Depends(get_db)):
+    return mark_attendance(attendance=attendance, db=db, request=request)
+
+
+# Reports, served from the attendance rollup tables
+@attendance_router.get('/report/student/{student_id}', response_model=StudentAttendanceReport, status_code=status.HTTP_200_OK)
+def get_student_report(student_id: UUID, request: Request, start_month: Optional[date] = None, end_month: Optional[date] = None,
+                       db: Session=Depends(get_db)):
+    return student_attendance_report(student_id=student_id, db=db, request=request, start_month=start_month, end_month=end_month)
+
+@attendance_router.get('/report/class/{class_id}/students', response_model=list[ClassStudentAttendance], status_code=status.HTTP_200_OK)
+def get_class_report(class_id: UUID, request: Request, start_month: Optional[date] = None, end_month: Optional[date] = None,
+                     db: Session=Depends(get_db)):
+    return class_attendance_report(class_id=class_id, db=db, request=request, start_month=start_month, end_month=end_month)
+
+@attendance_router.get('/report/class/{class_id}/daily', response_model=list[ClassDailyAttendance], status_code=status.HTTP_200_OK)
+def get_class_daily_report(class_id: UUID, request: Request, start_date: Optional[date] = None, end_date: Optional[date] = None,
+                           db: Session=Depends(get_db)):
+    return class_daily_report(class_id=class_id, db=db, request=request, start_date=start_date, end_date=end_date)
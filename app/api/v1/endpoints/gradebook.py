@@ -0,0 +1,29 @@
+from fastapi import APIRouter, Depends, status, Request
+from sqlalchemy.orm import Session
+from uuid import UUID
+from datetime import date
+from typing import Optional
+from app.database import get_db
+from app.schemas.Gradebook import TestCreate, TestResponse, TestMarks, TestMarksResponse, GradebookClass
+from app.services.gradebook import create_test, enter_marks, class_gradebook, school_gradebook
+
+gradebook_router = APIRouter()
+
+
+@gradebook_router.post('/tests', response_model=TestResponse, status_code=status.HTTP_201_CREATED)
+def add_test(test_data: TestCreate, request: Request, db: Session=Depends(get_db)):
+    return create_test(test_data=test_data, db=db, request=request)
+
+@gradebook_router.put('/tests/{test_id}/marks', response_model=TestMarksResponse, status_code=status.HTTP_200_OK)
+def save_marks(test_id: UUID, marks_data: TestMarks, request: Request, db: Session=Depends(get_db)):
+    return enter_marks(test_id=test_id, marks_data=marks_data, db=db, request=request)
+
+@gradebook_router.get('/class/{class_id}', response_model=GradebookClass, status_code=status.HTTP_200_OK)
+def get_class_gradebook(class_id: UUID, request: Request, start_date: Optional[date] = None, end_date: Optional[date] = None,
+                        db: Session=Depends(get_db)):
+    return class_gradebook(class_id=class_id, db=db, request=request, start_date=start_date, end_date=end_date)
+
+@gradebook_router.get('/school', response_model=list[GradebookClass], status_code=status.HTTP_200_OK)
+def get_school_gradebook(request: Request, start_date: Optional[date] = None, end_date: Optional[date] = None,
+                         db: Session=Depends(get_db)):
+    return school_gradebook(db=db, request=request, start_date=start_date, end_date=end_date)
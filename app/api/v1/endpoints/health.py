@@ -0,0 +1,21 @@
+from fastapi import APIRouter
+from fastapi.responses import JSONResponse
+from starlette.concurrency import run_in_threadpool
+
+from app.database import get_engine, get_async_engine
+from app.services.db_health import probe, probe_async, public_summary
+
+health_router = APIRouter()
+
+
+# Unauthenticated so load balancers and uptime checks can use it, so it only
+# says whether the database answers; 503 when it does not. Pool occupancy and
+# timings are at the admin-only GET /admin/db_health
+@health_router.get('/db')
+async def database_health():
+    result = public_summary(await run_in_threadpool(probe, get_engine()))
+    async_engine = get_async_engine()
+    if async_engine is not None:
+        result['async'] = public_summary(await probe_async(async_engine))
+    healthy = result['ok'] and result.get('async', {}).get('ok', True)
+    return JSONResponse(result, status_code=200 if healthy else 503)
@@ -0,0 +1,13 @@
+from fastapi import APIRouter, Depends, status, Request
+from sqlalchemy.orm import Session
+from app.database import get_db
+from app.schemas.Dashboard import Dashboard
+from app.services.dashboard import dashboard
+
+me_router = APIRouter()
+
+
+# The caller's home screen in one round trip: classes, class teacher, notices, attendance and latest tests
+@me_router.get('/dashboard', response_model=Dashboard, status_code=status.HTTP_200_OK)
+def get_dashboard(request: Request, db: Session=Depends(get_db)):
+    return dashboard(db=db, request=request)
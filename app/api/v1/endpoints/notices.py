@@ -0,0 +1,17 @@
+from fastapi import APIRouter, Depends, Query, status, Request
+from sqlalchemy.orm import Session
+from typing import Optional
+from app.database import get_db
+from app.schemas.Notice import NoticeFeedItem
+from app.schemas.Page import Page
+from app.services.notice_feed import notice_feed
+from app.services.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE
+
+notices_router = APIRouter()
+
+
+# Notices for the caller's classes, standards and the whole school, newest first
+@notices_router.get('/feed', response_model=Page[NoticeFeedItem], status_code=status.HTTP_200_OK)
+def get_notice_feed(request: Request, limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE), cursor: Optional[str] = None,
+                    db: Session=Depends(get_db)):
+    return notice_feed(db=db, request=request, limit=limit, cursor=cursor)
@@ -0,0 +1,16 @@
+from fastapi import APIRouter, Depends, Query, status, Request
+from sqlalchemy.orm import Session
+from typing import Literal, Optional
+from app.database import get_db
+from app.schemas.Search import SearchResults
+from app.services.search import search, MAX_SEARCH_LIMIT
+
+search_router = APIRouter()
+
+
+# Typeahead: every word of q matches as a prefix; best matches first
+@search_router.get('', response_model=SearchResults, status_code=status.HTTP_200_OK)
+def search_everything(request: Request, q: str = Query(..., min_length=1, max_length=200),
+                      kind: Literal['all', 'users', 'notices'] = 'all', role: Optional[Literal['admin', 'teacher', 'student']] = None,
+                      limit: int = Query(10, ge=1, le=MAX_SEARCH_LIMIT), db: Session=Depends(get_db)):
+    return search(q=q, db=db, request=request, kind=kind, role=role, limit=limit)
@@ -1,31 +1,152 @@
 from sqlalchemy import create_engine
+from sqlalchemy.pool import NullPool, QueuePool
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 import os
+import threading
 from dotenv import load_dotenv
+from app.services.metrics import add_statement_observer, instrument_engine, timed_pool_class
+from app.services.slow_queries import slow_query_log
 
 load_dotenv()
 
 SQLALCHEMY_DATABASE_URL = os.getenv("DATABASE_URL")
-print(f"Database URL: {SQLALCHEMY_DATABASE_URL}")
-
-# For PostgreSQL, we don't need connect_args={"check_same_thread": False}
-engine = create_engine(
-    SQLALCHEMY_DATABASE_URL,
-    pool_size=5,          # Keep 5 connections ready
-    max_overflow=10,      # Allow up to 10 extra if busy
-    pool_timeout=30,      # Wait 30s before giving up
-    pool_recycle=1800,    # Refresh connection every 30 mins
-)
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+
+def _env_flag(name: str, default: str) -> bool:
+    return os.getenv(name, default).lower() in ("1", "true", "yes")
+
+
+# Serve the hot routes from `async def` handlers on an AsyncEngine instead of
+# the threadpool. Needs an async driver (asyncpg / aiosqlite) installed.
+DATABASE_ASYNC = _env_flag("DATABASE_ASYNC", "false")
+
+
+def pool_profile() -> str:
+    """
+    DB_POOL_PROFILE: "server" (long-running uvicorn workers), "serverless"
+    (one short-lived instance per request burst, e.g. Vercel) or "auto",
+    which picks serverless when a serverless platform's variables are set.
+    """
+    profile = os.getenv("DB_POOL_PROFILE", "auto").lower()
+    if profile == "auto":
+        return "serverless" if os.getenv("VERCEL") or os.getenv("AWS_LAMBDA_FUNCTION_NAME") else "server"
+    if profile not in ("server", "serverless"):
+        raise ValueError(f"Unknown DB_POOL_PROFILE: {profile}")
+    return profile
+
+
+def pool_options(profile: str, queue_pool_class) -> dict:
+    """Engine keyword arguments for the pool of `profile`."""
+    if profile == "serverless":
+        # Every instance keeping its own idle pool would exhaust Postgres'
+        # connections; open one per checkout and let an external pooler
+        # (PgBouncer, the provider's pooled endpoint) do the pooling
+        return {'poolclass': timed_pool_class(NullPool), 'pool_pre_ping': False}
+    return {
+        'poolclass': timed_pool_class(queue_pool_class),  # reports checkout wait per request
+        'pool_size': int(os.getenv("DB_POOL_SIZE", "5")),              # connections kept open
+        'max_overflow': int(os.getenv("DB_MAX_OVERFLOW", "10")),       # extra connections when busy
+        'pool_timeout': float(os.getenv("DB_POOL_TIMEOUT", "30")),     # seconds to wait for one
+        'pool_recycle': int(os.getenv("DB_POOL_RECYCLE", "1800")),     # reconnect after this many seconds
+        # Test connections on checkout, so ones dropped by the server or a
+        # load balancer are replaced instead of failing the request
+        'pool_pre_ping': _env_flag("DB_POOL_PRE_PING", "true"),
+    }
+
+
+POOL_PROFILE = pool_profile()
+
+# Engines are created on first use rather than at import, so importing the
+# app (a serverless cold start) does not load the driver or build a pool
+_engines = {}
+_engines_lock = threading.Lock()
+
+
+def get_engine():
+    """The application's Engine, created on the first call."""
+    if 'sync' not in _engines:
+        with _engines_lock:
+            if 'sync' not in _engines:
+                # For PostgreSQL, we don't need connect_args={"check_same_thread": False}
+                engine = create_engine(SQLALCHEMY_DATABASE_URL, **pool_options(POOL_PROFILE, QueuePool))
+                instrument_engine(engine)
+                SessionLocal.configure(bind=engine)
+                _engines['sync'] = engine
+    return _engines['sync']
+
+
+class _LazySessionmaker(sessionmaker):
+    def __call__(self, **local_kw):
+        get_engine()
+        return super().__call__(**local_kw)
+
+
+SessionLocal = _LazySessionmaker(autocommit=False, autoflush=False)
+add_statement_observer(slow_query_log.observe)
 
 Base = declarative_base()
 
 # Dependency to get DB session in routes
 def get_db():
-    print("Database Connected!!!")
     db = SessionLocal()
     try:
         yield db
     finally:
-        db.close()
\ No newline at end of file
+        db.close()
+
+
+def async_database_url(url: str) -> str:
+    """Swap the sync driver in DATABASE_URL for its asyncio counterpart."""
+    if os.getenv("ASYNC_DATABASE_URL"):
+        return os.getenv("ASYNC_DATABASE_URL")
+    scheme, sep, rest = url.partition("://")
+    dialect = scheme.split("+")[0]
+    if dialect in ("postgres", "postgresql"):
+        return f"postgresql+asyncpg{sep}{rest}"
+    if dialect == "sqlite":
+        return f"sqlite+aiosqlite{sep}{rest}"
+    return url
+
+
+def get_async_engine():
+    """The AsyncEngine, created on the first call; None unless DATABASE_ASYNC is on."""
+    if not DATABASE_ASYNC:
+        return None
+    if 'async' not in _engines:
+        with _engines_lock:
+            if 'async' not in _engines:
+                from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
+                from sqlalchemy.pool import AsyncAdaptedQueuePool
+
+                async_engine = create_async_engine(
+                    async_database_url(SQLALCHEMY_DATABASE_URL),
+                    **pool_options(POOL_PROFILE, AsyncAdaptedQueuePool)
+                )
+                instrument_engine(async_engine.sync_engine)
+                # expire_on_commit=False so returned objects can still be read after commit
+                # without an implicit (and, under asyncio, illegal) lazy refresh
+                _engines['async_sessionmaker'] = async_sessionmaker(
+                    async_engine, class_=AsyncSession, autoflush=False, expire_on_commit=False
+                )
+                _engines['async'] = async_engine
+    return _engines['async']
+
+
+def __getattr__(name):
+    # `engine`, `async_engine` and `AsyncSessionLocal` stay importable; the
+    # first import creates the engine
+    if name == "engine":
+        return get_engine()
+    if name == "async_engine":
+        return get_async_engine()
+    if name == "AsyncSessionLocal":
+        return _engines['async_sessionmaker'] if get_async_engine() is not None else None
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+# Async dependency, used by the routes in app/api/v1/endpoints/async_*.py
+async def get_async_db():
+    get_async_engine()
+    async with _engines['async_sessionmaker']() as db:
+        yield db
@@ -1,8 +1,20 @@
+import importlib
+import json
+import os
+import threading
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from app.database import engine, Base
-from app.models import models
-from app.api.v1.endpoints import auth, admin
+from fastapi.responses import PlainTextResponse
+from app.database import DATABASE_ASYNC
+from app.services.metrics import RequestMetricsMiddleware, registry
+
+# Import each router (and the services and models behind it) on the first
+# request under its prefix instead of at startup; set by api/index.py so a
+# serverless cold start only pays for the routes it serves
+LAZY_ROUTERS = os.getenv("LAZY_ROUTERS", "false").lower() in ("1", "true", "yes")
+# OpenAPI schema written by `python db_manager.py openapi`, served instead of
+# generating it (which needs every router) on the first /docs hit
+OPENAPI_SCHEMA_FILE = os.getenv("OPENAPI_SCHEMA_FILE")
 
 app = FastAPI(title="School Management System Backend")
 
@@ -21,9 +33,76 @@ app.add_middleware(
     allow_methods=["*"],
     allow_headers=["*"],
 )
-app.include_router(auth.auth_router, prefix='/auth', tags=['auth'])
-app.include_router(admin.admin_router, prefix='/admin', tags=['admin'])
+# Per-route wall time, SQL statements/time, pool wait and rows: Server-Timing header and /metrics
+app.add_middleware(RequestMetricsMiddleware)
+
+# (module in app.api.v1.endpoints, router attribute, prefix, tag)
+ROUTERS = []
+if DATABASE_ASYNC:
+    # Registered first so these async handlers win over the sync ones on the same paths
+    ROUTERS += [('async_auth', 'auth_router', '/auth', 'auth'), ('async_admin', 'admin_router', '/admin', 'admin')]
+ROUTERS += [
+    ('auth', 'auth_router', '/auth', 'auth'),
+    ('admin', 'admin_router', '/admin', 'admin'),
+    ('attendance', 'attendance_router', '/attendance', 'attendance'),
+    ('gradebook', 'gradebook_router', '/gradebook', 'gradebook'),
+    ('notices', 'notices_router', '/notices', 'notices'),
+    ('me', 'me_router', '/me', 'me'),
+    ('search', 'search_router', '/search', 'search'),
+    ('health', 'health_router', '/health', 'health'),
+]
+_included = set()
+_include_lock = threading.Lock()
+
+
+def include_routers(prefix: str = None):
+    """Import and register the routers under `prefix` (all when None) that are not registered yet."""
+    with _include_lock:
+        for module_name, attribute, router_prefix, tag in ROUTERS:
+            if module_name in _included or (prefix is not None and router_prefix != prefix):
+                continue
+            module = importlib.import_module(f"app.api.v1.endpoints.{module_name}")
+            app.include_router(getattr(module, attribute), prefix=router_prefix, tags=[tag])
+            _included.add(module_name)
+
+
+class LazyRouterMiddleware:
+    """Registers the routers for a request's first path segment before routing it."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "http" and len(_included) < len(ROUTERS):
+            include_routers("/" + scope["path"].lstrip("/").split("/", 1)[0])
+        await self.app(scope, receive, send)
+
+
+if LAZY_ROUTERS:
+    app.add_middleware(LazyRouterMiddleware)
+else:
+    include_routers()
+
+
+def openapi():
+    if app.openapi_schema is None:
+        if OPENAPI_SCHEMA_FILE and os.path.exists(OPENAPI_SCHEMA_FILE):
+            with open(OPENAPI_SCHEMA_FILE) as f:
+                app.openapi_schema = json.load(f)
+        else:
+            include_routers()
+            app.openapi_schema = FastAPI.openapi(app)
+    return app.openapi_schema
+
+
+app.openapi = openapi
 
 @app.get("/")
 def read_root():
-    return {"status": "Helllo Bachchooooo!!!!"}
\ No newline at end of file
+    return {"status": "Helllo Bachchooooo!!!!"}
+
+if os.getenv("METRICS_ENABLED", "true").lower() in ("1", "true", "yes"):
+    @app.get("/metrics", response_class=PlainTextResponse, include_in_schema=False)
+    def metrics():
+        # Prometheus text format
+        return registry.render()
@@ -1,4 +1,5 @@
 import uuid
+from datetime import datetime, timezone
 from sqlalchemy import (
     Column,
     String,
@@ -8,14 +9,23 @@ from sqlalchemy import (
     Boolean,
     ForeignKey,
     Text,
-    Enum
+    Enum,
+    UniqueConstraint,
+    Index,
+    Uuid,
+    literal_column
 )
-from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from app.database import Base
 import enum
 
+def utcnow() -> datetime:
+    # Set client-side so the value goes through DateTime's bind processing and
+    # is stored in the same format keyset cursors are compared against (SQLite
+    # keeps CURRENT_TIMESTAMP as text without the fractional part)
+    return datetime.now(timezone.utc)
+
 class UserRole(str, enum.Enum):
     admin = "admin"
     teacher = "teacher"
@@ -27,24 +37,49 @@ class AttendanceStatus(str, enum.Enum):
 
 class User(Base):
     __tablename__ = "users"
+    __table_args__ = (
+        # keyset pagination of /admin/all_users, optionally filtered by role
+        Index("ix_users_created_at_id", "created_at", "id"),
+        Index("ix_users_role_created_at_id", "role", "created_at", "id"),
+    )
 
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    id = Column(Uuid, primary_key=True, default=uuid.uuid4)
     full_name = Column(String, nullable=False)
     email = Column(String, unique=True, nullable=False)
     password_hash = Column(String, nullable=False)
     role = Column(Enum(UserRole), nullable=False)
-    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    # Bumped whenever previously issued tokens must stop working (role change, deletion)
+    token_version = Column(Integer, nullable=False, default=0, server_default="0")
+    created_at = Column(DateTime(timezone=True), default=utcnow, server_default=func.now())
 
     teacher = relationship("Teacher", back_populates="user", uselist=False)
     student = relationship("Student", back_populates="user", uselist=False)
+
+# login/register look users up by lower(email); also makes emails unique case-insensitively
+Index("ix_users_email_lower", func.lower(User.email), unique=True)
+
+def user_search_vector():
+    """
+    full_name and the words of the email as a 'simple' tsvector (PostgreSQL).
+    /search must use this same expression for ix_users_search to apply.
+    """
+    words_of_email = func.translate(User.email, literal_column("'@._-'"), literal_column("'    '"))
+    return func.to_tsvector(literal_column("'simple'::regconfig"), User.full_name + literal_column("' '") + words_of_email)
+
+# Full-text and prefix search over users; SQLite searches an in-process index instead
+User.__table__.append_constraint(Index("ix_users_search", user_search_vector(), postgresql_using="gin").ddl_if(dialect="postgresql"))
     
 class Class(Base):
     __tablename__ = "classes"
+    __table_args__ = (
+        UniqueConstraint("standard", "section", name="uq_classes_standard_section"),
+        Index("ix_classes_created_at_id", "created_at", "id"),
+    )
 
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    id = Column(Uuid, primary_key=True, default=uuid.uuid4)
     standard = Column(Integer, nullable=False)
     section = Column(String, nullable=False)
-    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    created_at = Column(DateTime(timezone=True), default=utcnow, server_default=func.now())
 
     students = relationship("Student", back_populates="class_")
     teacher_classes = relationship("TeacherClass", back_populates="class_")
@@ -53,8 +88,11 @@ class Class(Base):
     
 class Subject(Base):
     __tablename__ = "subjects"
+    __table_args__ = (
+        Index("ix_subjects_name_id", "name", "id"),
+    )
 
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    id = Column(Uuid, primary_key=True, default=uuid.uuid4)
     name = Column(String, nullable=False)
 
     teachers = relationship("Teacher", back_populates="subject")
@@ -62,10 +100,15 @@ class Subject(Base):
     
 class Teacher(Base):
     __tablename__ = "teachers"
+    __table_args__ = (
+        # One Teacher profile per user and subject
+        UniqueConstraint("user_id", "subject_id", name="uq_teachers_user_subject"),
+        Index("ix_teachers_subject_id", "subject_id"),
+    )
 
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
-    user_id = Column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=False)
-    subject_id = Column(UUID(as_uuid=True), ForeignKey("subjects.id"), nullable=False)
+    id = Column(Uuid, primary_key=True, default=uuid.uuid4)
+    user_id = Column(Uuid, ForeignKey("users.id"), nullable=False)
+    subject_id = Column(Uuid, ForeignKey("subjects.id"), nullable=False)
 
     user = relationship("User", back_populates="teacher")
     subject = relationship("Subject", back_populates="teachers")
@@ -75,10 +118,16 @@ class Teacher(Base):
 
 class Student(Base):
     __tablename__ = "students"
+    __table_args__ = (
+        # A user has at most one Student profile (one class)
+        UniqueConstraint("user_id", name="uq_students_user_id"),
+        # Class roster lookups; INCLUDE makes them index-only on Postgres
+        Index("ix_students_class_id_roll_number", "class_id", "roll_number", postgresql_include=["id"]),
+    )
 
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
-    user_id = Column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=False)
-    class_id = Column(UUID(as_uuid=True), ForeignKey("classes.id"), nullable=False)
+    id = Column(Uuid, primary_key=True, default=uuid.uuid4)
+    user_id = Column(Uuid, ForeignKey("users.id"), nullable=False)
+    class_id = Column(Uuid, ForeignKey("classes.id"), nullable=False)
     roll_number = Column(Integer, nullable=False)
 
     user = relationship("User", back_populates="student")
@@ -88,10 +137,14 @@ class Student(Base):
     
 class TeacherClass(Base):
     __tablename__ = "teacher_classes"
+    __table_args__ = (
+        UniqueConstraint("teacher_id", "class_id", name="uq_teacher_classes_teacher_class"),
+        Index("ix_teacher_classes_class_id", "class_id"),
+    )
 
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
-    teacher_id = Column(UUID(as_uuid=True), ForeignKey("teachers.id"), nullable=False)
-    class_id = Column(UUID(as_uuid=True), ForeignKey("classes.id"), nullable=False)
+    id = Column(Uuid, primary_key=True, default=uuid.uuid4)
+    teacher_id = Column(Uuid, ForeignKey("teachers.id"), nullable=False)
+    class_id = Column(Uuid, ForeignKey("classes.id"), nullable=False)
     is_class_teacher = Column(Boolean, default=False)
 
     teacher = relationship("Teacher", back_populates="teacher_classes")
@@ -99,23 +152,48 @@ class TeacherClass(Base):
     
 class Notice(Base):
     __tablename__ = "notices"
+    __table_args__ = (
+        Index("ix_notices_created_at_id", "created_at", "id"),
+        Index("ix_notices_created_by", "created_by"),
+        # Notice feed: one newest-first range scan per targeted class / standard
+        Index("ix_notices_class_id_created_at", "class_id", "created_at", "id"),
+        Index("ix_notices_standard_created_at", "standard", "created_at", "id"),
+    )
 
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    id = Column(Uuid, primary_key=True, default=uuid.uuid4)
     title = Column(String, nullable=False)
     description = Column(Text, nullable=False)
-    created_by = Column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=False)
-    class_id = Column(UUID(as_uuid=True), ForeignKey("classes.id"), nullable=True)
+    created_by = Column(Uuid, ForeignKey("users.id"), nullable=False)
+    class_id = Column(Uuid, ForeignKey("classes.id"), nullable=True)
     standard = Column(Integer, nullable=True)
-    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    created_at = Column(DateTime(timezone=True), default=utcnow, server_default=func.now())
 
     creator = relationship("User")
+
+def notice_search_vector():
+    """
+    Title (weight A) and description (weight B) as a 'simple' tsvector, the
+    expression of ix_notices_search. Not 'english': typeahead matches
+    partial words as prefixes, and stemming the stored words (but not a
+    half-typed one) would make prefixes like "examinat" miss "examination".
+    """
+    return func.setweight(func.to_tsvector(literal_column("'simple'::regconfig"), Notice.title), literal_column("'A'")).op("||")(
+        func.setweight(func.to_tsvector(literal_column("'simple'::regconfig"), Notice.description), literal_column("'B'"))
+    )
+
+Notice.__table__.append_constraint(Index("ix_notices_search", notice_search_vector(), postgresql_using="gin").ddl_if(dialect="postgresql"))
     
 class AttendanceSession(Base):
     __tablename__ = "attendance_sessions"
+    # One session per class per day; marking again reuses it
+    __table_args__ = (
+        UniqueConstraint("class_id", "date", name="uq_attendance_sessions_class_date"),
+        Index("ix_attendance_sessions_teacher_id", "teacher_id"),
+    )
 
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
-    class_id = Column(UUID(as_uuid=True), ForeignKey("classes.id"), nullable=False)
-    teacher_id = Column(UUID(as_uuid=True), ForeignKey("teachers.id"), nullable=False)
+    id = Column(Uuid, primary_key=True, default=uuid.uuid4)
+    class_id = Column(Uuid, ForeignKey("classes.id"), nullable=False)
+    teacher_id = Column(Uuid, ForeignKey("teachers.id"), nullable=False)
     date = Column(Date, nullable=False)
 
     class_ = relationship("Class", back_populates="attendance_sessions")
@@ -124,22 +202,50 @@ class AttendanceSession(Base):
      
 class AttendanceRecord(Base):
     __tablename__ = "attendance_records"
+    # Conflict target of the bulk upsert in app/services/attendance.py
+    __table_args__ = (
+        UniqueConstraint("session_id", "student_id", name="uq_attendance_records_session_student"),
+        Index("ix_attendance_records_student_id", "student_id"),
+    )
 
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
-    session_id = Column(UUID(as_uuid=True), ForeignKey("attendance_sessions.id"), nullable=False)
-    student_id = Column(UUID(as_uuid=True), ForeignKey("students.id"), nullable=False)
+    id = Column(Uuid, primary_key=True, default=uuid.uuid4)
+    session_id = Column(Uuid, ForeignKey("attendance_sessions.id"), nullable=False)
+    student_id = Column(Uuid, ForeignKey("students.id"), nullable=False)
     status = Column(Enum(AttendanceStatus), nullable=False)
 
     session = relationship("AttendanceSession", back_populates="records")
     student = relationship("Student", back_populates="attendance_records")
     
+class AttendanceStudentMonthly(Base):
+    # Rollup of attendance_records, maintained by app/services/attendance.py
+    __tablename__ = "attendance_student_monthly"
+
+    student_id = Column(Uuid, ForeignKey("students.id"), primary_key=True)
+    month = Column(Date, primary_key=True)  # first day of the month
+    present_count = Column(Integer, nullable=False, default=0)
+    absent_count = Column(Integer, nullable=False, default=0)
+
+class AttendanceClassDaily(Base):
+    # Rollup of attendance_records, maintained by app/services/attendance.py
+    __tablename__ = "attendance_class_daily"
+
+    class_id = Column(Uuid, ForeignKey("classes.id"), primary_key=True)
+    date = Column(Date, primary_key=True)
+    present_count = Column(Integer, nullable=False, default=0)
+    absent_count = Column(Integer, nullable=False, default=0)
+    
 class Test(Base):
     __tablename__ = "tests"
+    __table_args__ = (
+        Index("ix_tests_class_id_test_date", "class_id", "test_date"),
+        Index("ix_tests_subject_id", "subject_id"),
+        Index("ix_tests_teacher_id", "teacher_id"),
+    )
 
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
-    class_id = Column(UUID(as_uuid=True), ForeignKey("classes.id"), nullable=False)
-    subject_id = Column(UUID(as_uuid=True), ForeignKey("subjects.id"), nullable=False)
-    teacher_id = Column(UUID(as_uuid=True), ForeignKey("teachers.id"), nullable=False)
+    id = Column(Uuid, primary_key=True, default=uuid.uuid4)
+    class_id = Column(Uuid, ForeignKey("classes.id"), nullable=False)
+    subject_id = Column(Uuid, ForeignKey("subjects.id"), nullable=False)
+    teacher_id = Column(Uuid, ForeignKey("teachers.id"), nullable=False)
     title = Column(String, nullable=False)
     total_marks = Column(Integer, nullable=False)
     test_date = Column(Date, nullable=False)
@@ -151,12 +257,25 @@ class Test(Base):
     
 class TestResult(Base):
     __tablename__ = "test_results"
+    # One result per student per test; conflict target of the marks upsert
+    __table_args__ = (
+        UniqueConstraint("test_id", "student_id", name="uq_test_results_test_student"),
+        Index("ix_test_results_student_id", "student_id"),
+    )
 
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
-    test_id = Column(UUID(as_uuid=True), ForeignKey("tests.id"), nullable=False)
-    student_id = Column(UUID(as_uuid=True), ForeignKey("students.id"), nullable=False)
+    id = Column(Uuid, primary_key=True, default=uuid.uuid4)
+    test_id = Column(Uuid, ForeignKey("tests.id"), nullable=False)
+    student_id = Column(Uuid, ForeignKey("students.id"), nullable=False)
     marks_obtained = Column(Integer, nullable=False)
 
     test = relationship("Test", back_populates="results")
     student = relationship("Student", back_populates="test_results")
 
+
+class TableVersion(Base):
+    # Change counter per table, bumped by the services that write it (app/services/table_versions.py)
+    __tablename__ = "table_versions"
+
+    name = Column(String, primary_key=True)
+    version = Column(Integer, nullable=False, default=0)
+    updated_at = Column(DateTime(timezone=True), nullable=False)
@@ -0,0 +1,50 @@
+from pydantic import BaseModel
+from datetime import date
+from uuid import UUID
+from typing import Optional
+
+
+class AttendanceMark(BaseModel):
+    class_id: UUID
+    date: date
+    # Everyone else in the class is marked present
+    absent_roll_numbers: list[int] = []
+
+
+class AttendanceMarkResponse(BaseModel):
+    session_id: UUID
+    class_id: UUID
+    date: date
+    present: int
+    absent: int
+    absent_roll_numbers: list[int]
+
+
+class AttendanceMonth(BaseModel):
+    month: date
+    present: int
+    absent: int
+    percentage: Optional[float]
+
+
+class StudentAttendanceReport(BaseModel):
+    student_id: UUID
+    present: int
+    absent: int
+    percentage: Optional[float]
+    months: list[AttendanceMonth]
+
+
+class ClassStudentAttendance(BaseModel):
+    student_id: UUID
+    roll_number: int
+    present: int
+    absent: int
+    percentage: Optional[float]
+
+
+class ClassDailyAttendance(BaseModel):
+    date: date
+    present: int
+    absent: int
+    percentage: Optional[float]
@@ -0,0 +1,14 @@
+from pydantic import BaseModel
+from typing import Optional
+
+
+class BulkImportRowError(BaseModel):
+    row: int
+    email: Optional[str] = None
+    errors: list[str]
+
+
+class BulkImportResponse(BaseModel):
+    created: int
+    failed: int
+    errors: list[BulkImportRowError]
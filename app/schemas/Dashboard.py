@@ -0,0 +1,77 @@
+from pydantic import BaseModel
+from datetime import date
+from uuid import UUID
+from typing import Optional
+
+from app.schemas.Attendance import AttendanceMonth
+from app.schemas.Notice import NoticeFeedItem
+
+
+class DashboardClassTeacher(BaseModel):
+    user_id: UUID
+    full_name: str
+    email: str
+
+
+class DashboardClass(BaseModel):
+    class_id: UUID
+    standard: int
+    section: str
+    class_teacher: Optional[DashboardClassTeacher]
+    # Teachers only: the subject taught in this class
+    subject_id: Optional[UUID] = None
+    subject_name: Optional[str] = None
+    is_class_teacher: Optional[bool] = None
+
+
+class DashboardAttendance(BaseModel):
+    present: int
+    absent: int
+    percentage: Optional[float]
+    this_month: Optional[AttendanceMonth]
+
+
+class DashboardClassAttendance(BaseModel):
+    # Latest marked day of the class
+    class_id: UUID
+    date: date
+    present: int
+    absent: int
+    percentage: Optional[float]
+
+
+class DashboardTestScore(BaseModel):
+    test_id: UUID
+    title: str
+    test_date: date
+    subject_name: str
+    marks_obtained: int
+    total_marks: int
+    percentage: float
+
+
+class DashboardTest(BaseModel):
+    test_id: UUID
+    title: str
+    test_date: date
+    class_id: UUID
+    subject_name: str
+    total_marks: int
+    results: int
+    average_percentage: Optional[float]
+
+
+class Dashboard(BaseModel):
+    user_id: UUID
+    full_name: str
+    role: str
+    # Students only
+    student_id: Optional[UUID] = None
+    roll_number: Optional[int] = None
+    classes: list[DashboardClass] = []
+    notices: list[NoticeFeedItem] = []
+    # Students: own attendance and latest results; teachers: their classes' latest day and their latest tests
+    attendance: Optional[DashboardAttendance] = None
+    class_attendance: list[DashboardClassAttendance] = []
+    test_scores: list[DashboardTestScore] = []
+    recent_tests: list[DashboardTest] = []
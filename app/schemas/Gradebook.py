@@ -0,0 +1,69 @@
+from pydantic import BaseModel, Field
+from datetime import date
+from uuid import UUID
+from typing import Optional
+
+
+class TestCreate(BaseModel):
+    class_id: UUID
+    subject_id: UUID
+    title: str
+    total_marks: int = Field(gt=0)
+    test_date: date
+
+
+class TestResponse(BaseModel):
+    id: UUID
+    class_id: UUID
+    subject_id: UUID
+    teacher_id: UUID
+    title: str
+    total_marks: int
+    test_date: date
+
+    class Config:
+        from_attributes = True
+
+
+class MarksEntry(BaseModel):
+    roll_number: int
+    marks_obtained: int = Field(ge=0)
+
+
+class TestMarks(BaseModel):
+    marks: list[MarksEntry]
+
+
+class TestMarksResponse(BaseModel):
+    test_id: UUID
+    saved: int
+
+
+class GradebookSubject(BaseModel):
+    subject_id: UUID
+    subject_name: str
+    obtained: int
+    total: int
+    # Tests in the range without a result; they count as 0 marks
+    missed: int
+    percentage: float
+
+
+class GradebookStudent(BaseModel):
+    student_id: UUID
+    roll_number: int
+    full_name: str
+    obtained: int
+    total: int
+    # Tests in the range without a result; they count as 0 marks
+    missed: int
+    percentage: float
+    rank: int
+    percentile: float
+    subjects: list[GradebookSubject]
+
+
+class GradebookClass(BaseModel):
+    class_id: UUID
+    class_average: float
+    students: list[GradebookStudent]
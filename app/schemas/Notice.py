@@ -1,5 +1,6 @@
 from pydantic import BaseModel
 import uuid
+from datetime import datetime
 from typing import Optional
 
 class NoticeCreate(BaseModel):
@@ -18,4 +19,7 @@ class NoticeResponse(BaseModel):
     standard : Optional[int]
 
 class NoticeResponseWithID(NoticeResponse):
-    id: uuid.UUID
\ No newline at end of file
+    id: uuid.UUID
+
+class NoticeFeedItem(NoticeResponseWithID):
+    created_at: datetime
@@ -0,0 +1,34 @@
+from pydantic import BaseModel
+from datetime import datetime
+from uuid import UUID
+from typing import Optional
+
+
+class UserSearchResult(BaseModel):
+    id: UUID
+    full_name: str
+    email: str
+    role: str
+    # Students only
+    student_id: Optional[UUID]
+    roll_number: Optional[int]
+    class_id: Optional[UUID]
+    standard: Optional[int]
+    section: Optional[str]
+    score: float
+
+
+class NoticeSearchResult(BaseModel):
+    id: UUID
+    title: str
+    description: str
+    created_by: UUID
+    class_id: Optional[UUID]
+    standard: Optional[int]
+    created_at: datetime
+    score: float
+
+
+class SearchResults(BaseModel):
+    users: list[UserSearchResult]
+    notices: list[NoticeSearchResult]
@@ -16,7 +16,7 @@ class UserResponse(BaseModel):
     role: str
 
     class Config:
-        orm_mode = True
+        from_attributes = True
 
 
 class UserResponseWithID(BaseModel):
@@ -26,7 +26,11 @@ class UserResponseWithID(BaseModel):
     role: str
 
     class Config:
-        orm_mode = True
+        from_attributes = True
+
+
+class UserRoleUpdate(BaseModel):
+    role: Literal["admin", "teacher", "student"]
 
 
 class UserLogin(BaseModel):
@@ -53,12 +57,15 @@ class TeacherAssignSubjectResponse(BaseModel):
     subject_id: UUID
 
     class Config:
-        orm_mode = True
+        from_attributes = True
 
 class TeacherAssignClass(BaseModel):
     teacher_id: UUID
     class_id: UUID
     is_class_teacher: Optional[bool] = False 
+    # The subject the teacher teaches in this class (which Teacher profile
+    # is assigned); without it the class is assigned once, whatever the subject
+    subject_id: Optional[UUID] = None
 
 
 class TeacherAssignClassResponse(BaseModel):
@@ -68,7 +75,7 @@ class TeacherAssignClassResponse(BaseModel):
     is_class_teacher: bool 
     
     class Config:
-        orm_mode = True
+        from_attributes = True
 
 
 class TeacherListItem(BaseModel):
@@ -81,7 +88,7 @@ class TeacherListItem(BaseModel):
     is_class_teacher: bool
 
     class Config:
-        orm_mode = True
+        from_attributes = True
 
 
 class StudentAssignClass(BaseModel):
@@ -96,7 +103,7 @@ class StudentAssignClassResponse(BaseModel):
     roll_number : int 
 
     class Config:
-        orm_mode = True
+        from_attributes = True
         
 class StudentListItem(BaseModel):
     id: UUID
@@ -107,4 +114,4 @@ class StudentListItem(BaseModel):
     class_teacher: Optional[str]
 
     class Config:
-        orm_mode = True
\ No newline at end of file
+        from_attributes = True
\ No newline at end of file
@@ -1,14 +1,26 @@
-from fastapi import HTTPException, Request
-from sqlalchemy.orm import Session, joinedload
+from collections import Counter
+from fastapi import HTTPException, Request, Response
+from sqlalchemy.orm import Session
 from uuid import UUID
-from sqlalchemy import func
+from typing import Optional
+from sqlalchemy import func, literal, select, union_all, and_, false
 from sqlalchemy.exc import IntegrityError
 
-from app.services.auth import register, require_roles
-from app.schemas.Users import TeacherCreate, StudentCreate, TeacherAssignSubject, TeacherAssignClass, StudentAssignClass
-from app.schemas.Class import ClassCreate
-from app.schemas.Subject import SubjectCreate 
+from app.services.auth import register, require_roles, revoke_user_tokens, principal_cache
+from app.schemas.Users import TeacherCreate, StudentCreate, UserRoleUpdate, TeacherAssignSubject, TeacherAssignClass, StudentAssignClass, UserResponseWithID
+from app.schemas.Class import ClassCreate, ClassResponseWithID
+from app.schemas.Subject import SubjectCreate, SubjectResponseWithID
 from app.models.models import Class, User, Subject, Teacher, TeacherClass, Student
+from app.services.pagination import keyset_paginate, DEFAULT_PAGE_SIZE
+from app.database import get_engine, get_async_engine
+from app.services.db_health import probe, pool_status
+from app.services.hashing import hash_pool
+from app.services.slow_queries import slow_query_log
+from app.services.integrity import is_unique_violation
+from app.services.cache import cached, invalidates, service_cache
+from app.services.fast_json import schema_columns, schema_rows
+from app.services.table_versions import bump_table_versions, not_modified, CLASSES_LISTING, SUBJECTS_LISTING, TEACHERS_LISTING
+from app.services.upsert import insert_one, insert_returning
 
 
 
@@ -21,11 +33,19 @@ def create_student(newStudentUser: StudentCreate, db :Session, request:Request):
     # require_roles(['admin'], request=request,db=db)
     return register(newuser=newStudentUser, db=db, UserRole='student')
 
-def all_users(db:Session, request:Request):
+def all_users(db:Session, request:Request, limit: int = DEFAULT_PAGE_SIZE, cursor: Optional[str] = None, role: Optional[str] = None):
     require_roles(['admin'], request=request,db=db)
-    users = db.query(User).all()
-    return users
+    # Project the response fields (plus the sort key) instead of hydrating User objects
+    query = filter_users(db.query(*schema_columns(UserResponseWithID, User), User.created_at), role=role)
+    page = keyset_paginate(query, [User.created_at, User.id], limit=limit, cursor=cursor)
+    return {'items': schema_rows(page['items'], UserResponseWithID), 'next_cursor': page['next_cursor']}
 
+def filter_users(query, role: Optional[str] = None):
+    if role:
+        query = query.filter(User.role == role)
+    return query
+
+@invalidates('users')
 def delete_user(user_id: UUID, db:Session, request:Request):
     require_roles(['admin'],request=request, db=db)
     user = db.query(User).filter(User.id == user_id).first()
@@ -34,127 +54,182 @@ def delete_user(user_id: UUID, db:Session, request:Request):
         raise HTTPException(status_code=404, detail=f"Class with id {user_id} not found!!")
     
     db.delete(user)
+    bump_table_versions(db, 'users')
     db.commit()
+    principal_cache.invalidate(user_id)
     
     return {"detail": f"User {user.full_name} deleted successfully!! "}
 
-def all_teachers(db:Session, request:Request):
+def change_user_role(user_id: UUID, role_data: UserRoleUpdate, db:Session, request:Request):
+    require_roles(['admin'], request=request, db=db)
+    user = db.query(User).filter(User.id == user_id).first()
+    
+    if not user:
+        raise HTTPException(status_code=404, detail=f"User with id {user_id} not found!!")
+    
+    if user.role != role_data.role:
+        user.role = role_data.role
+        bump_table_versions(db, 'users')
+        # Tokens issued with the old role must not keep working
+        revoke_user_tokens(user, db)
+        db.refresh(user)
+    
+    return user
+
+def hashing_stats(db:Session, request:Request):
+    require_roles(['admin'], request=request, db=db)
+    # Queue wait vs hash time of the password hashing pool
+    return hash_pool.stats()
+
+def cache_stats(db:Session, request:Request):
+    require_roles(['admin'], request=request, db=db)
+    # Hit/miss/eviction counters of the service cache, for sizing it
+    return service_cache.stats()
+
+def slow_queries(db:Session, request:Request, limit: int = None):
+    require_roles(['admin'], request=request, db=db)
+    # Statements over SLOW_QUERY_THRESHOLD_MS, newest first, with sampled plans
+    return {**slow_query_log.stats(), 'queries': slow_query_log.entries(limit)}
+
+def db_health(db:Session, request:Request):
+    require_roles(['admin'], request=request, db=db)
+    # The full /health/db probe: pool occupancy and wait, checkout and SELECT 1 times
+    result = probe(get_engine())
+    async_engine = get_async_engine()
+    if async_engine is not None:
+        result['async'] = {'pool': pool_status(async_engine.pool)}
+    return result
+
+def all_teachers(db:Session, request:Request, response: Optional[Response] = None):
     # require_roles(['admin'], request=request,db=db)
+    unchanged = not_modified(TEACHERS_LISTING, db=db, request=request, response=response)
+    if unchanged:
+        return unchanged
+    return teacher_listing(db)
+
+@cached('users', 'teachers', 'subjects', 'classes')
+def teacher_listing(db:Session):
+    return [dict(row._mapping) for row in db.execute(teacher_list_statement())]
+
+def teacher_list_statement():
+    """
+    One row per teacher-class assignment with the TeacherListItem columns;
+    teachers without a class yet get a single row with no class.
+    """
+    return (
+        select(
+            Teacher.id.label('teacher_id'),
+            User.full_name,
+            User.email,
+            Subject.name.label('subject_name'),
+            Class.standard.label('class_standard'),
+            Class.section.label('class_section'),
+            func.coalesce(TeacherClass.is_class_teacher, false()).label('is_class_teacher')
+        )
+        .outerjoin(User, User.id == Teacher.user_id)
+        .outerjoin(Subject, Subject.id == Teacher.subject_id)
+        .outerjoin(TeacherClass, TeacherClass.teacher_id == Teacher.id)
+        .outerjoin(Class, Class.id == TeacherClass.class_id)
+    )
 
-    teachers_list = []
-
-    # Iterate over Teacher profiles. Each teacher may have zero or more TeacherClass assignments.
-    # eager-load related objects to avoid N+1 queries
-    teacher_profiles = db.query(Teacher).options(
-        joinedload(Teacher.user),
-        joinedload(Teacher.subject),
-        joinedload(Teacher.teacher_classes).joinedload(TeacherClass.class_)
-    ).all()
-    for teacher in teacher_profiles:
-        user = getattr(teacher, 'user', None)
-        subject = getattr(teacher, 'subject', None)
-
-        # If teacher has class assignments, return one entry per assignment
-        if teacher.teacher_classes:
-            for tc in teacher.teacher_classes:
-                class_ = getattr(tc, 'class_', None)
-                teachers_list.append({
-                    'teacher_id': teacher.id,
-                    'full_name': user.full_name if user else None,
-                    'email': user.email if user else None,
-                    'subject_name': subject.name if subject else None,
-                    'class_standard': class_.standard if class_ else None,
-                    'class_section': class_.section if class_ else None,
-                    'is_class_teacher': tc.is_class_teacher
-                })
-        else:
-            # No class assigned yet
-            teachers_list.append({
-                'teacher_id': teacher.id,
-                'full_name': user.full_name if user else None,
-                'email': user.email if user else None,
-                'subject_name': subject.name if subject else None,
-                'class_standard': None,
-                'class_section': None,
-                'is_class_teacher': False
-            })
 
-    return teachers_list
+def student_list_statement():
+    """
+    One row per student with the StudentListItem columns.
+
+    Each class's class teacher is resolved once in a CTE: prefer the
+    TeacherClass marked as class teacher, otherwise the first assigned one.
+    """
+    ranked_teachers = (
+        select(
+            TeacherClass.class_id,
+            User.full_name.label('teacher_name'),
+            func.row_number().over(
+                partition_by=TeacherClass.class_id,
+                order_by=(func.coalesce(TeacherClass.is_class_teacher, false()).desc(), TeacherClass.id)
+            ).label('rank')
+        )
+        .join(Teacher, Teacher.id == TeacherClass.teacher_id)
+        .join(User, User.id == Teacher.user_id)
+        .cte('ranked_class_teachers')
+    )
 
+    return (
+        select(
+            Student.id,
+            Student.user_id,
+            Student.roll_number,
+            Class.standard,
+            Class.section,
+            ranked_teachers.c.teacher_name.label('class_teacher')
+        )
+        .outerjoin(Class, Class.id == Student.class_id)
+        .outerjoin(ranked_teachers, and_(
+            ranked_teachers.c.class_id == Student.class_id,
+            ranked_teachers.c.rank == 1
+        ))
+    )
 
 def all_student(db:Session, request :Request ):
     # require_roles(['admin'], request=request, db=db)
+    return student_listing(db)
+
+@cached('users', 'students', 'teachers', 'classes')
+def student_listing(db:Session):
+    # Flat column projection: one row per student, no ORM objects hydrated
+    rows = db.execute(student_list_statement())
 
-    student_list = []
-
-    # Eager-load related objects to avoid N+1 queries
-    student_profiles = db.query(Student).options(
-        joinedload(Student.user),
-        joinedload(Student.class_).joinedload(Class.teacher_classes).joinedload(TeacherClass.teacher).joinedload(Teacher.user),
-    ).all()
-
-    for student in student_profiles:
-        user = getattr(student, 'user', None)
-        class_ = getattr(student, 'class_', None)
-
-        # Find class teacher (prefer TeacherClass with is_class_teacher=True)
-        class_teacher_name = None
-        if class_ and class_.teacher_classes:
-            # prefer the TC marked as class teacher
-            for tc in class_.teacher_classes:
-                if tc.is_class_teacher:
-                    teacher_profile = getattr(tc, 'teacher', None)
-                    teacher_user = getattr(teacher_profile, 'user', None) if teacher_profile else None
-                    class_teacher_name = teacher_user.full_name if teacher_user else None
-                    break
-            # fallback: if none marked, use first assigned teacher
-            if class_teacher_name is None and class_.teacher_classes:
-                tc = class_.teacher_classes[0]
-                teacher_profile = getattr(tc, 'teacher', None)
-                teacher_user = getattr(teacher_profile, 'user', None) if teacher_profile else None
-                class_teacher_name = teacher_user.full_name if teacher_user else None
-
-        student_list.append({
-            'id': student.id,
-            'user_id': student.user_id,
-            'roll_number': student.roll_number,
-            'standard': class_.standard if class_ else None,
-            'section': class_.section if class_ else None,
-            'class_teacher': class_teacher_name
-        })
-
-    return student_list
+    return [dict(row._mapping) for row in rows]
+
+
+def column_values(instance) -> dict:
+    # Cached service results hold plain values, never session-bound ORM objects
+    return {column.key: getattr(instance, column.key) for column in instance.__table__.columns}
 
 
 ## class Related Services
 
+@invalidates('classes')
 def create_class(newClass:ClassCreate, db:Session, request:Request):
     require_roles(['admin'], request=request,db=db)
     
-    is_class = db.query(Class).filter(
-        Class.standard == newClass.standard,
-        Class.section == newClass.section
-    ).first()
-    
-    if is_class:
-        raise HTTPException(status_code=401, detail=f"Class {newClass.standard} {newClass.section} Already Exists!!")
-    
-    new_Class = Class(
-        section = newClass.section,
-        standard = newClass.standard 
-    )
-    
-    db.add(new_Class)
-    db.commit()
-    db.refresh(new_Class)
+    try:
+        # INSERT ... RETURNING: the response comes back with the insert, no refresh after the commit
+        new_Class = insert_one(db, Class, {'section': newClass.section, 'standard': newClass.standard})
+        bump_table_versions(db, 'classes')
+        db.commit()
+    except IntegrityError as e:
+        db.rollback()
+        # uq_classes_standard_section, no racy lookup beforehand
+        if is_unique_violation(e, 'uq_classes_standard_section'):
+            raise HTTPException(status_code=401, detail=f"Class {newClass.standard} {newClass.section} Already Exists!!")
+        raise
     
     return new_Class
 
-def all_classes( db:Session, request:Request):
+def all_classes( db:Session, request:Request, limit: int = DEFAULT_PAGE_SIZE, cursor: Optional[str] = None, standard: Optional[int] = None, section: Optional[str] = None,
+                 response: Optional[Response] = None):
     require_roles(['admin'], request=request,db=db)
-    classes = db.query(Class).all()
-    return classes
-
+    # 304 straight from the version counter while classes are unchanged
+    unchanged = not_modified(CLASSES_LISTING, db=db, request=request, response=response)
+    if unchanged:
+        return unchanged
+    return class_page(db, limit=limit, cursor=cursor, standard=standard, section=section)
+
+@cached('classes')
+def class_page(db:Session, limit: int, cursor: Optional[str], standard: Optional[int], section: Optional[str]):
+    query = filter_classes(db.query(*schema_columns(ClassResponseWithID, Class), Class.created_at), standard=standard, section=section)
+    page = keyset_paginate(query, [Class.created_at, Class.id], limit=limit, cursor=cursor)
+    return {'items': schema_rows(page['items'], ClassResponseWithID), 'next_cursor': page['next_cursor']}
+
+def filter_classes(query, standard: Optional[int] = None, section: Optional[str] = None):
+    if standard is not None:
+        query = query.filter(Class.standard == standard)
+    if section:
+        query = query.filter(Class.section == section)
+    return query
+
+@invalidates('classes')
 def delete_class(class_id: UUID, db:Session, request:Request):
     require_roles(['admin'], request=request, db=db)
     
@@ -164,6 +239,7 @@ def delete_class(class_id: UUID, db:Session, request:Request):
         raise HTTPException(status_code=404, detail=f"Class with id {class_id} not found!!")
     
     db.delete(classtoremove)
+    bump_table_versions(db, 'classes')
     db.commit()
     
     return {"detail": f"Class with id {class_id} deleted successfully!! "}
@@ -172,11 +248,27 @@ def delete_class(class_id: UUID, db:Session, request:Request):
 
 ## subject related services
 
-def all_subjects(db:Session, request:Request):
+def all_subjects(db:Session, request:Request, limit: int = DEFAULT_PAGE_SIZE, cursor: Optional[str] = None, name: Optional[str] = None,
+                 response: Optional[Response] = None):
     require_roles(['admin'], request=request,db=db)
-    subjects = db.query(Subject).all()
-    return subjects
-
+    unchanged = not_modified(SUBJECTS_LISTING, db=db, request=request, response=response)
+    if unchanged:
+        return unchanged
+    return subject_page(db, limit=limit, cursor=cursor, name=name)
+
+@cached('subjects')
+def subject_page(db:Session, limit: int, cursor: Optional[str], name: Optional[str]):
+    query = filter_subjects(db.query(*schema_columns(SubjectResponseWithID, Subject)), name=name)
+    # subjects have no created_at, so page through them alphabetically
+    page = keyset_paginate(query, [Subject.name, Subject.id], limit=limit, cursor=cursor)
+    return {'items': schema_rows(page['items'], SubjectResponseWithID), 'next_cursor': page['next_cursor']}
+
+def filter_subjects(query, name: Optional[str] = None):
+    if name:
+        query = query.filter(func.lower(Subject.name) == func.lower(name))
+    return query
+
+@invalidates('subjects')
 def create_subject(newSubject: SubjectCreate, db:Session, request:Request):
     require_roles(['admin'], request=request,db=db)
     
@@ -187,16 +279,13 @@ def create_subject(newSubject: SubjectCreate, db:Session, request:Request):
     if is_subject:
         raise HTTPException(status_code=401, detail=f"Class {newSubject.name} Already Exists!!")
     
-    new_subject = Subject(
-        name = newSubject.name
-    )
-    
-    db.add(new_subject)
+    new_subject = insert_one(db, Subject, {'name': newSubject.name})
+    bump_table_versions(db, 'subjects')
     db.commit()
-    db.refresh(new_subject)
     
     return new_subject
 
+@invalidates('subjects')
 def delete_subject(subject_id: UUID, db:Session, request:Request):
     require_roles(['admin'], request=request,db=db)
     
@@ -206,6 +295,7 @@ def delete_subject(subject_id: UUID, db:Session, request:Request):
         raise HTTPException(status_code=404, detail=f"Subject with id {subject_id} not found!!")
     
     db.delete(subject)
+    bump_table_versions(db, 'subjects')
     db.commit()
     
     return {"detail": f"Subject with id {subject_id} deleted successfully!!"}
@@ -214,169 +304,237 @@ def delete_subject(subject_id: UUID, db:Session, request:Request):
 
 ## Teacher - Class - Subject Relations
 
-def assign_sub_to_teacher( teacher_data: TeacherAssignSubject,db:Session, request:Request):
-    
-    require_roles(['admin'],request=request, db=db)
-    
-    # Check if this user already has a Teacher profile assigned to the same subject
-    is_sub_assigned = db.query(Teacher).filter(
-        Teacher.user_id == teacher_data.teacher_id,
-        Teacher.subject_id == teacher_data.subject_id
-    ).first()
-
-    if is_sub_assigned:
-        raise HTTPException(status_code=208, detail=f"Subject already assigned to the teacher")
-        
-    is_teacher = db.query(User).filter(
-        User.id == teacher_data.teacher_id,
-        User.role == 'teacher'
-    ).first()
-    
-    if not is_teacher:
-        raise HTTPException(status_code=404, detail=f"Teacher not Found!!")
-    
-    is_subject = db.query(Subject).filter(
-        Subject.id == teacher_data.subject_id
-    ).first()
-    
-    if not is_subject:
-        raise HTTPException(status_code=404, detail=f"Subject not Found!!")
-    
-    new_teacher = Teacher(
-        user_id = teacher_data.teacher_id,
-        subject_id = teacher_data.subject_id
+def _existing_ids(db: Session, **lookups) -> dict:
+    """
+    One round trip for several existence checks. Each keyword maps a name to
+    (key column, value column, where clause); returns name -> {key: [values]}.
+    """
+    branches = [
+        select(literal(name).label('lookup'), key.label('key'), value.label('value')).where(where)
+        for name, (key, value, where) in lookups.items()
+    ]
+    found = {name: {} for name in lookups}
+    for lookup, key, value in db.execute(union_all(*branches)):
+        found[lookup].setdefault(key, []).append(value)
+    return found
+
+
+def _require_found(requested, found, detail: str):
+    missing = [str(id) for id in dict.fromkeys(requested) if id not in found]
+    if missing:
+        # A single assignment keeps its original message; batches say which ids failed
+        raise HTTPException(status_code=404, detail=detail if len(requested) == 1 else f"{detail} {', '.join(missing)}")
+
+
+
+@invalidates('teachers')
+def assign_subjects_to_teachers(assignments: list[TeacherAssignSubject], db: Session, request: Request) -> list:
+    """
+    Give each teacher user a Teacher profile for a subject, all in one
+    transaction: one query validates every teacher and subject, one INSERT
+    creates the profiles. Nothing is written if any assignment fails.
+    """
+    require_roles(['admin'], request=request, db=db)
+    if not assignments:
+        return []
+    teacher_ids = [a.teacher_id for a in assignments]
+    subject_ids = [a.subject_id for a in assignments]
+
+    found = _existing_ids(
+        db,
+        teachers=(User.id, User.id, and_(User.id.in_(set(teacher_ids)), User.role == 'teacher')),
+        subjects=(Subject.id, Subject.id, Subject.id.in_(set(subject_ids))),
     )
-    
-    db.add(new_teacher)
-    db.commit()
-    db.refresh(new_teacher)
-    
-    return new_teacher
-    
-def assign_class_to_teacher(teacher_data:TeacherAssignClass ,db:Session, request: Request):
-    require_roles(['admin'],request=request, db=db)
-    
-    # Ensure the User exists and has role 'teacher'
-    is_teacher_user = db.query(User).filter(
-        User.id == teacher_data.teacher_id
-    ).first()
-
-    if not is_teacher_user:
-        raise HTTPException(status_code=404, detail=f"Teacher user not found!!")
-
-    # Lookup the Teacher profile (teachers table) for that user
-    teacher_profile = db.query(Teacher).filter(Teacher.user_id == teacher_data.teacher_id).first()
-    if not teacher_profile:
-        raise HTTPException(status_code=404, detail="Teacher profile not found. Create a Teacher record first.")
+    _require_found(teacher_ids, found['teachers'], "Teacher not Found!!")
+    _require_found(subject_ids, found['subjects'], "Subject not Found!!")
 
-    # Check class existence
-    is_class = db.query(Class).filter(Class.id == teacher_data.class_id).first()
-    if not is_class:
-        raise HTTPException(status_code=404, detail=f"Class not Found!!")
+    pairs = [(a.teacher_id, a.subject_id) for a in assignments]
+    if len(set(pairs)) < len(pairs):
+        raise HTTPException(status_code=208, detail=f"Subject already assigned to the teacher")
 
-    # Check if this teacher-class assignment already exists (use teacher_profile.id)
-    is_class_assigned = db.query(TeacherClass).filter(
-        TeacherClass.teacher_id == teacher_profile.id,
-        TeacherClass.class_id == teacher_data.class_id
-    ).first()
+    try:
+        created = insert_returning(db, Teacher, [{'user_id': user_id, 'subject_id': subject_id} for user_id, subject_id in pairs],
+                                   [Teacher.id, Teacher.user_id, Teacher.subject_id])
+        bump_table_versions(db, 'teachers')
+        db.commit()
+    except IntegrityError as e:
+        db.rollback()
+        if is_unique_violation(e, 'uq_teachers_user_subject'):
+            raise HTTPException(status_code=208, detail=f"Subject already assigned to the teacher")
+        raise
+    return created
 
-    if is_class_assigned:
+def assign_sub_to_teacher( teacher_data: TeacherAssignSubject,db:Session, request:Request):
+    return assign_subjects_to_teachers([teacher_data], db=db, request=request)[0]
+
+@invalidates('teachers')
+def assign_classes_to_teachers(assignments: list[TeacherAssignClass], db: Session, request: Request) -> list:
+    """
+    Assign teachers (by user id) to classes in one transaction, e.g. a whole
+    timetable: one query validates the users, their Teacher profiles, the
+    classes and their existing assignments, one INSERT creates the new ones.
+
+    A teacher has one profile per subject. With a subject_id the profile of
+    that subject is assigned, so a teacher can take a class for several
+    subjects; without one the class is assigned once, to the user's first
+    profile, and an assignment through any of their profiles is a duplicate.
+    """
+    require_roles(['admin'], request=request, db=db)
+    if not assignments:
+        return []
+    user_ids = [a.teacher_id for a in assignments]
+    class_ids = [a.class_id for a in assignments]
+
+    found = _existing_ids(
+        db,
+        users=(User.id, User.id, User.id.in_(set(user_ids))),
+        profiles=(Teacher.user_id, Teacher.id, Teacher.user_id.in_(set(user_ids))),
+        subjects=(Teacher.id, Teacher.subject_id, Teacher.user_id.in_(set(user_ids))),
+        classes=(Class.id, Class.id, Class.id.in_(set(class_ids))),
+        # profiles already assigned to each class, through any of these users' profiles
+        assigned=(TeacherClass.class_id, TeacherClass.teacher_id, and_(
+            TeacherClass.class_id.in_(set(class_ids)),
+            TeacherClass.teacher_id.in_(select(Teacher.id).where(Teacher.user_id.in_(set(user_ids))))
+        )),
+    )
+    _require_found(user_ids, found['users'], "Teacher user not found!!")
+    _require_found(user_ids, found['profiles'], "Teacher profile not found. Create a Teacher record first.")
+    _require_found(class_ids, found['classes'], "Class not Found!!")
+
+    profiles = {}
+    for a in assignments:
+        user_profiles = sorted(found['profiles'][a.teacher_id])
+        if a.subject_id is not None:
+            user_profiles = [profile for profile in user_profiles if found['subjects'][profile][0] == a.subject_id]
+            if not user_profiles:
+                raise HTTPException(status_code=404, detail="Teacher does not teach this subject. Assign the subject first.")
+        profiles[a.teacher_id, a.subject_id] = user_profiles[0]
+
+    # Same order as a single assignment always had: the 404s above, then the duplicate checks
+    per_user_and_class = Counter((a.teacher_id, a.class_id) for a in assignments)
+    rows = []
+    for a in assignments:
+        profile = profiles[a.teacher_id, a.subject_id]
+        assigned = set(found['assigned'].get(a.class_id, []))
+        if a.subject_id is None:
+            duplicate = bool(assigned & set(found['profiles'][a.teacher_id])) or per_user_and_class[a.teacher_id, a.class_id] > 1
+        else:
+            duplicate = profile in assigned
+        if duplicate:
+            raise HTTPException(status_code=208, detail=f"Class already assigned to the teacher")
+        rows.append({'teacher_id': profile, 'class_id': a.class_id, 'is_class_teacher': a.is_class_teacher})
+    if len({(row['teacher_id'], row['class_id']) for row in rows}) < len(rows):
         raise HTTPException(status_code=208, detail=f"Class already assigned to the teacher")
 
-    new_teacher_class = TeacherClass(
-        teacher_id = teacher_profile.id,
-        class_id = teacher_data.class_id,
-        is_class_teacher = teacher_data.is_class_teacher
-    )
-    
-    db.add(new_teacher_class)
-    db.commit()
-    db.refresh(new_teacher_class)
-    
-    return new_teacher_class
+    try:
+        created = insert_returning(db, TeacherClass, rows,
+                                   [TeacherClass.id, TeacherClass.teacher_id, TeacherClass.class_id, TeacherClass.is_class_teacher])
+        bump_table_versions(db, 'teacher_classes')
+        db.commit()
+    except IntegrityError as e:
+        db.rollback()
+        # An existing teacher-class assignment trips uq_teacher_classes_teacher_class
+        if is_unique_violation(e, 'uq_teacher_classes_teacher_class'):
+            raise HTTPException(status_code=208, detail=f"Class already assigned to the teacher")
+        raise
+    return created
+
+def assign_class_to_teacher(teacher_data:TeacherAssignClass ,db:Session, request: Request):
+    return assign_classes_to_teachers([teacher_data], db=db, request=request)[0]
 
 def teacher_of_class(class_id: UUID, db: Session, request: Request):
     # require_roles(['admin', 'teacher'], request=request, db=db)
-    is_class = db.query(Class).filter(Class.id == class_id).first()
-    if not is_class:
-        raise HTTPException(status_code=404, detail=f"Class not Found!!")
-    
-    teacher_class = db.query(TeacherClass).filter(TeacherClass.class_id == class_id).first()
+    teacher_class = class_teacher_assignment(db, class_id=class_id)
     if not teacher_class:
+        # Only a miss needs to tell "no such class" apart from "no teacher yet"
+        is_class = db.query(Class).filter(Class.id == class_id).first()
+        if not is_class:
+            raise HTTPException(status_code=404, detail=f"Class not Found!!")
         raise HTTPException(status_code=404, detail=f"No teacher assigned to this class!!")
     
     return teacher_class
 
+@cached('classes', 'teachers')
+def class_teacher_assignment(db: Session, class_id: UUID):
+    teacher_class = db.query(TeacherClass).filter(TeacherClass.class_id == class_id).first()
+    return column_values(teacher_class) if teacher_class else None
+
 
 ## Student Class Relations
 
-def assing_class_to_student(student_data:StudentAssignClass ,db:Session,request:Request):
-    require_roles(['admin'],request=request, db=db)
-    
-    is_student_user = db.query(Student).filter(
-        Student.user_id == student_data.student_id
-    ).first()
-    
-    if is_student_user:
-        raise HTTPException(status_code=404, detail=f"Student Already Assigned Class!!")
-    
-    # Ensure the referenced user exists
-    is_user = db.query(User).filter(User.id == student_data.student_id).first()
-    if not is_user:
-        # Return an HTTP-friendly error instead of allowing a DB IntegrityError
-        raise HTTPException(status_code=404, detail=f"Student User Not Found!!")
-
-    # Ensure the class exists
-    is_class = db.query(Class).filter(Class.id == student_data.class_id).first()
-    if not is_class:
-        raise HTTPException(status_code=404, detail=f"Class Not Found!!")
-    
-    new_student = Student(
-        user_id = student_data.student_id,
-        class_id = student_data.class_id,
-        roll_number = student_data.roll_number
+@invalidates('students')
+def assign_classes_to_students(assignments: list[StudentAssignClass], db: Session, request: Request) -> list:
+    """
+    Give each student user a Student profile in a class, in one transaction:
+    one query validates the users and classes, one INSERT creates the
+    profiles.
+    """
+    require_roles(['admin'], request=request, db=db)
+    if not assignments:
+        return []
+    user_ids = [a.student_id for a in assignments]
+    class_ids = [a.class_id for a in assignments]
+
+    found = _existing_ids(
+        db,
+        users=(User.id, User.id, User.id.in_(set(user_ids))),
+        classes=(Class.id, Class.id, Class.id.in_(set(class_ids))),
     )
-    db.add(new_student)
+    # Return an HTTP-friendly error instead of allowing a DB IntegrityError
+    _require_found(user_ids, found['users'], "Student User Not Found!!")
+    _require_found(class_ids, found['classes'], "Class Not Found!!")
+
+    if len(set(user_ids)) < len(user_ids):
+        raise HTTPException(status_code=404, detail=f"Student Already Assigned Class!!")
+
     try:
+        created = insert_returning(db, Student,
+                                   [{'user_id': a.student_id, 'class_id': a.class_id, 'roll_number': a.roll_number} for a in assignments],
+                                   [Student.id, Student.user_id, Student.class_id, Student.roll_number])
+        bump_table_versions(db, 'students')
         db.commit()
-        db.refresh(new_student)
     except IntegrityError as e:
         db.rollback()
+        # A user has one Student profile (uq_students_user_id)
+        if is_unique_violation(e, 'uq_students_user_id'):
+            raise HTTPException(status_code=404, detail=f"Student Already Assigned Class!!")
         # Convert DB integrity errors into HTTPExceptions with a helpful message
         raise HTTPException(status_code=400, detail=f"Could not assign student to class: {str(e.orig)}")
+    return created
 
-    return new_student
-
+def assing_class_to_student(student_data:StudentAssignClass ,db:Session,request:Request):
+    return assign_classes_to_students([student_data], db=db, request=request)[0]
 
 ## Notice related Services
 from app.models.models import Notice
-from app.schemas.Notice import NoticeCreate, NoticeResponse
+from app.schemas.Notice import NoticeCreate, NoticeResponse, NoticeResponseWithID
+from app.services.notice_feed import invalidate_notice_feed
 
 def create_notice(noticedata:NoticeCreate, db:Session, request:Request ):
     require_roles(['admin','teacher'],request=request,db=db)
-    # Exactly one of class_id or standard must be provided (mutually exclusive)
-    has_class = bool(noticedata.class_id)
-    has_standard = bool(noticedata.standard)
-    if has_class == has_standard:
-        # either both provided or both missing
-        raise HTTPException(status_code=400, detail="Provide exactly one of 'class_id' or 'standard'")
+    # At most one of class_id or standard (mutually exclusive); neither means a school-wide notice
+    # (standard 0 is a target, not "unset")
+    has_class = noticedata.class_id is not None
+    has_standard = noticedata.standard is not None
+    if has_class and has_standard:
+        raise HTTPException(status_code=400, detail="Provide at most one of 'class_id' or 'standard'")
 
     # If class_id provided, ensure the class exists
-    if noticedata.class_id:
+    if has_class:
         is_class = db.query(Class).filter(Class.id == noticedata.class_id).first()
         if not is_class:
             raise HTTPException(status_code=404, detail="Class not found for given class_id")
 
-    new_notice = Notice(
-        title = noticedata.title,
-        description = noticedata.description,
-        created_by = noticedata.created_by,
-        class_id = noticedata.class_id or None,
-        standard = noticedata.standard or None   
-    )
-    db.add(new_notice)
+    new_notice = insert_one(db, Notice, {
+        'title': noticedata.title,
+        'description': noticedata.description,
+        'created_by': noticedata.created_by,
+        'class_id': noticedata.class_id,
+        'standard': noticedata.standard
+    })
+    bump_table_versions(db, 'notices')
     db.commit()
-    db.refresh(new_notice)
+    invalidate_notice_feed(new_notice)
     return new_notice
 
 def delete_notice(notice_id: UUID, db:Session, request:Request):
@@ -387,11 +545,24 @@ def delete_notice(notice_id: UUID, db:Session, request:Request):
         raise HTTPException(status_code=404, detail="Notice not found for given notice_id")
     
     db.delete(is_notice)
+    bump_table_versions(db, 'notices')
     db.commit()
+    invalidate_notice_feed(is_notice)
     
     return f"{is_notice.title} is Deleted Successfully!!!"
 
-def all_notices(db:Session, request:Request):
+def all_notices(db:Session, request:Request, limit: int = DEFAULT_PAGE_SIZE, cursor: Optional[str] = None, class_id: Optional[UUID] = None, standard: Optional[int] = None, created_by: Optional[UUID] = None):
     require_roles(['admin', 'teacher'], request=request, db=db)
-    notices = db.query(Notice).all()
-    return notices        
\ No newline at end of file
+    query = filter_notices(db.query(*schema_columns(NoticeResponseWithID, Notice), Notice.created_at), class_id=class_id, standard=standard, created_by=created_by)
+    # newest notices first
+    page = keyset_paginate(query, [Notice.created_at, Notice.id], limit=limit, cursor=cursor, descending=True)
+    return {'items': schema_rows(page['items'], NoticeResponseWithID), 'next_cursor': page['next_cursor']}
+
+def filter_notices(query, class_id: Optional[UUID] = None, standard: Optional[int] = None, created_by: Optional[UUID] = None):
+    if class_id:
+        query = query.filter(Notice.class_id == class_id)
+    if standard is not None:
+        query = query.filter(Notice.standard == standard)
+    if created_by:
+        query = query.filter(Notice.created_by == created_by)
+    return query
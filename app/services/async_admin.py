@@ -0,0 +1,68 @@
+"""
+asyncio versions of the read services in app/services/admin.py, used when
+DATABASE_ASYNC is enabled. Queries, filters and row shaping are shared with
+the sync module so both modes return the same data.
+"""
+from fastapi import Request, Response
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select
+from uuid import UUID
+from typing import Optional
+
+from app.models.models import Class, User, Subject, Notice
+from app.schemas.Users import UserResponseWithID
+from app.schemas.Class import ClassResponseWithID
+from app.schemas.Subject import SubjectResponseWithID
+from app.schemas.Notice import NoticeResponseWithID
+from app.services.async_auth import require_roles
+from app.services.admin import (
+    teacher_list_statement, student_list_statement,
+    filter_users, filter_classes, filter_subjects, filter_notices
+)
+from app.services.pagination import keyset_paginate_async, DEFAULT_PAGE_SIZE
+from app.services.fast_json import schema_columns, schema_rows
+from app.services.table_versions import not_modified_async, CLASSES_LISTING, SUBJECTS_LISTING, TEACHERS_LISTING
+
+
+async def all_users(db: AsyncSession, request: Request, limit: int = DEFAULT_PAGE_SIZE, cursor: Optional[str] = None, role: Optional[str] = None):
+    await require_roles(['admin'], request=request, db=db)
+    stmt = filter_users(select(*schema_columns(UserResponseWithID, User), User.created_at), role=role)
+    page = await keyset_paginate_async(db, stmt, [User.created_at, User.id], limit=limit, cursor=cursor)
+    return {'items': schema_rows(page['items'], UserResponseWithID), 'next_cursor': page['next_cursor']}
+
+async def all_teachers(db: AsyncSession, request: Request, response: Optional[Response] = None):
+    unchanged = await not_modified_async(TEACHERS_LISTING, db=db, request=request, response=response)
+    if unchanged:
+        return unchanged
+    result = await db.execute(teacher_list_statement())
+    return [dict(row._mapping) for row in result]
+
+async def all_student(db: AsyncSession, request: Request):
+    result = await db.execute(student_list_statement())
+    return [dict(row._mapping) for row in result]
+
+async def all_classes(db: AsyncSession, request: Request, limit: int = DEFAULT_PAGE_SIZE, cursor: Optional[str] = None, standard: Optional[int] = None, section: Optional[str] = None,
+                      response: Optional[Response] = None):
+    await require_roles(['admin'], request=request, db=db)
+    unchanged = await not_modified_async(CLASSES_LISTING, db=db, request=request, response=response)
+    if unchanged:
+        return unchanged
+    stmt = filter_classes(select(*schema_columns(ClassResponseWithID, Class), Class.created_at), standard=standard, section=section)
+    page = await keyset_paginate_async(db, stmt, [Class.created_at, Class.id], limit=limit, cursor=cursor)
+    return {'items': schema_rows(page['items'], ClassResponseWithID), 'next_cursor': page['next_cursor']}
+
+async def all_subjects(db: AsyncSession, request: Request, limit: int = DEFAULT_PAGE_SIZE, cursor: Optional[str] = None, name: Optional[str] = None,
+                       response: Optional[Response] = None):
+    await require_roles(['admin'], request=request, db=db)
+    unchanged = await not_modified_async(SUBJECTS_LISTING, db=db, request=request, response=response)
+    if unchanged:
+        return unchanged
+    stmt = filter_subjects(select(*schema_columns(SubjectResponseWithID, Subject)), name=name)
+    page = await keyset_paginate_async(db, stmt, [Subject.name, Subject.id], limit=limit, cursor=cursor)
+    return {'items': schema_rows(page['items'], SubjectResponseWithID), 'next_cursor': page['next_cursor']}
+
+async def all_notices(db: AsyncSession, request: Request, limit: int = DEFAULT_PAGE_SIZE, cursor: Optional[str] = None, class_id: Optional[UUID] = None, standard: Optional[int] = None, created_by: Optional[UUID] = None):
+    await require_roles(['admin', 'teacher'], request=request, db=db)
+    stmt = filter_notices(select(*schema_columns(NoticeResponseWithID, Notice), Notice.created_at), class_id=class_id, standard=standard, created_by=created_by)
+    page = await keyset_paginate_async(db, stmt, [Notice.created_at, Notice.id], limit=limit, cursor=cursor, descending=True)
+    return {'items': schema_rows(page['items'], NoticeResponseWithID), 'next_cursor': page['next_cursor']}
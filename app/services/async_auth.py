@@ -0,0 +1,140 @@
+"""
+asyncio versions of the services in app/services/auth.py, used when
+DATABASE_ASYNC is enabled. Token handling and the principal cache are shared
+with the sync module; only the database access differs.
+"""
+from fastapi import HTTPException, status, Request
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import func, select
+from sqlalchemy.exc import IntegrityError
+from datetime import datetime, timedelta
+import jwt
+
+from app.schemas.Users import UserCreate, UserLogin
+from app.models.models import User
+from app.services.hashing import hash_pool, get_profile, verify_and_update, INTERACTIVE
+from app.services.integrity import is_unique_violation
+from app.services.upsert import returning_insert
+from app.services.table_versions import bump_table_versions_async
+from app.services.auth import (
+    SECRET_KEY, ALGORITHM, ACCESS_TOKEN_EXPIRE_MINUTES, principal_cache,
+    _role_value, _decode_token, _token_user_id,
+    _principal_from_user, _check_token_version
+)
+
+
+async def _user_by_email(email: str, db: AsyncSession):
+    result = await db.execute(select(User).where(func.lower(User.email) == func.lower(email)))
+    return result.scalars().first()
+
+async def _user_by_id(user_id, db: AsyncSession):
+    result = await db.execute(select(User).where(User.id == user_id))
+    return result.scalars().first()
+
+async def register(newuser: UserCreate, db: AsyncSession, UserRole: str = "student", hash_profile: str = INTERACTIVE):
+    is_user = await _user_by_email(newuser.email, db)
+
+    if(is_user):
+        raise HTTPException(status_code=401, detail="Email Already Used")
+
+    # argon2 is CPU bound, keep it off the event loop
+    hash_password = await hash_pool.run_async(get_profile(hash_profile).hash, newuser.password)
+
+    try:
+        result = await db.execute(returning_insert(User), [{
+            'full_name': newuser.full_name,
+            'email': newuser.email,
+            'password_hash': hash_password,
+            'role': UserRole
+        }])
+        new_user = result.one()
+        await bump_table_versions_async(db, 'users')
+        await db.commit()
+    except IntegrityError as e:
+        await db.rollback()
+        # Registered concurrently since the lookup above (ix_users_email_lower)
+        if is_unique_violation(e, 'ix_users_email_lower') or is_unique_violation(e, 'users_email_key'):
+            raise HTTPException(status_code=401, detail="Email Already Used")
+        raise
+
+    return new_user
+
+async def login(userdata: UserLogin, db: AsyncSession):
+    user = await _user_by_email(userdata.email, db)
+
+    if not user:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND,detail="User Not Found")
+
+    valid, new_hash = await hash_pool.run_async(verify_and_update, userdata.password, user.password_hash)
+    if not valid:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND,detail="Wrong Password!")
+
+    if new_hash:
+        user.password_hash = new_hash
+        await db.commit()
+
+    expiry_time = datetime.now() + timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
+    token = jwt.encode({
+        '_id': str(user.id),
+        'full_name': user.full_name,
+        'role': _role_value(user.role),
+        'ver': user.token_version or 0,
+        'exp': expiry_time
+    }, key=SECRET_KEY, algorithm=ALGORITHM)
+
+    return {
+        'token': token,
+        'user': {
+            'id': user.id,
+            'full_name': user.full_name,
+            'email': user.email,
+            'role': user.role
+        }
+    }
+
+async def is_authenticated(request: Request, db: AsyncSession):
+    data = _decode_token(request)
+    user_id = _token_user_id(data)
+
+    user = await _user_by_id(user_id, db)
+    if not user:
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid Token!!")
+
+    principal = _principal_from_user(user)
+    _check_token_version(data, principal)
+    principal_cache.set(principal)
+
+    return user
+
+async def get_principal(request: Request, db: AsyncSession):
+    data = _decode_token(request)
+    user_id = _token_user_id(data)
+
+    principal = principal_cache.get(str(user_id))
+    if principal is None:
+        user = await _user_by_id(user_id, db)
+        if not user:
+            raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid Token!!")
+        principal = _principal_from_user(user)
+        principal_cache.set(principal)
+
+    _check_token_version(data, principal)
+    return principal
+
+async def require_roles(allowed_roles: list, request: Request, db: AsyncSession):
+    """
+    Async counterpart of app.services.auth.require_roles.
+    Returns the Principal of the caller if authorized.
+    """
+    user = await get_principal(request, db)
+
+    user_role = user.role.lower() if user.role else ""
+    allowed_roles_lower = [role.lower() for role in allowed_roles]
+
+    if user_role not in allowed_roles_lower:
+        roles_str = ", ".join(allowed_roles)
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail=f"Access denied! Required roles: {roles_str}. Your role: {user.role}"
+        )
+    return user
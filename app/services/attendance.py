@@ -0,0 +1,291 @@
+from fastapi import HTTPException, Request
+from sqlalchemy.orm import Session
+from sqlalchemy import select, delete, insert, func, case, cast, and_, Date
+from uuid import UUID, uuid4
+from datetime import date
+from typing import Optional
+
+from app.models.models import (
+    AttendanceRecord, AttendanceSession, AttendanceStatus, AttendanceStudentMonthly, AttendanceClassDaily,
+    Student, Teacher, TeacherClass
+)
+from app.schemas.Attendance import AttendanceMark
+from app.services.auth import require_roles
+from app.services.upsert import dialect_insert
+
+
+def _teacher_profile_for_class(user_id: UUID, class_id: UUID, db: Session):
+    # A teacher user has one Teacher row per subject; any of them assigned to the class will do
+    return db.execute(
+        select(Teacher.id)
+        .join(TeacherClass, TeacherClass.teacher_id == Teacher.id)
+        .where(Teacher.user_id == user_id, TeacherClass.class_id == class_id)
+        .limit(1)
+    ).scalar()
+
+
+def mark_attendance(attendance: AttendanceMark, db: Session, request: Request):
+    """
+    Mark a whole class for a day from the list of absent roll numbers.
+
+    Costs a fixed number of statements whatever the class size: teacher
+    lookup, session upsert, roster fetch, one multi-row upsert of every
+    record and the rollup updates. Marking the same class and date again
+    overwrites the earlier marks.
+    """
+    principal = require_roles(['teacher'], request=request, db=db)
+
+    teacher_id = _teacher_profile_for_class(UUID(principal.id), attendance.class_id, db)
+    if not teacher_id:
+        raise HTTPException(status_code=403, detail="You are not assigned to this class!!")
+
+    roster = db.execute(
+        select(Student.id, Student.roll_number).where(Student.class_id == attendance.class_id)
+    ).all()
+    if not roster:
+        raise HTTPException(status_code=404, detail="No students in this class!!")
+
+    absent = set(attendance.absent_roll_numbers)
+    unknown = absent - {roll_number for _, roll_number in roster}
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Unknown roll numbers: {sorted(unknown)}")
+
+    session_insert = dialect_insert(db, AttendanceSession).values(
+        id=uuid4(),
+        class_id=attendance.class_id,
+        teacher_id=teacher_id,
+        date=attendance.date
+    )
+    session_id = db.execute(
+        session_insert.on_conflict_do_update(
+            index_elements=[AttendanceSession.class_id, AttendanceSession.date],
+            set_={'teacher_id': session_insert.excluded.teacher_id}
+        ).returning(AttendanceSession.id)
+    ).scalar_one()
+
+    # The session upsert row-locks the session until commit, so concurrent
+    # markings of the same class and day see each other's records here
+    previous = dict(db.execute(
+        select(AttendanceRecord.student_id, AttendanceRecord.status).where(AttendanceRecord.session_id == session_id)
+    ).all())
+
+    records_insert = dialect_insert(db, AttendanceRecord).values([
+        {
+            'id': uuid4(),
+            'session_id': session_id,
+            'student_id': student_id,
+            'status': AttendanceStatus.absent if roll_number in absent else AttendanceStatus.present
+        }
+        for student_id, roll_number in roster
+    ])
+    db.execute(
+        records_insert.on_conflict_do_update(
+            index_elements=[AttendanceRecord.session_id, AttendanceRecord.student_id],
+            set_={'status': records_insert.excluded.status}
+        )
+    )
+
+    current = {
+        student_id: AttendanceStatus.absent if roll_number in absent else AttendanceStatus.present
+        for student_id, roll_number in roster
+    }
+    _update_student_monthly(previous, current, attendance.date, db)
+    _refresh_class_daily(session_id, attendance.class_id, attendance.date, db)
+    db.commit()
+
+    return {
+        'session_id': session_id,
+        'class_id': attendance.class_id,
+        'date': attendance.date,
+        'present': len(roster) - len(absent),
+        'absent': len(absent),
+        'absent_roll_numbers': sorted(absent)
+    }
+
+
+## Rollups
+# Reports read only from attendance_student_monthly and attendance_class_daily,
+# so their cost depends on the students in the result, not on history.
+
+def _month(day: date) -> date:
+    return day.replace(day=1)
+
+
+def _update_student_monthly(previous: dict, current: dict, day: date, db: Session):
+    """Apply the per-student change between the old and new marks as increments."""
+    deltas = []
+    for student_id, status in current.items():
+        old = previous.get(student_id)
+        if old == status:
+            continue
+        deltas.append({
+            'student_id': student_id,
+            'month': _month(day),
+            'present_count': (status == AttendanceStatus.present) - (old == AttendanceStatus.present),
+            'absent_count': (status == AttendanceStatus.absent) - (old == AttendanceStatus.absent)
+        })
+    if not deltas:
+        return
+
+    monthly_insert = dialect_insert(db, AttendanceStudentMonthly).values(deltas)
+    db.execute(
+        monthly_insert.on_conflict_do_update(
+            index_elements=[AttendanceStudentMonthly.student_id, AttendanceStudentMonthly.month],
+            set_={
+                'present_count': AttendanceStudentMonthly.present_count + monthly_insert.excluded.present_count,
+                'absent_count': AttendanceStudentMonthly.absent_count + monthly_insert.excluded.absent_count
+            }
+        )
+    )
+
+
+def _status_counts():
+    return (
+        func.sum(case((AttendanceRecord.status == AttendanceStatus.present, 1), else_=0)),
+        func.sum(case((AttendanceRecord.status == AttendanceStatus.absent, 1), else_=0))
+    )
+
+
+def _refresh_class_daily(session_id: UUID, class_id: UUID, day: date, db: Session):
+    """Recount the one session of the class-day, which only touches a class worth of rows."""
+    present_count, absent_count = db.execute(
+        select(*_status_counts()).where(AttendanceRecord.session_id == session_id)
+    ).one()
+
+    daily_insert = dialect_insert(db, AttendanceClassDaily).values(
+        class_id=class_id,
+        date=day,
+        present_count=present_count or 0,
+        absent_count=absent_count or 0
+    )
+    db.execute(
+        daily_insert.on_conflict_do_update(
+            index_elements=[AttendanceClassDaily.class_id, AttendanceClassDaily.date],
+            set_={
+                'present_count': daily_insert.excluded.present_count,
+                'absent_count': daily_insert.excluded.absent_count
+            }
+        )
+    )
+
+
+def _month_start(column, dialect: str):
+    if dialect == "sqlite":
+        return func.date(column, 'start of month')
+    return cast(func.date_trunc('month', column), Date)
+
+
+def rebuild_attendance_rollups(db: Session):
+    """
+    Recompute both rollup tables from attendance_records, e.g. after a bulk
+    load or a manual fix of records. Full scan, meant for db_manager.py.
+    """
+    month = _month_start(AttendanceSession.date, db.get_bind().dialect.name)
+    present_count, absent_count = _status_counts()
+
+    db.execute(delete(AttendanceStudentMonthly))
+    db.execute(delete(AttendanceClassDaily))
+    db.execute(
+        insert(AttendanceStudentMonthly).from_select(
+            ['student_id', 'month', 'present_count', 'absent_count'],
+            select(AttendanceRecord.student_id, month, present_count, absent_count)
+            .select_from(AttendanceRecord)
+            .join(AttendanceSession, AttendanceSession.id == AttendanceRecord.session_id)
+            .group_by(AttendanceRecord.student_id, month)
+        )
+    )
+    db.execute(
+        insert(AttendanceClassDaily).from_select(
+            ['class_id', 'date', 'present_count', 'absent_count'],
+            select(AttendanceSession.class_id, AttendanceSession.date, present_count, absent_count)
+            .select_from(AttendanceRecord)
+            .join(AttendanceSession, AttendanceSession.id == AttendanceRecord.session_id)
+            .group_by(AttendanceSession.class_id, AttendanceSession.date)
+        )
+    )
+    db.commit()
+
+
+def _percentage(present: int, absent: int) -> Optional[float]:
+    total = present + absent
+    return round(present * 100 / total, 2) if total else None
+
+
+def student_attendance_report(student_id: UUID, db: Session, request: Request, start_month: Optional[date] = None, end_month: Optional[date] = None):
+    require_roles(['admin', 'teacher'], request=request, db=db)
+
+    query = select(
+        AttendanceStudentMonthly.month, AttendanceStudentMonthly.present_count, AttendanceStudentMonthly.absent_count
+    ).where(AttendanceStudentMonthly.student_id == student_id)
+    if start_month:
+        query = query.where(AttendanceStudentMonthly.month >= _month(start_month))
+    if end_month:
+        query = query.where(AttendanceStudentMonthly.month <= _month(end_month))
+    rows = db.execute(query.order_by(AttendanceStudentMonthly.month)).all()
+
+    present = sum(row.present_count for row in rows)
+    absent = sum(row.absent_count for row in rows)
+    return {
+        'student_id': student_id,
+        'present': present,
+        'absent': absent,
+        'percentage': _percentage(present, absent),
+        'months': [{
+            'month': row.month,
+            'present': row.present_count,
+            'absent': row.absent_count,
+            'percentage': _percentage(row.present_count, row.absent_count)
+        } for row in rows]
+    }
+
+
+def class_attendance_report(class_id: UUID, db: Session, request: Request, start_month: Optional[date] = None, end_month: Optional[date] = None):
+    """Attendance percentage of every student in the class over a range of months."""
+    require_roles(['admin', 'teacher'], request=request, db=db)
+
+    rollup_filters = [AttendanceStudentMonthly.student_id == Student.id]
+    if start_month:
+        rollup_filters.append(AttendanceStudentMonthly.month >= _month(start_month))
+    if end_month:
+        rollup_filters.append(AttendanceStudentMonthly.month <= _month(end_month))
+
+    rows = db.execute(
+        select(
+            Student.id,
+            Student.roll_number,
+            func.coalesce(func.sum(AttendanceStudentMonthly.present_count), 0).label('present'),
+            func.coalesce(func.sum(AttendanceStudentMonthly.absent_count), 0).label('absent')
+        )
+        .outerjoin(AttendanceStudentMonthly, and_(*rollup_filters))
+        .where(Student.class_id == class_id)
+        .group_by(Student.id, Student.roll_number)
+        .order_by(Student.roll_number)
+    ).all()
+
+    return [{
+        'student_id': row.id,
+        'roll_number': row.roll_number,
+        'present': row.present,
+        'absent': row.absent,
+        'percentage': _percentage(row.present, row.absent)
+    } for row in rows]
+
+
+def class_daily_report(class_id: UUID, db: Session, request: Request, start_date: Optional[date] = None, end_date: Optional[date] = None):
+    require_roles(['admin', 'teacher'], request=request, db=db)
+
+    query = select(
+        AttendanceClassDaily.date, AttendanceClassDaily.present_count, AttendanceClassDaily.absent_count
+    ).where(AttendanceClassDaily.class_id == class_id)
+    if start_date:
+        query = query.where(AttendanceClassDaily.date >= start_date)
+    if end_date:
+        query = query.where(AttendanceClassDaily.date <= end_date)
+    rows = db.execute(query.order_by(AttendanceClassDaily.date)).all()
+
+    return [{
+        'date': row.date,
+        'present': row.present_count,
+        'absent': row.absent_count,
+        'percentage': _percentage(row.present_count, row.absent_count)
+    } for row in rows]
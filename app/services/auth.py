@@ -1,30 +1,48 @@
 from fastapi import HTTPException, status, Request
 from sqlalchemy.orm import Session 
 from sqlalchemy import func
-from pwdlib import PasswordHash
+from sqlalchemy.exc import IntegrityError
 from datetime import datetime, timedelta
+from uuid import UUID
 import jwt
 from jwt.exceptions import InvalidTokenError
 from dotenv import load_dotenv
 import os
 from app.schemas.Users import UserCreate, UserLogin
 from app.models.models import User
+from app.services.principal_cache import Principal, PrincipalCache
+from app.services.integrity import is_unique_violation
+from app.services.hashing import hash_pool, get_profile, verify_and_update, INTERACTIVE
+from app.services.upsert import insert_one
+from app.services.table_versions import bump_table_versions
 load_dotenv()
 
 SECRET_KEY = os.getenv("SECRET_KEY")
 ALGORITHM = os.getenv("ALGORITHM")
 ACCESS_TOKEN_EXPIRE_MINUTES = int(os.getenv("ACCESS_TOKEN_EXPIRE_MINUTES"))
 
-password_hash = PasswordHash.recommended()
+# Role and token version of recently seen users, so authorization does not
+# need a users lookup on every request. Entries expire after the TTL, which
+# bounds how long another worker process can act on a stale role.
+principal_cache = PrincipalCache(
+    max_size=int(os.getenv("PRINCIPAL_CACHE_MAX_SIZE", "10000")),
+    ttl_seconds=float(os.getenv("PRINCIPAL_CACHE_TTL_SECONDS", "300")),
+)
 
 
-def get_password_hash(password):
-    return password_hash.hash(password)
+# All of these run on the bounded hashing pool, which answers 503 when it is saturated
+def get_password_hash(password, profile: str = INTERACTIVE):
+    return hash_pool.run(get_profile(profile).hash, password)
 
 def verify_password(plain_password, hashed_password):
-    return password_hash.verify(plain_password,hashed_password)
+    valid, _ = verify_password_and_update(plain_password, hashed_password)
+    return valid
 
-def register(newuser: UserCreate,db:Session, UserRole: str = "student"):
+def verify_password_and_update(plain_password, hashed_password):
+    """Returns (valid, new_hash); new_hash is set when the stored hash should be upgraded."""
+    return hash_pool.run(verify_and_update, plain_password, hashed_password)
+
+def register(newuser: UserCreate,db:Session, UserRole: str = "student", hash_profile: str = INTERACTIVE):
     is_user = db.query(User).filter(
         func.lower(User.email) == func.lower(newuser.email)
     ).first()
@@ -32,24 +50,28 @@ def register(newuser: UserCreate,db:Session, UserRole: str = "student"):
     if(is_user):
         raise HTTPException(status_code=401, detail="Email Already Used")
     
-    hash_password = get_password_hash(newuser.password)
-    
-    new_user = User(
-        full_name=newuser.full_name,
-        email = newuser.email,
-        password_hash = hash_password,
-        role = UserRole
-    )
+    hash_password = get_password_hash(newuser.password, profile=hash_profile)
     
-    db.add(new_user)
-    db.commit()
-    db.refresh(new_user)
+    try:
+        # RETURNING brings back id and created_at, so no refresh after the commit
+        new_user = insert_one(db, User, {
+            'full_name': newuser.full_name,
+            'email': newuser.email,
+            'password_hash': hash_password,
+            'role': UserRole
+        })
+        bump_table_versions(db, 'users')
+        db.commit()
+    except IntegrityError as e:
+        db.rollback()
+        # Registered concurrently since the lookup above (ix_users_email_lower)
+        if is_unique_violation(e, 'ix_users_email_lower') or is_unique_violation(e, 'users_email_key'):
+            raise HTTPException(status_code=401, detail="Email Already Used")
+        raise
 
     return new_user
 
 def login(userdata:UserLogin,db:Session):
-    print(userdata)
-    
     user = db.query(User).filter(
         func.lower(User.email) == func.lower(userdata.email)
     ).first()
@@ -57,12 +79,23 @@ def login(userdata:UserLogin,db:Session):
     if not user:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND,detail="User Not Found")
 
-    if not verify_password(userdata.password,user.password_hash):
+    valid, new_hash = verify_password_and_update(userdata.password, user.password_hash)
+    if not valid:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND,detail="Wrong Password!")
+
+    # Transparently upgrade hashes made with an older or cheaper profile
+    if new_hash:
+        user.password_hash = new_hash
+        db.commit()
         
     expiry_time = datetime.now() + timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
-    print("Type of user id: ",type(user.id))
-    token = jwt.encode({'_id':str(user.id), 'full_name':user.full_name, 'exp':expiry_time},key=SECRET_KEY,algorithm=ALGORITHM)
+    token = jwt.encode({
+        '_id': str(user.id),
+        'full_name': user.full_name,
+        'role': _role_value(user.role),
+        'ver': user.token_version or 0,
+        'exp': expiry_time
+    }, key=SECRET_KEY, algorithm=ALGORITHM)
     
     return {
         'token': token,
@@ -74,24 +107,82 @@ def login(userdata:UserLogin,db:Session):
         }
     }
 
-def is_authenticated(request:Request, db :Session):
+def _role_value(role):
+    return role.value if hasattr(role, 'value') else role
+
+def _decode_token(request: Request):
+    token = request.headers.get("Authorization")
+    if not token:
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Token Not Found!!")
+    token = token.split(" ")[-1]
     try:
-        token = request.headers.get("Authorization")
-        if not token:
-            raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Token Not Found!!")
-        token = token.split(" ")[-1]
-        
-        data = jwt.decode(token,key=SECRET_KEY,algorithms=ALGORITHM)
-        user_id = data.get("_id") 
-        
+        return jwt.decode(token,key=SECRET_KEY,algorithms=ALGORITHM)
+    except InvalidTokenError:
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="You Are Not Authorized!!")
+
+def _token_user_id(data: dict):
+    try:
+        return UUID(data.get("_id"))
+    except (TypeError, ValueError):
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid Token!!")
+
+def _principal_from_user(user: User):
+    return Principal(
+        id=str(user.id),
+        full_name=user.full_name,
+        role=_role_value(user.role),
+        token_version=user.token_version or 0
+    )
+
+def _check_token_version(data: dict, principal: Principal):
+    # A token issued before a role change or deletion carries an older version
+    if data.get("ver", 0) != principal.token_version:
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Token Revoked!! Please login again.")
+
+def is_authenticated(request:Request, db :Session):
+    data = _decode_token(request)
+    user_id = _token_user_id(data)
+    
+    user = db.query(User).filter(User.id == user_id).first()
+    if not user:
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid Token!!")
+    
+    principal = _principal_from_user(user)
+    _check_token_version(data, principal)
+    principal_cache.set(principal)
+    
+    return user
+
+def get_principal(request: Request, db: Session):
+    """
+    Resolve the caller from the JWT, using the principal cache when possible.
+    Only a cache miss (first request of a user, expiry or invalidation)
+    reads the users table.
+    """
+    data = _decode_token(request)
+    user_id = _token_user_id(data)
+
+    principal = principal_cache.get(str(user_id))
+    if principal is None:
         user = db.query(User).filter(User.id == user_id).first()
         if not user:
             raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid Token!!")
-        
-        
-        return user
-    except InvalidTokenError:
-        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="You Are Not Authorized!!")
+        principal = _principal_from_user(user)
+        principal_cache.set(principal)
+
+    _check_token_version(data, principal)
+    return principal
+
+def revoke_user_tokens(user: User, db: Session):
+    """
+    Invalidate every token issued to `user` so far, committing any pending
+    changes on the session together with the version bump.
+    """
+    user.token_version = (user.token_version or 0) + 1
+    db.commit()
+    # Drop the cached principal only after the commit, otherwise a concurrent
+    # request could re-cache the old row before it is replaced
+    principal_cache.invalidate(user.id)
 
 
 def require_roles(allowed_roles: list, request: Request, db: Session):
@@ -100,13 +191,13 @@ def require_roles(allowed_roles: list, request: Request, db: Session):
     Args:
         allowed_roles: List of roles that can access the resource
         request: FastAPI request object
-        db: Database session
+        db: Database session, only used when the principal is not cached
     Returns:
-        User object if authorized
+        Principal of the caller if authorized
     Raises:
         HTTPException if not authorized
     """
-    user = is_authenticated(request, db)
+    user = get_principal(request, db)
     
     # Convert roles to lowercase for case-insensitive comparison
     user_role = user.role.lower() if user.role else ""
@@ -119,4 +210,3 @@ def require_roles(allowed_roles: list, request: Request, db: Session):
             detail=f"Access denied! Required roles: {roles_str}. Your role: {user.role}"
         )
     return user
-
@@ -0,0 +1,251 @@
+import csv
+import io
+import json
+import uuid
+from dataclasses import dataclass
+from typing import AsyncIterator, Callable, Optional
+
+from fastapi import HTTPException, Request
+from fastapi.concurrency import run_in_threadpool
+from pydantic import ValidationError
+from sqlalchemy import func, insert, select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app.models.models import Class, Student, Subject, Teacher, User
+from app.schemas.Users import StudentCreate, StudentAssignClass, TeacherCreate, TeacherAssignSubject
+from app.services.auth import require_roles
+from app.services.hashing import hash_pool, get_profile, BULK_IMPORT
+from app.services.cache import invalidate_tags
+from app.services.table_versions import bump_table_versions
+
+# Rows validated, hashed and written per transaction
+CHUNK_SIZE = 500
+
+CSV_CONTENT_TYPES = ("text/csv", "application/csv")
+
+
+async def _lines(request: Request) -> AsyncIterator[str]:
+    """Decode the request body line by line as it arrives."""
+    buffer = b""
+    async for data in request.stream():
+        buffer += data
+        *lines, buffer = buffer.split(b"\n")
+        for line in lines:
+            yield line.decode("utf-8-sig").rstrip("\r")
+    if buffer:
+        yield buffer.decode("utf-8-sig").rstrip("\r")
+
+
+async def read_rows(request: Request) -> AsyncIterator[tuple[int, Optional[dict], Optional[str]]]:
+    """
+    Yield (row_number, record, parse_error) from a CSV (header row first) or
+    JSON lines body, without buffering the whole upload. Quoted CSV fields
+    must not span lines.
+    """
+    content_type = request.headers.get("content-type", "").split(";")[0].strip().lower()
+    is_csv = content_type in CSV_CONTENT_TYPES
+    header = None
+    row_number = 0
+
+    async for line in _lines(request):
+        if not line.strip():
+            continue
+        if is_csv and header is None:
+            header = [name.strip() for name in next(csv.reader([line]))]
+            continue
+        row_number += 1
+        try:
+            if is_csv:
+                values = next(csv.reader(io.StringIO(line)))
+                if len(values) != len(header):
+                    raise ValueError(f"expected {len(header)} columns, got {len(values)}")
+                yield row_number, dict(zip(header, values)), None
+            else:
+                record = json.loads(line)
+                if not isinstance(record, dict):
+                    raise ValueError("expected a JSON object")
+                yield row_number, record, None
+        except ValueError as e:
+            yield row_number, None, f"Could not parse row: {e}"
+
+
+def _validation_messages(error: ValidationError) -> list[str]:
+    return [f"{'.'.join(str(part) for part in err['loc'])}: {err['msg']}" for err in error.errors()]
+
+
+def _existing_emails(emails: list[str], db: Session) -> set[str]:
+    """One set-based lookup for every email of the chunk, case-insensitive like register()."""
+    if not emails:
+        return set()
+    rows = db.execute(select(func.lower(User.email)).where(func.lower(User.email).in_(emails)))
+    return {email for (email,) in rows}
+
+
+def _hash_passwords(passwords: list[str]) -> list[str]:
+    # Cheap profile, upgraded on the user's first login
+    return hash_pool.map(get_profile(BULK_IMPORT).hash, passwords)
+
+
+def _existing_ids(model, ids: set, db: Session) -> set:
+    if not ids:
+        return set()
+    return set(db.execute(select(model.id).where(model.id.in_(ids))).scalars())
+
+
+def _import_chunk(rows: list, db: Session, importer: "Importer") -> tuple[int, list[dict]]:
+    """Validate, hash and insert one chunk of rows in a single transaction."""
+    errors = []
+    valid = []
+    seen_emails = set()
+
+    for row_number, record, parse_error in rows:
+        if parse_error:
+            errors.append({'row': row_number, 'email': None, 'errors': [parse_error]})
+            continue
+        user_id = uuid.uuid4()
+        try:
+            user, profile = importer.validate(record, user_id)
+        except ValidationError as e:
+            errors.append({'row': row_number, 'email': record.get('email'), 'errors': _validation_messages(e)})
+            continue
+        if user.email.lower() in seen_emails:
+            errors.append({'row': row_number, 'email': user.email, 'errors': ["Email repeated in this import"]})
+            continue
+        seen_emails.add(user.email.lower())
+        valid.append((row_number, user_id, user, profile))
+
+    # Two set-based lookups for the whole chunk instead of per-row .first() calls
+    existing_emails = _existing_emails([user.email.lower() for _, _, user, _ in valid], db)
+    references = _existing_ids(
+        importer.reference_model,
+        {importer.reference(profile) for _, _, _, profile in valid if profile},
+        db
+    )
+
+    accepted = []
+    for row_number, user_id, user, profile in valid:
+        row_errors = []
+        if user.email.lower() in existing_emails:
+            row_errors.append("Email Already Used")
+        if profile and importer.reference(profile) not in references:
+            row_errors.append(importer.missing_reference)
+        if row_errors:
+            errors.append({'row': row_number, 'email': user.email, 'errors': row_errors})
+        else:
+            accepted.append((row_number, user_id, user, profile))
+
+    if not accepted:
+        return 0, errors
+
+    hashes = _hash_passwords([user.password for _, _, user, _ in accepted])
+
+    user_rows = [{
+        'id': user_id,
+        'full_name': user.full_name,
+        'email': user.email,
+        'password_hash': password_hash,
+        'role': user.role
+    } for (_, user_id, user, _), password_hash in zip(accepted, hashes)]
+    profile_rows = [importer.profile_row(user_id, profile) for _, user_id, _, profile in accepted if profile]
+
+    try:
+        # executemany of a Core insert: SQLAlchemy batches it into multi-row INSERTs
+        db.execute(insert(User), user_rows)
+        bump_table_versions(db, 'users')
+        if profile_rows:
+            db.execute(insert(importer.profile_model), profile_rows)
+            bump_table_versions(db, importer.profile_model.__tablename__)
+        db.commit()
+        if profile_rows:
+            invalidate_tags(importer.profile_model.__tablename__)
+    except IntegrityError as e:
+        db.rollback()
+        # e.g. an email registered concurrently; the chunk is all or nothing
+        detail = f"Chunk rolled back: {e.orig}"
+        errors.extend({'row': row_number, 'email': user.email, 'errors': [detail]} for row_number, _, user, _ in accepted)
+        return 0, errors
+
+    return len(accepted), errors
+
+
+@dataclass(frozen=True)
+class Importer:
+    # (record, user_id) -> (user schema, profile schema or None); raises ValidationError
+    validate: Callable
+    # profile schema -> id of the class/subject it references
+    reference: Callable
+    reference_model: type
+    missing_reference: str
+    # (user_id, profile schema) -> row for profile_model
+    profile_row: Callable
+    profile_model: type
+
+
+def _validate_student(record: dict, user_id):
+    user = StudentCreate.model_validate({**record, 'role': 'student'})
+    profile = StudentAssignClass.model_validate({**record, 'student_id': user_id})
+    return user, profile
+
+def _validate_teacher(record: dict, user_id):
+    user = TeacherCreate.model_validate({**record, 'role': 'teacher'})
+    # The subject is optional; without it only the teacher user is created
+    profile = TeacherAssignSubject.model_validate({**record, 'teacher_id': user_id}) if record.get('subject_id') else None
+    return user, profile
+
+
+IMPORTERS = {
+    'students': Importer(
+        validate=_validate_student,
+        reference=lambda profile: profile.class_id,
+        reference_model=Class,
+        missing_reference="Class Not Found!!",
+        profile_row=lambda user_id, profile: {'id': uuid.uuid4(), 'user_id': user_id, 'class_id': profile.class_id, 'roll_number': profile.roll_number},
+        profile_model=Student,
+    ),
+    'teachers': Importer(
+        validate=_validate_teacher,
+        reference=lambda profile: profile.subject_id,
+        reference_model=Subject,
+        missing_reference="Subject not Found!!",
+        profile_row=lambda user_id, profile: {'id': uuid.uuid4(), 'user_id': user_id, 'subject_id': profile.subject_id},
+        profile_model=Teacher,
+    ),
+}
+
+
+async def bulk_import(kind: str, db: Session, request: Request):
+    """
+    Stream a CSV or JSON lines upload of students or teachers into the
+    database in chunks of CHUNK_SIZE rows, each in its own transaction.
+
+    Student rows: full_name, email, password, class_id, roll_number.
+    Teacher rows: full_name, email, password and optionally subject_id.
+    Invalid rows are skipped and reported; valid rows are still imported.
+    """
+    await run_in_threadpool(require_roles, ['admin'], request=request, db=db)
+    importer = IMPORTERS[kind]
+
+    created = 0
+    errors = []
+    chunk = []
+
+    async def flush():
+        nonlocal created
+        count, chunk_errors = await run_in_threadpool(_import_chunk, chunk, db, importer)
+        created += count
+        errors.extend(chunk_errors)
+
+    try:
+        async for row in read_rows(request):
+            chunk.append(row)
+            if len(chunk) >= CHUNK_SIZE:
+                await flush()
+                chunk = []
+        if chunk:
+            await flush()
+    except UnicodeDecodeError:
+        raise HTTPException(status_code=400, detail="Upload must be UTF-8 encoded")
+
+    errors.sort(key=lambda error: error['row'])
+    return {'created': created, 'failed': len(errors), 'errors': errors}
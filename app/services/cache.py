@@ -0,0 +1,304 @@
+import functools
+import hashlib
+import inspect
+import os
+import pickle
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from typing import Any, Hashable, Optional
+
+
+_MISSING = object()
+
+
+class TTLCache:
+    """
+    In-process LRU cache whose entries also expire after `ttl_seconds`.
+
+    Explicit invalidation keeps a single process consistent; the TTL bounds
+    how stale other worker processes can be.
+    """
+
+    def __init__(self, max_size: int = 1024, ttl_seconds: float = 60):
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[Hashable, tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._expirations = 0
+
+    def get(self, key: Hashable, default=None):
+        with self._lock:
+            entry = self._entries.get(key, _MISSING)
+            if entry is _MISSING:
+                self._misses += 1
+                return default
+            expires_at, value = entry
+            if expires_at < time.monotonic():
+                del self._entries[key]
+                self._misses += 1
+                self._expirations += 1
+                return default
+            self._entries.move_to_end(key)
+            self._hits += 1
+            return value
+
+    def set(self, key: Hashable, value: Any):
+        if self.max_size <= 0 or self.ttl_seconds <= 0:
+            return
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl_seconds, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self._evictions += 1
+
+    def invalidate(self, key: Hashable):
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                'backend': 'memory',
+                'size': len(self._entries),
+                'max_size': self.max_size,
+                'ttl_seconds': self.ttl_seconds,
+                'hits': self._hits,
+                'misses': self._misses,
+                'evictions': self._evictions,
+                'expirations': self._expirations,
+            }
+
+
+class RedisCache:
+    """
+    Same interface as `TTLCache` on top of a Redis client, so every worker
+    process shares one cache. Values are pickled; keys are namespaced by
+    `prefix`. Eviction is Redis' own (maxmemory-policy), reported from INFO.
+    """
+
+    def __init__(self, client, ttl_seconds: float = 60, prefix: str = "sms:cache:"):
+        self.client = client
+        self.ttl_seconds = ttl_seconds
+        self.prefix = prefix
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+
+    def _key(self, key: Hashable) -> str:
+        return self.prefix + (key if isinstance(key, str) else repr(key))
+
+    def get(self, key: Hashable, default=None):
+        payload = self.client.get(self._key(key))
+        with self._lock:
+            if payload is None:
+                self._misses += 1
+                return default
+            self._hits += 1
+        return pickle.loads(payload)
+
+    def set(self, key: Hashable, value: Any):
+        if self.ttl_seconds <= 0:
+            return
+        self.client.set(self._key(key), pickle.dumps(value), ex=max(1, int(self.ttl_seconds)))
+
+    def invalidate(self, key: Hashable):
+        self.client.delete(self._key(key))
+
+    def clear(self):
+        keys = list(self.client.scan_iter(match=self.prefix + "*"))
+        if keys:
+            self.client.delete(*keys)
+
+    def stats(self) -> dict:
+        info = self.client.info('stats')
+        with self._lock:
+            return {
+                'backend': 'redis',
+                'ttl_seconds': self.ttl_seconds,
+                'hits': self._hits,
+                'misses': self._misses,
+                'evictions': info.get('evicted_keys'),
+                'expirations': info.get('expired_keys'),
+            }
+
+
+class FakeRedis:
+    """
+    In-process stand-in for the few Redis commands `RedisCache` uses, to run
+    the Redis code path without a server (`CACHE_URL=fake://`).
+    """
+
+    def __init__(self):
+        self._data = {}
+        self._lock = threading.Lock()
+
+    def _live(self, name):
+        value, expires_at = self._data.get(name, (None, None))
+        if expires_at is not None and expires_at < time.monotonic():
+            del self._data[name]
+            return None
+        return value
+
+    def get(self, name):
+        with self._lock:
+            return self._live(name)
+
+    def set(self, name, value, ex=None):
+        with self._lock:
+            self._data[name] = (value, time.monotonic() + ex if ex else None)
+        return True
+
+    def delete(self, *names):
+        with self._lock:
+            return sum(self._data.pop(name, None) is not None for name in names)
+
+    def scan_iter(self, match: str = "*"):
+        prefix = match.rstrip("*")
+        with self._lock:
+            return [name for name in self._data if name.startswith(prefix)]
+
+    def info(self, section=None):
+        return {}
+
+
+def cache_backend_from_env():
+    """
+    CACHE_BACKEND=memory (default), redis or none. The redis backend reads
+    CACHE_URL (redis://host:6379/0, or fake:// for the in-process fake) and
+    needs the `redis` package.
+    """
+    backend = os.getenv("CACHE_BACKEND", "memory").lower()
+    ttl_seconds = float(os.getenv("CACHE_TTL_SECONDS", "60"))
+    if backend == "none":
+        return TTLCache(max_size=0, ttl_seconds=0)
+    if backend == "redis":
+        url = os.getenv("CACHE_URL", "redis://localhost:6379/0")
+        if url.startswith("fake://"):
+            client = FakeRedis()
+        else:
+            import redis
+            client = redis.Redis.from_url(url)
+        return RedisCache(client, ttl_seconds=ttl_seconds)
+    if backend == "memory":
+        return TTLCache(max_size=int(os.getenv("CACHE_MAX_SIZE", "1024")), ttl_seconds=ttl_seconds)
+    raise ValueError(f"Unknown CACHE_BACKEND: {backend}")
+
+
+# Arguments that identify the caller rather than the data
+_UNKEYED_ARGUMENTS = ('db', 'request', 'response')
+
+
+class ServiceCache:
+    """
+    Read-through cache for service functions, invalidated by tags.
+
+    Every tag has a random token stored in the backend; a cached value's key
+    includes the current tokens of its tags, so invalidating a tag (a new
+    token) makes all of its entries unreachable at once, in this process
+    and, with the redis backend, in every other. A token that was evicted or
+    expired is simply replaced, which also only ever causes misses.
+    """
+
+    def __init__(self, backend):
+        self.backend = backend
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._invalidations = 0
+
+    def _tag_token(self, tag: str) -> str:
+        token = self.backend.get(('tag', tag))
+        if token is None:
+            token = uuid.uuid4().hex
+            self.backend.set(('tag', tag), token)
+        return token
+
+    def _entry_key(self, name: str, tags: tuple, arguments: dict) -> str:
+        tokens = ",".join(self._tag_token(tag) for tag in tags)
+        digest = hashlib.sha1(repr(sorted(arguments.items())).encode()).hexdigest()
+        return f"{name}:{digest}:{hashlib.sha1(tokens.encode()).hexdigest()}"
+
+    def invalidate_tags(self, *tags: str):
+        for tag in tags:
+            self.backend.set(('tag', tag), uuid.uuid4().hex)
+        with self._lock:
+            self._invalidations += len(tags)
+
+    def cached(self, *tags: str):
+        """
+        Cache the return value of a service function per argument values
+        (except `db`, `request` and `response`) until one of `tags` is
+        invalidated or the backend TTL passes. The function must return
+        plain data (dicts, lists, UUIDs...), never ORM objects, and should
+        not do authorization, which must run on every call.
+        """
+        def decorator(fn):
+            signature = inspect.signature(fn)
+            name = f"{fn.__module__}.{fn.__qualname__}"
+
+            @functools.wraps(fn)
+            def wrapper(*args, **kwargs):
+                bound = signature.bind(*args, **kwargs)
+                bound.apply_defaults()
+                arguments = {key: value for key, value in bound.arguments.items() if key not in _UNKEYED_ARGUMENTS}
+                key = self._entry_key(name, tags, arguments)
+
+                value = self.backend.get(key, _MISSING)
+                with self._lock:
+                    if value is _MISSING:
+                        self._misses += 1
+                    else:
+                        self._hits += 1
+                if value is _MISSING:
+                    value = fn(*args, **kwargs)
+                    self.backend.set(key, value)
+                return value
+
+            wrapper.cache_tags = tags
+            return wrapper
+        return decorator
+
+    def invalidates(self, *tags: str):
+        """
+        Declare the tags a mutating service invalidates. They are
+        invalidated once the service returns or raises, after its commit.
+        """
+        def decorator(fn):
+            @functools.wraps(fn)
+            def wrapper(*args, **kwargs):
+                try:
+                    return fn(*args, **kwargs)
+                finally:
+                    self.invalidate_tags(*tags)
+
+            wrapper.invalidates_tags = tags
+            return wrapper
+        return decorator
+
+    def stats(self) -> dict:
+        with self._lock:
+            calls = self._hits + self._misses
+            service = {
+                'hits': self._hits,
+                'misses': self._misses,
+                'hit_ratio': self._hits / calls if calls else None,
+                'invalidations': self._invalidations,
+            }
+        # backend counters also include the tag token lookups
+        return {'services': service, 'backend': self.backend.stats()}
+
+
+service_cache = ServiceCache(cache_backend_from_env())
+cached = service_cache.cached
+invalidates = service_cache.invalidates
+invalidate_tags = service_cache.invalidate_tags
@@ -0,0 +1,308 @@
+import contextvars
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date
+from uuid import UUID
+
+from fastapi import Request
+from sqlalchemy import and_, case, false, func, select
+from sqlalchemy.orm import Session
+
+from app.database import POOL_PROFILE, SessionLocal, get_engine
+from app.models.models import (
+    AttendanceClassDaily, AttendanceStudentMonthly, Class, Student, Subject, Teacher, TeacherClass, Test, TestResult, User
+)
+from app.services.attendance import _percentage
+from app.services.auth import require_roles
+from app.services.cache import TTLCache
+from app.services.notice_feed import EVERYTHING, cached_feed, class_targets
+
+DASHBOARD_NOTICES = int(os.getenv("DASHBOARD_NOTICES", "5"))
+DASHBOARD_TESTS = int(os.getenv("DASHBOARD_TESTS", "5"))
+
+# user id -> the whole dashboard. Only expiry refreshes it, so keep the TTL short
+dashboard_cache = TTLCache(
+    max_size=int(os.getenv("DASHBOARD_CACHE_MAX_SIZE", "4096")),
+    ttl_seconds=float(os.getenv("DASHBOARD_CACHE_TTL_SECONDS", "30")),
+)
+
+# Threads running a dashboard's section queries side by side, each on its own
+# session. 0 runs them one after another on the request's session, the
+# default with the serverless pool profile where every session is a new connection.
+# Capped below the connection pool's size (see section_workers).
+DASHBOARD_QUERY_WORKERS = int(os.getenv("DASHBOARD_QUERY_WORKERS", "0" if POOL_PROFILE == 'serverless' else "4"))
+_executors = {}
+_executor_lock = threading.Lock()
+
+
+def section_workers(pool, requested: int = DASHBOARD_QUERY_WORKERS) -> int:
+    """
+    Worker threads for `pool`: at most one less than its size, so the
+    section queries (which share one executor across requests) can never
+    take every pooled connection from the rest of the traffic.
+    """
+    size = getattr(pool, "size", None)
+    if not callable(size):
+        return requested  # NullPool: a connection per checkout, nothing to exhaust locally
+    return max(0, min(requested, size() - 1))
+
+
+def _section_executor():
+    # Created on first use: sizing it needs the engine, which is not built at import
+    if 'sections' not in _executors:
+        with _executor_lock:
+            if 'sections' not in _executors:
+                workers = section_workers(get_engine().pool)
+                _executors['sections'] = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="dashboard") if workers > 0 else None
+    return _executors['sections']
+
+
+def _ranked_class_teachers(class_ids):
+    # Same rule as the student listing: the TeacherClass marked as class teacher, otherwise the first assigned
+    return (
+        select(
+            TeacherClass.class_id,
+            User.id.label('user_id'),
+            User.full_name,
+            User.email,
+            func.row_number().over(
+                partition_by=TeacherClass.class_id,
+                order_by=(func.coalesce(TeacherClass.is_class_teacher, false()).desc(), TeacherClass.id)
+            ).label('rank')
+        )
+        .join(Teacher, Teacher.id == TeacherClass.teacher_id)
+        .join(User, User.id == Teacher.user_id)
+        .where(TeacherClass.class_id.in_(class_ids))
+        .cte('ranked_class_teachers')
+    )
+
+
+def _student_profile(user_id: UUID, db: Session) -> list:
+    ranked = _ranked_class_teachers(select(Student.class_id).where(Student.user_id == user_id))
+    return db.execute(
+        select(
+            Student.id.label('student_id'),
+            Student.roll_number,
+            Class.id.label('class_id'),
+            Class.standard,
+            Class.section,
+            ranked.c.user_id.label('class_teacher_id'),
+            ranked.c.full_name.label('class_teacher_name'),
+            ranked.c.email.label('class_teacher_email')
+        )
+        .outerjoin(Class, Class.id == Student.class_id)
+        .outerjoin(ranked, and_(ranked.c.class_id == Student.class_id, ranked.c.rank == 1))
+        .where(Student.user_id == user_id)
+    ).all()
+
+
+def _teacher_profile(user_id: UUID, db: Session) -> list:
+    # One row per subject profile and class taught
+    ranked = _ranked_class_teachers(
+        select(TeacherClass.class_id).join(Teacher, Teacher.id == TeacherClass.teacher_id).where(Teacher.user_id == user_id)
+    )
+    return db.execute(
+        select(
+            Teacher.id.label('teacher_id'),
+            Subject.id.label('subject_id'),
+            Subject.name.label('subject_name'),
+            Class.id.label('class_id'),
+            Class.standard,
+            Class.section,
+            func.coalesce(TeacherClass.is_class_teacher, false()).label('is_class_teacher'),
+            ranked.c.user_id.label('class_teacher_id'),
+            ranked.c.full_name.label('class_teacher_name'),
+            ranked.c.email.label('class_teacher_email')
+        )
+        .join(Subject, Subject.id == Teacher.subject_id)
+        .outerjoin(TeacherClass, TeacherClass.teacher_id == Teacher.id)
+        .outerjoin(Class, Class.id == TeacherClass.class_id)
+        .outerjoin(ranked, and_(ranked.c.class_id == Class.id, ranked.c.rank == 1))
+        .where(Teacher.user_id == user_id)
+        .order_by(Class.standard, Class.section, Subject.name)
+    ).all()
+
+
+def _class_item(row) -> dict:
+    item = {
+        'class_id': row.class_id,
+        'standard': row.standard,
+        'section': row.section,
+        'class_teacher': {
+            'user_id': row.class_teacher_id,
+            'full_name': row.class_teacher_name,
+            'email': row.class_teacher_email
+        } if row.class_teacher_id else None
+    }
+    if 'subject_id' in row._fields:
+        item.update(subject_id=row.subject_id, subject_name=row.subject_name, is_class_teacher=row.is_class_teacher)
+    return item
+
+
+def _notices(targets: list, db: Session) -> list:
+    return [dict(row._mapping) for row in cached_feed(targets, db)[:DASHBOARD_NOTICES]]
+
+
+def _student_attendance(student_id: UUID, db: Session) -> dict:
+    this_month = date.today().replace(day=1)
+    in_month = AttendanceStudentMonthly.month == this_month
+    row = db.execute(
+        select(
+            func.coalesce(func.sum(AttendanceStudentMonthly.present_count), 0).label('present'),
+            func.coalesce(func.sum(AttendanceStudentMonthly.absent_count), 0).label('absent'),
+            func.sum(case((in_month, AttendanceStudentMonthly.present_count))).label('month_present'),
+            func.sum(case((in_month, AttendanceStudentMonthly.absent_count))).label('month_absent')
+        ).where(AttendanceStudentMonthly.student_id == student_id)
+    ).one()
+    return {
+        'present': row.present,
+        'absent': row.absent,
+        'percentage': _percentage(row.present, row.absent),
+        'this_month': {
+            'month': this_month,
+            'present': row.month_present,
+            'absent': row.month_absent,
+            'percentage': _percentage(row.month_present, row.month_absent)
+        } if row.month_present is not None else None
+    }
+
+
+def _student_test_scores(student_id: UUID, db: Session) -> list:
+    rows = db.execute(
+        select(Test.id, Test.title, Test.test_date, Subject.name, TestResult.marks_obtained, Test.total_marks)
+        .join(Test, Test.id == TestResult.test_id)
+        .join(Subject, Subject.id == Test.subject_id)
+        .where(TestResult.student_id == student_id)
+        .order_by(Test.test_date.desc(), Test.id)
+        .limit(DASHBOARD_TESTS)
+    ).all()
+    return [{
+        'test_id': row.id,
+        'title': row.title,
+        'test_date': row.test_date,
+        'subject_name': row.name,
+        'marks_obtained': row.marks_obtained,
+        'total_marks': row.total_marks,
+        'percentage': round(row.marks_obtained * 100 / row.total_marks, 2)
+    } for row in rows]
+
+
+def _latest_class_attendance(class_ids: list, db: Session) -> list:
+    latest = (
+        select(
+            AttendanceClassDaily,
+            func.row_number().over(partition_by=AttendanceClassDaily.class_id, order_by=AttendanceClassDaily.date.desc()).label('rank')
+        )
+        .where(AttendanceClassDaily.class_id.in_(class_ids))
+        .subquery()
+    )
+    rows = db.execute(select(latest).where(latest.c.rank == 1).order_by(latest.c.date.desc())).all()
+    return [{
+        'class_id': row.class_id,
+        'date': row.date,
+        'present': row.present_count,
+        'absent': row.absent_count,
+        'percentage': _percentage(row.present_count, row.absent_count)
+    } for row in rows]
+
+
+def _teacher_recent_tests(teacher_ids: list, db: Session) -> list:
+    rows = db.execute(
+        select(
+            Test.id, Test.title, Test.test_date, Test.class_id, Subject.name, Test.total_marks,
+            func.count(TestResult.id).label('results'),
+            func.avg(TestResult.marks_obtained).label('average')
+        )
+        .join(Subject, Subject.id == Test.subject_id)
+        .outerjoin(TestResult, TestResult.test_id == Test.id)
+        .where(Test.teacher_id.in_(teacher_ids))
+        .group_by(Test.id, Test.title, Test.test_date, Test.class_id, Subject.name, Test.total_marks)
+        .order_by(Test.test_date.desc(), Test.id)
+        .limit(DASHBOARD_TESTS)
+    ).all()
+    return [{
+        'test_id': row.id,
+        'title': row.title,
+        'test_date': row.test_date,
+        'class_id': row.class_id,
+        'subject_name': row.name,
+        'total_marks': row.total_marks,
+        'results': row.results,
+        'average_percentage': round(float(row.average) * 100 / row.total_marks, 2) if row.average is not None else None
+    } for row in rows]
+
+
+def _in_own_session(fn):
+    db = SessionLocal()
+    try:
+        return fn(db)
+    finally:
+        db.close()
+
+
+def _run_sections(sections: dict, db: Session) -> dict:
+    """
+    Run each section's query (a function of a session) and return its
+    result by name. With DASHBOARD_QUERY_WORKERS they run concurrently, each
+    on its own session; the request's context is copied so their statements
+    still count towards its metrics.
+
+    The request's session gives its connection back to the pool first.
+    Otherwise every dashboard request would hold one connection while
+    waiting for workers that need more, and a burst of them could take the
+    whole pool and wait on each other until DB_POOL_TIMEOUT.
+    """
+    executor = _section_executor()
+    if executor is None:
+        return {name: fn(db) for name, fn in sections.items()}
+    db.close()
+    futures = {name: executor.submit(contextvars.copy_context().run, _in_own_session, fn) for name, fn in sections.items()}
+    return {name: future.result() for name, future in futures.items()}
+
+
+def dashboard(db: Session, request: Request) -> dict:
+    """
+    Everything a student's or teacher's home screen shows, in one response:
+    their classes with the class teacher, recent notices, attendance and
+    latest tests.
+
+    One query resolves the profile and classes; then the notices (usually
+    from the notice feed cache), attendance and test queries run together.
+    The result is cached per user for DASHBOARD_CACHE_TTL_SECONDS.
+    """
+    principal = require_roles(['admin', 'teacher', 'student'], request=request, db=db)
+    cached = dashboard_cache.get(principal.id)
+    if cached is not None:
+        return cached
+
+    user_id = UUID(principal.id)
+    result = {'user_id': user_id, 'full_name': principal.full_name, 'role': principal.role}
+
+    if principal.role == 'student':
+        profile = _student_profile(user_id, db)
+        student = profile[0] if profile else None
+        classes = [row for row in profile if row.class_id]
+        sections = {'notices': lambda session: _notices(class_targets([(row.class_id, row.standard) for row in classes]), session)}
+        if student:
+            result.update(student_id=student.student_id, roll_number=student.roll_number)
+            sections['attendance'] = lambda session: _student_attendance(student.student_id, session)
+            sections['test_scores'] = lambda session: _student_test_scores(student.student_id, session)
+    elif principal.role == 'teacher':
+        profile = _teacher_profile(user_id, db)
+        classes = [row for row in profile if row.class_id]
+        class_ids = list(dict.fromkeys(row.class_id for row in classes))
+        teacher_ids = list(dict.fromkeys(row.teacher_id for row in profile))
+        sections = {
+            'notices': lambda session: _notices(class_targets(list(dict.fromkeys((row.class_id, row.standard) for row in classes))), session),
+            'class_attendance': lambda session: _latest_class_attendance(class_ids, session) if class_ids else [],
+            'recent_tests': lambda session: _teacher_recent_tests(teacher_ids, session) if teacher_ids else [],
+        }
+    else:
+        classes = []
+        sections = {'notices': lambda session: _notices([EVERYTHING], session)}
+
+    result['classes'] = [_class_item(row) for row in classes]
+    result.update(_run_sections(sections, db))
+    dashboard_cache.set(principal.id, result)
+    return result
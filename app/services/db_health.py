@@ -0,0 +1,71 @@
+import logging
+import time
+
+from sqlalchemy import text
+from sqlalchemy.pool import QueuePool
+
+from app.database import POOL_PROFILE
+
+logger = logging.getLogger(__name__)
+
+# What the unauthenticated GET /health/db shows of a probe; the rest (pool,
+# timings) is for admins at GET /admin/db_health
+PUBLIC_KEYS = ('ok', 'error')
+
+
+def pool_status(pool) -> dict:
+    """Occupancy of a QueuePool (size, checked in/out, overflow) plus the checkout wait totals."""
+    status = {'class': type(pool).__name__}
+    # NullPool keeps nothing open and has no occupancy to report
+    if isinstance(pool, QueuePool):
+        status.update(size=pool.size(), checked_in=pool.checkedin(), checked_out=pool.checkedout(),
+                      overflow=pool.overflow(), timeout=pool.timeout())
+    if hasattr(pool, 'wait_stats'):
+        status['wait'] = pool.wait_stats()
+    return status
+
+
+def probe(engine) -> dict:
+    """
+    Check out a connection from `engine`'s pool and run SELECT 1. Returns
+    whether it worked, how long the checkout and the round trip took, and
+    the pool status; never raises. A failure is logged here and reported
+    only as "unavailable", since the exception can name the host and user.
+    """
+    result = {'ok': False, 'profile': POOL_PROFILE, 'dialect': engine.dialect.name}
+    started_at = time.perf_counter()
+    try:
+        with engine.connect() as conn:
+            connected_at = time.perf_counter()
+            conn.execute(text("SELECT 1"))
+            result['checkout_ms'] = round((connected_at - started_at) * 1000, 3)
+            result['query_ms'] = round((time.perf_counter() - connected_at) * 1000, 3)
+        result['ok'] = True
+    except Exception:
+        logger.warning("Database health probe failed", exc_info=True)
+        result['error'] = 'unavailable'
+    result['pool'] = pool_status(engine.pool)
+    return result
+
+
+async def probe_async(async_engine) -> dict:
+    """`probe` for an AsyncEngine."""
+    result = {'ok': False, 'profile': POOL_PROFILE, 'dialect': async_engine.dialect.name}
+    started_at = time.perf_counter()
+    try:
+        async with async_engine.connect() as conn:
+            connected_at = time.perf_counter()
+            await conn.execute(text("SELECT 1"))
+            result['checkout_ms'] = round((connected_at - started_at) * 1000, 3)
+            result['query_ms'] = round((time.perf_counter() - connected_at) * 1000, 3)
+        result['ok'] = True
+    except Exception:
+        logger.warning("Async database health probe failed", exc_info=True)
+        result['error'] = 'unavailable'
+    result['pool'] = pool_status(async_engine.pool)
+    return result
+
+
+def public_summary(result: dict) -> dict:
+    """The PUBLIC_KEYS of a probe result."""
+    return {key: result[key] for key in PUBLIC_KEYS if key in result}
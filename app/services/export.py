@@ -0,0 +1,96 @@
+import csv
+import enum
+import io
+from typing import Iterator
+
+from fastapi import Request
+from fastapi.responses import StreamingResponse
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.database import SessionLocal
+from app.models.models import User
+from app.schemas.Users import UserResponseWithID, StudentListItem, TeacherListItem
+from app.services.admin import student_list_statement, teacher_list_statement
+from app.services.auth import require_roles
+from app.services.fast_json import dumps, schema_columns
+
+# Rows fetched from the server-side cursor and written per chunk
+EXPORT_BATCH_SIZE = 1000
+
+FORMATS = {
+    'ndjson': ('application/x-ndjson', 'ndjson'),
+    'csv': ('text/csv; charset=utf-8', 'csv'),
+}
+
+
+def _users_statement():
+    return select(*schema_columns(UserResponseWithID, User)).order_by(User.created_at, User.id)
+
+
+# kind -> (statement factory, schema whose fields are the exported columns)
+EXPORTS = {
+    'users': (_users_statement, UserResponseWithID),
+    'students': (student_list_statement, StudentListItem),
+    'teachers': (teacher_list_statement, TeacherListItem),
+}
+
+
+def _csv_value(value):
+    if value is None:
+        return ''
+    if isinstance(value, enum.Enum):
+        return value.value
+    return value
+
+
+def _ndjson_chunk(rows, fields: list) -> bytes:
+    return b"".join(dumps({field: row._mapping[field] for field in fields}) + b"\n" for row in rows)
+
+
+def _csv_chunk(rows, fields: list, header: bool) -> bytes:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    if header:
+        writer.writerow(fields)
+    writer.writerows([_csv_value(row._mapping[field]) for field in fields] for row in rows)
+    return buffer.getvalue().encode()
+
+
+def _stream(statement, fields: list, format: str) -> Iterator[bytes]:
+    # Runs after the route has returned, so it cannot use the request's session
+    db = SessionLocal()
+    try:
+        # yield_per turns on stream_results: a server-side cursor on Postgres,
+        # so only one batch of rows is held in memory at a time
+        result = db.execute(statement.execution_options(yield_per=EXPORT_BATCH_SIZE))
+        if format == 'csv':
+            header = True
+            for rows in result.partitions():
+                yield _csv_chunk(rows, fields, header)
+                header = False
+            if header:
+                yield _csv_chunk([], fields, header)
+        else:
+            for rows in result.partitions():
+                yield _ndjson_chunk(rows, fields)
+    finally:
+        db.close()
+
+
+def export_rows(kind: str, format: str, db: Session, request: Request):
+    """
+    Stream every user, student or teacher as NDJSON (one object per line) or
+    CSV (header row first), with the fields of the matching list schema.
+    Rows are read in batches of EXPORT_BATCH_SIZE and written as they
+    arrive, so memory stays flat and the first bytes go out immediately.
+    """
+    require_roles(['admin'], request=request, db=db)
+    statement_factory, schema = EXPORTS[kind]
+    media_type, extension = FORMATS[format]
+
+    return StreamingResponse(
+        _stream(statement_factory(), list(schema.model_fields), format),
+        media_type=media_type,
+        headers={'Content-Disposition': f'attachment; filename="{kind}.{extension}"'}
+    )
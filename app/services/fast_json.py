@@ -0,0 +1,57 @@
+"""
+JSON responses for large listings that skip `response_model` validation.
+
+FastAPI validates every returned row against the route's `response_model`
+and then encodes it again; for lists of thousands of rows that dominates
+the request's CPU time. The listing services build their rows from column
+projections that already have exactly the schema's fields, so those rows
+are trusted and serialized directly: with orjson when it is installed
+(`fast-json` extra), otherwise with pydantic-core's Rust encoder. The
+`response_model` stays on the route for the OpenAPI schema.
+"""
+from typing import Any, Optional
+
+from fastapi import Response
+from pydantic import BaseModel
+from pydantic_core import to_json
+
+try:
+    import orjson
+except ImportError:  # optional dependency
+    orjson = None
+
+
+def dumps(content: Any) -> bytes:
+    # Both encoders handle UUID, datetime, date and Enum values natively
+    if orjson is not None:
+        return orjson.dumps(content)
+    return to_json(content)
+
+
+class FastJSONResponse(Response):
+    media_type = "application/json"
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
+
+
+def json_response(content: Any, response: Optional[Response] = None) -> Response:
+    """
+    Wrap a service result in a FastJSONResponse, keeping the headers set on
+    the route's injected `response` (FastAPI drops them once a route returns
+    its own Response). Responses such as a 304 pass through untouched.
+    """
+    if isinstance(content, Response):
+        return content
+    return FastJSONResponse(content, headers=dict(response.headers) if response is not None else None)
+
+
+def schema_columns(schema: type[BaseModel], model) -> list:
+    """Columns of `model` named like the fields of `schema`, for a projection yielding its rows."""
+    return [getattr(model, field) for field in schema.model_fields]
+
+
+def schema_rows(rows, schema: type[BaseModel]) -> list[dict]:
+    """Rows of a projection as dicts with exactly the fields of `schema`."""
+    fields = list(schema.model_fields)
+    return [{field: mapping[field] for field in fields} for mapping in (row._mapping for row in rows)]
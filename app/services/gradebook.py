@@ -0,0 +1,210 @@
+from fastapi import HTTPException, Request
+from sqlalchemy.orm import Session
+from sqlalchemy import select, func, cast, Float
+from uuid import UUID, uuid4
+from datetime import date
+from typing import Optional
+
+from app.models.models import Student, Subject, Teacher, TeacherClass, Test, TestResult, User
+from app.schemas.Gradebook import TestCreate, TestMarks
+from app.services.auth import require_roles
+from app.services.upsert import dialect_insert, insert_one
+
+
+def create_test(test_data: TestCreate, db: Session, request: Request):
+    principal = require_roles(['teacher'], request=request, db=db)
+
+    # The teacher's profile for this subject, and it must be assigned to the class
+    teacher_id = db.execute(
+        select(Teacher.id)
+        .join(TeacherClass, TeacherClass.teacher_id == Teacher.id)
+        .where(
+            Teacher.user_id == UUID(principal.id),
+            Teacher.subject_id == test_data.subject_id,
+            TeacherClass.class_id == test_data.class_id
+        )
+        .limit(1)
+    ).scalar()
+    if not teacher_id:
+        raise HTTPException(status_code=403, detail="You do not teach this subject in this class!!")
+
+    new_test = insert_one(db, Test, {
+        'class_id': test_data.class_id,
+        'subject_id': test_data.subject_id,
+        'teacher_id': teacher_id,
+        'title': test_data.title,
+        'total_marks': test_data.total_marks,
+        'test_date': test_data.test_date
+    })
+    db.commit()
+    return new_test
+
+
+def enter_marks(test_id: UUID, marks_data: TestMarks, db: Session, request: Request):
+    """
+    Save the marks of a whole class for one test in a single multi-row
+    upsert. Entering marks again for a student overwrites them.
+    """
+    principal = require_roles(['teacher', 'admin'], request=request, db=db)
+
+    test = db.execute(
+        select(Test.id, Test.class_id, Test.total_marks, Teacher.user_id)
+        .join(Teacher, Teacher.id == Test.teacher_id)
+        .where(Test.id == test_id)
+    ).first()
+    if not test:
+        raise HTTPException(status_code=404, detail="Test not Found!!")
+    if principal.role != 'admin' and str(test.user_id) != principal.id:
+        raise HTTPException(status_code=403, detail="Only the teacher of this test can enter its marks!!")
+
+    too_high = sorted(entry.roll_number for entry in marks_data.marks if entry.marks_obtained > test.total_marks)
+    if too_high:
+        raise HTTPException(status_code=400, detail=f"Marks above {test.total_marks} for roll numbers: {too_high}")
+
+    students = dict(db.execute(
+        select(Student.roll_number, Student.id).where(Student.class_id == test.class_id)
+    ).all())
+    unknown = sorted({entry.roll_number for entry in marks_data.marks} - students.keys())
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Unknown roll numbers: {unknown}")
+
+    # Last entry wins when a roll number is repeated
+    marks = {entry.roll_number: entry.marks_obtained for entry in marks_data.marks}
+    if marks:
+        results_insert = dialect_insert(db, TestResult).values([
+            {'id': uuid4(), 'test_id': test.id, 'student_id': students[roll_number], 'marks_obtained': marks_obtained}
+            for roll_number, marks_obtained in marks.items()
+        ])
+        db.execute(
+            results_insert.on_conflict_do_update(
+                index_elements=[TestResult.test_id, TestResult.student_id],
+                set_={'marks_obtained': results_insert.excluded.marks_obtained}
+            )
+        )
+        db.commit()
+
+    return {'test_id': test.id, 'saved': len(marks)}
+
+
+def _percentage(obtained, total):
+    return cast(obtained, Float) * 100 / total
+
+
+def _gradebook(db: Session, class_id: Optional[UUID] = None, start_date: Optional[date] = None, end_date: Optional[date] = None):
+    """
+    Per-student totals, percentage, rank and percentile within the class,
+    plus class averages, for every class (or one class) over a date range.
+
+    Every test of the class in the range counts towards every student of
+    the class: a test without a result for the student counts as 0 marks
+    and is reported in `missed`, so skipping a test cannot raise a
+    percentage.
+
+    Two set-based queries whatever the number of students: one per-student
+    total ranked with window functions, one per-student-per-subject
+    breakdown. Nothing is queried per student.
+    """
+    filters = []
+    if class_id:
+        filters.append(Test.class_id == class_id)
+    if start_date:
+        filters.append(Test.test_date >= start_date)
+    if end_date:
+        filters.append(Test.test_date <= end_date)
+
+    # (student, test) for every student of the class and every test of the
+    # class, with the result if there is one
+    obtained = func.sum(func.coalesce(TestResult.marks_obtained, 0)).label('obtained')
+    total = func.sum(Test.total_marks).label('total')
+    missed = (func.count(Test.id) - func.count(TestResult.id)).label('missed')
+
+    def student_tests(*columns):
+        return (
+            select(*columns)
+            .select_from(Test)
+            .join(Student, Student.class_id == Test.class_id)
+            .outerjoin(TestResult, (TestResult.test_id == Test.id) & (TestResult.student_id == Student.id))
+            .where(*filters)
+        )
+
+    totals = (
+        student_tests(
+            Test.class_id,
+            Student.id.label('student_id'),
+            Student.roll_number,
+            User.full_name,
+            obtained, total, missed
+        )
+        .join(User, User.id == Student.user_id)
+        .group_by(Test.class_id, Student.id, Student.roll_number, User.full_name)
+        .cte('student_totals')
+    )
+    percentage = _percentage(totals.c.obtained, totals.c.total)
+    ranked = db.execute(
+        select(
+            totals,
+            percentage.label('percentage'),
+            func.rank().over(partition_by=totals.c.class_id, order_by=percentage.desc()).label('rank'),
+            (func.percent_rank().over(partition_by=totals.c.class_id, order_by=percentage) * 100).label('percentile'),
+            func.avg(percentage).over(partition_by=totals.c.class_id).label('class_average')
+        )
+        .order_by(totals.c.class_id, 'rank', totals.c.roll_number)
+    ).all()
+
+    subject_rows = db.execute(
+        student_tests(
+            Student.id.label('student_id'),
+            Subject.id.label('subject_id'),
+            Subject.name.label('subject_name'),
+            obtained, total, missed
+        )
+        .join(Subject, Subject.id == Test.subject_id)
+        .group_by(Student.id, Subject.id, Subject.name)
+        .order_by(Subject.name)
+    ).all()
+
+    subjects_by_student = {}
+    for row in subject_rows:
+        subjects_by_student.setdefault(row.student_id, []).append({
+            'subject_id': row.subject_id,
+            'subject_name': row.subject_name,
+            'obtained': row.obtained,
+            'total': row.total,
+            'missed': row.missed,
+            'percentage': round(row.obtained * 100 / row.total, 2)
+        })
+
+    classes = {}
+    for row in ranked:
+        gradebook = classes.setdefault(row.class_id, {
+            'class_id': row.class_id,
+            'class_average': round(row.class_average, 2),
+            'students': []
+        })
+        gradebook['students'].append({
+            'student_id': row.student_id,
+            'roll_number': row.roll_number,
+            'full_name': row.full_name,
+            'obtained': row.obtained,
+            'total': row.total,
+            'missed': row.missed,
+            'percentage': round(row.percentage, 2),
+            'rank': row.rank,
+            'percentile': round(row.percentile, 2),
+            'subjects': subjects_by_student.get(row.student_id, [])
+        })
+    return list(classes.values())
+
+
+def class_gradebook(class_id: UUID, db: Session, request: Request, start_date: Optional[date] = None, end_date: Optional[date] = None):
+    require_roles(['admin', 'teacher'], request=request, db=db)
+    gradebooks = _gradebook(db, class_id=class_id, start_date=start_date, end_date=end_date)
+    if not gradebooks:
+        raise HTTPException(status_code=404, detail="No results for this class!!")
+    return gradebooks[0]
+
+
+def school_gradebook(db: Session, request: Request, start_date: Optional[date] = None, end_date: Optional[date] = None):
+    """Term-end gradebook of every class in one pass."""
+    require_roles(['admin'], request=request, db=db)
+    return _gradebook(db, start_date=start_date, end_date=end_date)
@@ -0,0 +1,168 @@
+import asyncio
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from fastapi import HTTPException, status
+from pwdlib import PasswordHash
+from pwdlib.exceptions import UnknownHashError
+from pwdlib.hashers.argon2 import Argon2Hasher
+
+
+def _env_int(name: str, default: int) -> int:
+    return int(os.getenv(name, str(default)))
+
+
+def argon2_hasher_from_env(prefix: str = "ARGON2", time_cost: int = None, memory_cost: int = None, parallelism: int = None) -> Argon2Hasher:
+    """Argon2 hasher with the cost parameters from `<prefix>_TIME_COST` etc. (argon2-cffi defaults otherwise)."""
+    import argon2
+    return Argon2Hasher(
+        time_cost=_env_int(f"{prefix}_TIME_COST", time_cost or argon2.DEFAULT_TIME_COST),
+        memory_cost=_env_int(f"{prefix}_MEMORY_COST", memory_cost or argon2.DEFAULT_MEMORY_COST),
+        parallelism=_env_int(f"{prefix}_PARALLELISM", parallelism or argon2.DEFAULT_PARALLELISM),
+    )
+
+
+class HashingPool:
+    """
+    Dedicated, size-limited pool for password hashing and verification.
+
+    argon2 takes tens of milliseconds and a lot of memory per call, so
+    running it inline lets a login storm occupy every request thread. Here at
+    most `workers` hashes run at once and at most `max_queue` more may wait;
+    anything beyond that is rejected straight away with 503 and a
+    Retry-After header instead of piling up. argon2-cffi releases the GIL
+    while hashing, so threads give real parallelism.
+
+    `stats()` reports how long calls waited in the queue versus how long the
+    hash itself took.
+    """
+
+    def __init__(self, workers: int = 4, max_queue: int = 32, retry_after_seconds: int = 1):
+        self.workers = workers
+        self.max_queue = max_queue
+        self.retry_after_seconds = retry_after_seconds
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="password-hash")
+        self._lock = threading.Lock()
+        self._slot_freed = threading.Condition(self._lock)
+        self._in_flight = 0
+        self._completed = 0
+        self._rejected = 0
+        self._queue_wait_seconds = 0.0
+        self._hash_seconds = 0.0
+        self._max_queue_wait_seconds = 0.0
+
+    def _reserve(self, wait: bool = False):
+        with self._lock:
+            if wait:
+                # Background work only takes idle workers and never the queue slots
+                while self._in_flight >= self.workers:
+                    self._slot_freed.wait()
+            elif self._in_flight >= self.workers + self.max_queue:
+                self._rejected += 1
+                raise HTTPException(
+                    status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                    detail="Server busy, please retry shortly",
+                    headers={"Retry-After": str(self.retry_after_seconds)}
+                )
+            self._in_flight += 1
+
+    def _timed(self, submitted_at: float, fn, args):
+        started_at = time.monotonic()
+        try:
+            return fn(*args)
+        finally:
+            finished_at = time.monotonic()
+            queue_wait = started_at - submitted_at
+            with self._lock:
+                self._in_flight -= 1
+                self._completed += 1
+                self._queue_wait_seconds += queue_wait
+                self._hash_seconds += finished_at - started_at
+                self._max_queue_wait_seconds = max(self._max_queue_wait_seconds, queue_wait)
+                self._slot_freed.notify()
+
+    def _submit(self, fn, args, wait: bool = False):
+        self._reserve(wait=wait)
+        try:
+            return self._executor.submit(self._timed, time.monotonic(), fn, args)
+        except RuntimeError:
+            with self._lock:
+                self._in_flight -= 1
+                self._slot_freed.notify()
+            raise
+
+    def run(self, fn, *args):
+        """Run `fn(*args)` on the pool and block until it finishes (sync routes)."""
+        return self._submit(fn, args).result()
+
+    async def run_async(self, fn, *args):
+        """Run `fn(*args)` on the pool without blocking the event loop (async routes)."""
+        return await asyncio.wrap_future(self._submit(fn, args))
+
+    def map(self, fn, items) -> list:
+        """
+        Run `fn(item)` for every item in parallel, for bulk work. Instead of
+        being rejected when the pool is busy it waits for idle workers, so it
+        cannot starve interactive logins of their queue slots.
+        """
+        futures = [self._submit(fn, (item,), wait=True) for item in items]
+        return [future.result() for future in futures]
+
+    def stats(self) -> dict:
+        with self._lock:
+            completed = self._completed or 1
+            return {
+                'workers': self.workers,
+                'max_queue': self.max_queue,
+                'in_flight': self._in_flight,
+                'completed': self._completed,
+                'rejected': self._rejected,
+                'queue_wait_seconds_total': self._queue_wait_seconds,
+                'hash_seconds_total': self._hash_seconds,
+                'queue_wait_seconds_avg': self._queue_wait_seconds / completed,
+                'hash_seconds_avg': self._hash_seconds / completed,
+                'queue_wait_seconds_max': self._max_queue_wait_seconds,
+            }
+
+
+# Named cost profiles. "interactive" is what every stored hash should end up
+# with; "bulk-import" is a much cheaper profile for mass onboarding. Hashes
+# made with any other parameters are re-hashed with "interactive" on the next
+# successful login (see app.services.auth.login).
+INTERACTIVE = "interactive"
+BULK_IMPORT = "bulk-import"
+
+password_hashes = {
+    INTERACTIVE: PasswordHash((argon2_hasher_from_env("ARGON2"),)),
+    BULK_IMPORT: PasswordHash((argon2_hasher_from_env("ARGON2_BULK", time_cost=1, memory_cost=8192, parallelism=1),)),
+}
+
+password_hash = password_hashes[INTERACTIVE]
+
+
+def get_profile(profile: str) -> PasswordHash:
+    try:
+        return password_hashes[profile]
+    except KeyError:
+        raise ValueError(f"Unknown password hash profile: {profile}")
+
+
+def verify_and_update(plain_password: str, hashed_password: str):
+    """
+    Verify against the interactive profile. Returns (valid, new_hash) where
+    new_hash is set when the stored hash used other parameters. Hashes no
+    hasher recognises (e.g. old placeholders) never verify.
+    """
+    try:
+        return password_hash.verify_and_update(plain_password, hashed_password)
+    except UnknownHashError:
+        return False, None
+
+
+hash_pool = HashingPool(
+    workers=_env_int("HASH_POOL_WORKERS", min(4, os.cpu_count() or 1)),
+    max_queue=_env_int("HASH_POOL_MAX_QUEUE", 32),
+    retry_after_seconds=_env_int("HASH_POOL_RETRY_AFTER_SECONDS", 1),
+)
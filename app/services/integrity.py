@@ -0,0 +1,43 @@
+from sqlalchemy import UniqueConstraint
+from sqlalchemy.exc import IntegrityError
+
+from app.database import Base
+
+
+def _unique_columns(name: str):
+    for table in Base.metadata.tables.values():
+        for constraint in table.constraints:
+            if not isinstance(constraint, UniqueConstraint):
+                continue
+            columns = [column.name for column in constraint.columns]
+            # Unnamed ones (Column(unique=True)) get Postgres' default <table>_<columns>_key
+            if (constraint.name or f"{table.name}_{'_'.join(columns)}_key") == name:
+                return table.name, columns
+    return None, []
+
+
+def is_unique_violation(error: IntegrityError, name: str) -> bool:
+    """
+    Whether `error` was raised by the named unique constraint or unique index,
+    so services can insert first and map the violation to their usual HTTP
+    error instead of checking before inserting.
+    """
+    diag = getattr(error.orig, "diag", None)
+    if diag is not None:
+        # psycopg2 reports the violated constraint/index by name
+        return diag.constraint_name == name
+    # asyncpg's UniqueViolationError, wrapped by SQLAlchemy's adapter
+    constraint_name = getattr(error.orig.__cause__, "constraint_name", None)
+    if constraint_name is not None:
+        return constraint_name == name
+
+    # SQLite: "UNIQUE constraint failed: classes.standard, classes.section"
+    # or "UNIQUE constraint failed: index 'ix_users_email_lower'"
+    message = str(error.orig)
+    if "UNIQUE constraint failed" not in message:
+        return False
+    if f"index '{name}'" in message:
+        return True
+    table, columns = _unique_columns(name)
+    failed = message.split("UNIQUE constraint failed:", 1)[1]
+    return bool(columns) and sorted(part.strip() for part in failed.split(",")) == sorted(f"{table}.{column}" for column in columns)
@@ -0,0 +1,298 @@
+"""
+Per-request performance instrumentation.
+
+`RequestMetricsMiddleware` opens a `RequestStats` for every HTTP request in
+a context variable; the engine event hooks installed by `instrument_engine`
+add each SQL statement's count, duration and row count to it, and pools
+built by `timed_pool_class` add the time spent waiting for a connection.
+When the response starts, the totals go out in a `Server-Timing` header and
+into the process-wide `registry`, which `/metrics` renders in the Prometheus
+text format. A request that runs the same statement more than
+N_PLUS_ONE_THRESHOLD times is logged as a likely N+1.
+"""
+import logging
+import os
+import re
+import threading
+import time
+from collections import Counter, defaultdict
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Optional
+
+from sqlalchemy import event, exc
+
+logger = logging.getLogger(__name__)
+
+N_PLUS_ONE_THRESHOLD = int(os.getenv("N_PLUS_ONE_THRESHOLD", "10"))
+
+# Request duration histogram buckets, seconds
+DURATION_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+@dataclass
+class RequestStats:
+    statements: int = 0
+    sql_seconds: float = 0.0
+    pool_wait_seconds: float = 0.0
+    rows: int = 0
+    statement_counts: Counter = field(default_factory=Counter)
+
+
+_current: ContextVar[Optional[RequestStats]] = ContextVar("request_stats", default=None)
+
+
+def current_stats() -> Optional[RequestStats]:
+    return _current.get()
+
+
+@contextmanager
+def recording_statements():
+    """Collect the statements run inside the block into a fresh RequestStats, as a request would."""
+    stats = RequestStats()
+    token = _current.set(stats)
+    try:
+        yield stats
+    finally:
+        _current.reset(token)
+
+
+_PLACEHOLDER = r"(?:\?|%s|%\(\w+\)s|:\w+|\$\d+)"
+_IN_LIST = re.compile(rf"\(\s*{_PLACEHOLDER}(?:\s*,\s*{_PLACEHOLDER})+\s*\)")
+_WHITESPACE = re.compile(r"\s+")
+
+
+def normalize_sql(statement: str) -> str:
+    """SQL text with whitespace collapsed and IN lists of any length folded to (...)."""
+    statement = _WHITESPACE.sub(" ", statement).strip()
+    return _IN_LIST.sub("(...)", statement)
+
+
+# Engine hooks
+
+# Called as observer(conn, cursor, statement, parameters, context, executemany, elapsed)
+# after every statement, whether or not a request is being measured
+_statement_observers = []
+
+
+def add_statement_observer(observer):
+    _statement_observers.append(observer)
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("query_started_at", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    elapsed = time.perf_counter() - conn.info["query_started_at"].pop()
+    for observer in _statement_observers:
+        observer(conn, cursor, statement, parameters, context, executemany, elapsed)
+    stats = _current.get()
+    if stats is None:
+        return
+    stats.statements += 1
+    stats.sql_seconds += elapsed
+    # psycopg2 reports SELECT row counts; sqlite3 only reports them for DML
+    if cursor.rowcount and cursor.rowcount > 0:
+        stats.rows += cursor.rowcount
+    stats.statement_counts[statement] += 1
+
+
+def _handle_error(exception_context):
+    # A failed statement never reaches after_cursor_execute
+    connection = exception_context.connection
+    if connection is not None and connection.info.get("query_started_at"):
+        connection.info["query_started_at"].pop()
+
+
+def instrument_engine(engine):
+    """Time every statement run on `engine` (a sync Engine or an AsyncEngine's sync_engine)."""
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+    event.listen(engine, "handle_error", _handle_error)
+
+
+def timed_pool_class(pool_class):
+    """
+    Subclass of `pool_class` that adds connection checkout wait to the
+    current request and keeps process-wide totals in `wait_stats()`.
+    """
+
+    class TimedPool(pool_class):
+        def __init__(self, *args, **kwargs):
+            super().__init__(*args, **kwargs)
+            self._wait_lock = threading.Lock()
+            self._checkouts = 0
+            self._timeouts = 0
+            self._wait_seconds = 0.0
+            self._max_wait_seconds = 0.0
+
+        def connect(self):
+            started_at = time.perf_counter()
+            timed_out = False
+            try:
+                return super().connect()
+            except exc.TimeoutError:
+                timed_out = True
+                raise
+            finally:
+                waited = time.perf_counter() - started_at
+                with self._wait_lock:
+                    self._checkouts += 1
+                    self._timeouts += timed_out
+                    self._wait_seconds += waited
+                    self._max_wait_seconds = max(self._max_wait_seconds, waited)
+                stats = _current.get()
+                if stats is not None:
+                    stats.pool_wait_seconds += waited
+
+        def wait_stats(self) -> dict:
+            with self._wait_lock:
+                return {
+                    'checkouts': self._checkouts,
+                    'timeouts': self._timeouts,
+                    'wait_seconds_total': self._wait_seconds,
+                    'wait_seconds_avg': self._wait_seconds / self._checkouts if self._checkouts else 0.0,
+                    'wait_seconds_max': self._max_wait_seconds,
+                }
+
+    TimedPool.__name__ = f"Timed{pool_class.__name__}"
+    return TimedPool
+
+
+# Process-wide aggregates
+
+class MetricsRegistry:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._requests = Counter()             # (method, route, status)
+        self._duration_buckets = defaultdict(lambda: [0] * len(DURATION_BUCKETS))
+        self._duration_sum = Counter()         # (method, route)
+        self._duration_count = Counter()
+        self._statements = Counter()
+        self._sql_seconds = Counter()
+        self._pool_wait_seconds = Counter()
+        self._rows = Counter()
+        self._n_plus_one = Counter()
+
+    def observe(self, method: str, route: str, status: int, seconds: float, stats: RequestStats, n_plus_one: int):
+        key = (method, route)
+        with self._lock:
+            self._requests[(method, route, status)] += 1
+            buckets = self._duration_buckets[key]
+            for index, bound in enumerate(DURATION_BUCKETS):
+                if seconds <= bound:
+                    buckets[index] += 1
+            self._duration_sum[key] += seconds
+            self._duration_count[key] += 1
+            self._statements[key] += stats.statements
+            self._sql_seconds[key] += stats.sql_seconds
+            self._pool_wait_seconds[key] += stats.pool_wait_seconds
+            self._rows[key] += stats.rows
+            if n_plus_one:
+                self._n_plus_one[key] += n_plus_one
+
+    def render(self) -> str:
+        """All metrics in the Prometheus text exposition format."""
+        lines = []
+
+        def labels(**values) -> str:
+            escaped = (name + '="' + str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n") + '"'
+                       for name, value in values.items())
+            return "{" + ",".join(escaped) + "}"
+
+        def family(name: str, kind: str, help_text: str, samples):
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} {kind}")
+            lines.extend(samples)
+
+        with self._lock:
+            family("http_requests_total", "counter", "HTTP requests by route and status.",
+                   [f"http_requests_total{labels(method=m, route=r, status=s)} {v}" for (m, r, s), v in sorted(self._requests.items())])
+
+            samples = []
+            for (m, r), buckets in sorted(self._duration_buckets.items()):
+                for bound, count in zip(DURATION_BUCKETS, buckets):
+                    samples.append(f"http_request_duration_seconds_bucket{labels(method=m, route=r, le=bound)} {count}")
+                samples.append(f"http_request_duration_seconds_bucket{labels(method=m, route=r, le='+Inf')} {self._duration_count[(m, r)]}")
+                samples.append(f"http_request_duration_seconds_sum{labels(method=m, route=r)} {self._duration_sum[(m, r)]}")
+                samples.append(f"http_request_duration_seconds_count{labels(method=m, route=r)} {self._duration_count[(m, r)]}")
+            family("http_request_duration_seconds", "histogram", "Wall time per request.", samples)
+
+            for name, counter, help_text in (
+                ("db_statements_total", self._statements, "SQL statements executed."),
+                ("db_statement_seconds_total", self._sql_seconds, "Time spent executing SQL statements."),
+                ("db_pool_wait_seconds_total", self._pool_wait_seconds, "Time spent waiting for a pooled connection."),
+                ("db_rows_total", self._rows, "Rows returned or affected, as reported by the driver."),
+                ("db_n_plus_one_total", self._n_plus_one, "Statements repeated more than N_PLUS_ONE_THRESHOLD times in one request."),
+            ):
+                family(name, "counter", help_text, [f"{name}{labels(method=m, route=r)} {v}" for (m, r), v in sorted(counter.items())])
+
+        return "\n".join(lines) + "\n"
+
+
+registry = MetricsRegistry()
+
+
+def _route_label(scope) -> str:
+    # FastAPI stores the matched route in the scope; use its template, not the raw path
+    route = scope.get("route")
+    return getattr(route, "path", None) or "unmatched"
+
+
+def _repeated_statements(stats: RequestStats) -> dict:
+    if N_PLUS_ONE_THRESHOLD <= 0:
+        return {}
+    by_shape = Counter()
+    for statement, count in stats.statement_counts.items():
+        by_shape[normalize_sql(statement)] += count
+    return {statement: count for statement, count in by_shape.items() if count > N_PLUS_ONE_THRESHOLD}
+
+
+def server_timing(total_seconds: float, stats: RequestStats) -> str:
+    return (
+        f'app;dur={total_seconds * 1000:.1f}, '
+        f'db;dur={stats.sql_seconds * 1000:.1f};desc="{stats.statements} statements, {stats.rows} rows", '
+        f'pool;dur={stats.pool_wait_seconds * 1000:.1f}'
+    )
+
+
+class RequestMetricsMiddleware:
+    """
+    ASGI middleware recording wall time, SQL statements and time, pool wait
+    and rows per route. Streaming responses are measured up to the point
+    their headers are sent.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = RequestStats()
+        token = _current.set(stats)
+        started_at = time.perf_counter()
+        status = 500
+
+        async def send_with_timing(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                headers = list(message.get("headers", []))
+                headers.append((b"server-timing", server_timing(time.perf_counter() - started_at, stats).encode()))
+                message = {**message, "headers": headers}
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            _current.reset(token)
+            route = _route_label(scope)
+            repeated = _repeated_statements(stats)
+            for statement, count in repeated.items():
+                logger.warning("Possible N+1 on %s %s: statement ran %d times: %s", scope["method"], route, count, statement[:500])
+            registry.observe(scope["method"], route, status, time.perf_counter() - started_at, stats, len(repeated))
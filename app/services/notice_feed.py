@@ -0,0 +1,151 @@
+import os
+from typing import Optional
+from uuid import UUID
+
+from fastapi import Request
+from sqlalchemy import and_, literal, select, true, union_all
+from sqlalchemy.orm import Session
+
+from app.models.models import Class, Notice, Student, Teacher, TeacherClass
+from app.services.auth import require_roles
+from app.services.cache import TTLCache
+from app.services.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, decode_cursor, encode_cursor, keyset_after
+
+FEED_ORDER = [Notice.created_at, Notice.id]
+FEED_COLUMNS = [Notice.id, Notice.title, Notice.description, Notice.created_by, Notice.class_id, Notice.standard, Notice.created_at]
+
+# Newest notices kept per target; first pages up to this size are served from cache
+FEED_CACHE_DEPTH = DEFAULT_PAGE_SIZE
+
+# ('class', class_id) / ('standard', standard) / ('school',) -> newest FEED_CACHE_DEPTH notice rows.
+# create_notice and delete_notice invalidate the affected target.
+feed_cache = TTLCache(
+    max_size=int(os.getenv("NOTICE_FEED_CACHE_MAX_SIZE", "4096")),
+    ttl_seconds=float(os.getenv("NOTICE_FEED_CACHE_TTL_SECONDS", "60")),
+)
+
+SCHOOL = ('school',)
+EVERYTHING = ('all',)
+
+
+def notice_target(class_id: Optional[UUID], standard: Optional[int]):
+    if class_id is not None:
+        return ('class', class_id)
+    if standard is not None:
+        return ('standard', standard)
+    return SCHOOL
+
+
+def invalidate_notice_feed(notice: Notice):
+    feed_cache.invalidate(notice_target(notice.class_id, notice.standard))
+    feed_cache.invalidate(EVERYTHING)
+
+
+def _target_filter(target):
+    if target == EVERYTHING:
+        return true()
+    if target == SCHOOL:
+        return and_(Notice.class_id.is_(None), Notice.standard.is_(None))
+    kind, value = target
+    if kind == 'class':
+        return Notice.class_id == value
+    return Notice.standard == value
+
+
+def _feed_targets(principal, db: Session) -> list:
+    """The notice targets that reach this user: their classes, their standards and the whole school."""
+    if principal.role == 'admin':
+        return [EVERYTHING]
+
+    user_id = UUID(principal.id)
+    if principal.role == 'student':
+        rows = db.execute(
+            select(Class.id, Class.standard)
+            .join(Student, Student.class_id == Class.id)
+            .where(Student.user_id == user_id)
+        ).all()
+    else:
+        rows = db.execute(
+            select(Class.id, Class.standard)
+            .join(TeacherClass, TeacherClass.class_id == Class.id)
+            .join(Teacher, Teacher.id == TeacherClass.teacher_id)
+            .where(Teacher.user_id == user_id)
+            .distinct()
+        ).all()
+
+    return class_targets(rows)
+
+
+def class_targets(classes: list) -> list:
+    """Targets reaching members of `classes` ((class_id, standard) pairs): each class, each standard and the school."""
+    targets = [SCHOOL]
+    targets += [('class', class_id) for class_id, _ in classes]
+    targets += [('standard', standard) for standard in sorted({standard for _, standard in classes})]
+    return targets
+
+
+def _fetch(targets: list, limit: int, db: Session, after: Optional[list] = None) -> dict:
+    """
+    Newest `limit` notices of each target (older than `after`), in one
+    UNION ALL. Each branch is an index range scan on (class_id, created_at)
+    or (standard, created_at) instead of one OR over the whole table.
+    """
+    branches = []
+    for position, target in enumerate(targets):
+        query = select(literal(position).label('branch'), *FEED_COLUMNS).where(_target_filter(target))
+        if after:
+            query = query.where(keyset_after(FEED_ORDER, after, descending=True))
+        branch = query.order_by(Notice.created_at.desc(), Notice.id.desc()).limit(limit).subquery()
+        branches.append(select(branch))
+
+    rows_by_target = {target: [] for target in targets}
+    for row in db.execute(union_all(*branches)):
+        rows_by_target[targets[row.branch]].append(row)
+    return rows_by_target
+
+
+def _newest_first(rows: list) -> list:
+    # Every notice has exactly one target, so merging the branches never duplicates a row
+    return sorted(rows, key=lambda row: (row.created_at, row.id), reverse=True)
+
+
+def cached_feed(targets: list, db: Session) -> list:
+    """
+    Newest FEED_CACHE_DEPTH notices of each target merged newest first,
+    from the feed cache; only targets missing from it are read, together
+    in one query.
+    """
+    cached = {target: feed_cache.get(target) for target in targets}
+    missing = [target for target, rows in cached.items() if rows is None]
+    if missing:
+        for target, rows in _fetch(missing, FEED_CACHE_DEPTH, db).items():
+            feed_cache.set(target, rows)
+            cached[target] = rows
+    return _newest_first([row for rows in cached.values() for row in rows])
+
+
+def notice_feed(db: Session, request: Request, limit: int = DEFAULT_PAGE_SIZE, cursor: Optional[str] = None):
+    """
+    Notices for the authenticated user's classes and standards plus
+    school-wide ones, newest first, keyset-paginated.
+
+    First pages are merged from the per-target feed cache; only targets
+    missing from it are read, together in one query.
+    """
+    principal = require_roles(['admin', 'teacher', 'student'], request=request, db=db)
+    targets = _feed_targets(principal, db)
+    limit = max(1, min(limit, MAX_PAGE_SIZE))
+
+    if cursor is None and limit <= FEED_CACHE_DEPTH:
+        rows = cached_feed(targets, db)
+    else:
+        after = decode_cursor(cursor, FEED_ORDER) if cursor else None
+        fetched = _fetch(targets, limit + 1, db, after=after)
+        rows = _newest_first([row for rows in fetched.values() for row in rows])
+
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = encode_cursor(rows[-1], FEED_ORDER)
+
+    return {'items': [dict(row._mapping) for row in rows], 'next_cursor': next_cursor}
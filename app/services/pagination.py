@@ -0,0 +1,96 @@
+import base64
+import binascii
+import json
+from datetime import date, datetime
+from typing import Optional
+
+from fastapi import HTTPException
+from sqlalchemy import literal, tuple_
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 500
+
+
+def _encode_value(value):
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if value is None or isinstance(value, (int, float, str, bool)):
+        return value
+    return str(value)
+
+
+def _decode_value(column, value):
+    if value is None:
+        return None
+    python_type = column.type.python_type
+    if python_type in (datetime, date):
+        return python_type.fromisoformat(value)
+    return python_type(value)
+
+
+def encode_cursor(row, order_by: list) -> str:
+    values = [_encode_value(getattr(row, column.key)) for column in order_by]
+    return base64.urlsafe_b64encode(json.dumps(values).encode()).decode()
+
+
+def decode_cursor(cursor: str, order_by: list) -> list:
+    try:
+        values = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        if not isinstance(values, list) or len(values) != len(order_by):
+            raise ValueError
+        return [_decode_value(column, value) for column, value in zip(order_by, values)]
+    except (ValueError, TypeError, binascii.Error):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+def keyset_after(order_by: list, values: list, descending: bool):
+    # Row-value comparison, so Postgres can seek the composite index directly.
+    # Values are bound through their column's type so they are compared in the
+    # stored representation (e.g. SQLite's datetime text), not as plain strings
+    cursor = tuple_(*(literal(value, column.type) for column, value in zip(order_by, values)))
+    if descending:
+        return tuple_(*order_by) < cursor
+    return tuple_(*order_by) > cursor
+
+
+def _page_query(query, order_by: list, limit: int, cursor: Optional[str], descending: bool):
+    # Works for both ORM Query objects and 2.0-style select() statements
+    if cursor:
+        query = query.filter(keyset_after(order_by, decode_cursor(cursor, order_by), descending))
+
+    ordering = [column.desc() if descending else column.asc() for column in order_by]
+    return query.order_by(*ordering).limit(limit + 1)
+
+
+def _page_result(rows: list, order_by: list, limit: int):
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = encode_cursor(rows[-1], order_by)
+
+    return {'items': rows, 'next_cursor': next_cursor}
+
+
+def keyset_paginate(query, order_by: list, limit: int = DEFAULT_PAGE_SIZE, cursor: Optional[str] = None, descending: bool = False):
+    """
+    Keyset (cursor) pagination for a query.
+
+    `order_by` must end in a unique column (normally the primary key) so the
+    ordering is total. The cursor is an opaque token holding the sort values
+    of the last row of the previous page, so every page is an index range
+    scan no matter how deep the client has paged, unlike OFFSET.
+
+    Returns a dict with `items` and `next_cursor` (None on the last page).
+    """
+    limit = max(1, min(limit, MAX_PAGE_SIZE))
+    rows = _page_query(query, order_by, limit, cursor, descending).all()
+    return _page_result(rows, order_by, limit)
+
+
+async def keyset_paginate_async(db, stmt, order_by: list, limit: int = DEFAULT_PAGE_SIZE, cursor: Optional[str] = None, descending: bool = False):
+    """
+    Same as `keyset_paginate`, for a select() of columns run on an AsyncSession.
+    """
+    limit = max(1, min(limit, MAX_PAGE_SIZE))
+    result = await db.execute(_page_query(stmt, order_by, limit, cursor, descending))
+    return _page_result(result.all(), order_by, limit)
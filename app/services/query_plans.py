@@ -0,0 +1,60 @@
+from uuid import uuid4
+
+from sqlalchemy import func, select
+
+from app.models.models import Class, Notice, Student, Teacher, TeacherClass, User
+
+
+def explain_prefix(dialect_name: str, analyze: bool = False) -> str:
+    if dialect_name == "sqlite":
+        return "EXPLAIN QUERY PLAN "
+    return "EXPLAIN (ANALYZE, BUFFERS) " if analyze else "EXPLAIN "
+
+
+def _plan_lines(dialect_name: str, rows) -> list[str]:
+    if dialect_name == "sqlite":
+        # (id, parent, notused, detail)
+        return [row[-1] for row in rows]
+    return [row[0] for row in rows]
+
+
+def explain_sql(connection, sql: str, parameters=None, analyze: bool = False) -> list[str]:
+    """Plan of a driver-level SQL string as text lines, for PostgreSQL or SQLite."""
+    rows = connection.exec_driver_sql(explain_prefix(connection.dialect.name, analyze) + sql, parameters or ()).all()
+    return _plan_lines(connection.dialect.name, rows)
+
+
+def explain_dbapi(dbapi_connection, dialect_name: str, sql: str, parameters=None, analyze: bool = False) -> list[str]:
+    """
+    Same as `explain_sql` on a raw DBAPI connection, bypassing the engine's
+    events; for use from inside an engine event handler.
+    """
+    cursor = dbapi_connection.cursor()
+    try:
+        cursor.execute(explain_prefix(dialect_name, analyze) + sql, parameters or ())
+        return _plan_lines(dialect_name, cursor.fetchall())
+    finally:
+        cursor.close()
+
+
+def explain(connection, statement, analyze: bool = False) -> list[str]:
+    """Plan of a select() statement, with its parameters rendered inline."""
+    sql = str(statement.compile(dialect=connection.dialect, compile_kwargs={"literal_binds": True}))
+    return explain_sql(connection, sql, analyze=analyze)
+
+
+def hot_queries() -> dict:
+    """The lookups every request path depends on, with placeholder parameters."""
+    some_id = uuid4()
+    return {
+        'login: user by lower(email)': select(User).where(func.lower(User.email) == func.lower("someone@school.com")),
+        'require_roles: user by id': select(User).where(User.id == some_id),
+        'all_users: first page by role': select(User).where(User.role == 'student').order_by(User.created_at, User.id).limit(51),
+        'assign: teacher profile by user': select(Teacher).where(Teacher.user_id == some_id),
+        'assign: student profile by user': select(Student).where(Student.user_id == some_id),
+        'assign: teacher-class pair': select(TeacherClass).where(TeacherClass.teacher_id == some_id, TeacherClass.class_id == some_id),
+        'create_class: class by standard/section': select(Class).where(Class.standard == 5, Class.section == 'A'),
+        'attendance: class roster': select(Student.id, Student.roll_number).where(Student.class_id == some_id),
+        'notice feed: newest for a class': select(Notice).where(Notice.class_id == some_id).order_by(Notice.created_at.desc(), Notice.id.desc()).limit(51),
+        'notice feed: newest for a standard': select(Notice).where(Notice.standard == 5).order_by(Notice.created_at.desc(), Notice.id.desc()).limit(51),
+    }
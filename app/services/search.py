@@ -0,0 +1,295 @@
+import bisect
+import heapq
+import os
+import re
+import threading
+from collections import defaultdict
+from typing import Optional
+
+from fastapi import Request
+from sqlalchemy import func, literal_column, select
+from sqlalchemy.orm import Session
+
+from app.database import SessionLocal
+from app.models.models import Class, Notice, Student, User, notice_search_vector, user_search_vector
+from app.services.auth import require_roles
+from app.services.table_versions import table_versions_statement
+
+MAX_SEARCH_LIMIT = 50
+# Terms of a query beyond this are ignored
+MAX_SEARCH_TERMS = 8
+# Matches ranked per query. A short prefix ("a") can match most rows;
+# ranking only the newest N keeps typeahead fast, at the cost of exact
+# ranking for such prefixes
+SEARCH_CANDIDATES = int(os.getenv("SEARCH_CANDIDATES", "1000"))
+
+# Tables each in-process index is built from; a change to any rebuilds it
+USERS_INDEX_TABLES = ('users', 'students', 'classes')
+NOTICES_INDEX_TABLES = ('notices',)
+
+USER_COLUMNS = [
+    User.id, User.full_name, User.email, User.role,
+    Student.id.label('student_id'), Student.roll_number, Class.id.label('class_id'), Class.standard, Class.section
+]
+NOTICE_COLUMNS = [Notice.id, Notice.title, Notice.description, Notice.created_by, Notice.class_id, Notice.standard, Notice.created_at]
+
+
+def search_terms(q: str) -> list:
+    """Lowercased words of the query; each must match a word (or, locally, part of one) of the result."""
+    return list(dict.fromkeys(re.findall(r"\w+", q.lower())))[:MAX_SEARCH_TERMS]
+
+
+def _users_statement():
+    # Students come with their class
+    return (
+        select(*USER_COLUMNS)
+        .outerjoin(Student, Student.user_id == User.id)
+        .outerjoin(Class, Class.id == Student.class_id)
+    )
+
+
+## PostgreSQL: GIN-indexed tsvector expressions (migration 0006)
+
+def _prefix_query(config: str, terms: list):
+    # Every term as a prefix; `terms` are \w+ only, so nothing in them is tsquery syntax
+    return func.to_tsquery(literal_column(f"'{config}'::regconfig"), " & ".join(f"{term}:*" for term in terms))
+
+
+def _search_users_postgres(terms: list, role: Optional[str], limit: int, db: Session) -> list:
+    vector = user_search_vector()
+    query = _prefix_query('simple', terms)
+    candidates = select(User.id).where(vector.op('@@')(query))
+    if role:
+        candidates = candidates.where(User.role == role)
+    # A deterministic SEARCH_CANDIDATES (the newest matches), not whichever rows the scan meets first
+    candidates = candidates.order_by(User.created_at.desc(), User.id.desc()).limit(SEARCH_CANDIDATES).subquery()
+
+    rank = func.ts_rank(vector, query)
+    rows = db.execute(
+        _users_statement().add_columns(rank.label('score'))
+        .join(candidates, candidates.c.id == User.id)
+        .order_by(rank.desc(), User.full_name, User.id)
+        .limit(limit)
+    ).all()
+    return [dict(row._mapping) for row in rows]
+
+
+def _search_notices_postgres(terms: list, limit: int, db: Session) -> list:
+    vector = notice_search_vector()
+    query = _prefix_query('simple', terms)
+    # The newest SEARCH_CANDIDATES matches are ranked
+    candidates = (
+        select(Notice.id).where(vector.op('@@')(query))
+        .order_by(Notice.created_at.desc(), Notice.id.desc())
+        .limit(SEARCH_CANDIDATES)
+        .subquery()
+    )
+
+    rank = func.ts_rank(vector, query)
+    rows = db.execute(
+        select(*NOTICE_COLUMNS, rank.label('score'))
+        .join(candidates, candidates.c.id == Notice.id)
+        .order_by(rank.desc(), Notice.created_at.desc(), Notice.id)
+        .limit(limit)
+    ).all()
+    return [dict(row._mapping) for row in rows]
+
+
+## SQLite: in-process index
+
+def _trigrams(word: str) -> set:
+    return {word[i:i + 3] for i in range(len(word) - 2)}
+
+
+class TrigramIndex:
+    """
+    In-process search index over short documents, for databases without
+    full-text search (SQLite locally).
+
+    Words sit in a sorted vocabulary, so a prefix is a bisect range, and the
+    vocabulary is indexed by trigram, so a term of three or more characters
+    also matches inside words ("mail" in "gmail"). Every term must match;
+    exact words score above prefixes and prefixes above substrings,
+    multiplied by the weight of the field the word is in.
+    """
+
+    def __init__(self, documents):
+        """`documents`: (key, [(text, weight), ...], payload) per document."""
+        self.payloads = {}
+        # key -> {word: weight of the heaviest field it appears in}
+        self._words_of = {}
+        postings = defaultdict(list)
+        for key, fields, payload in documents:
+            words = {}
+            for text, weight in fields:
+                for word in re.findall(r"\w+", (text or "").lower()):
+                    if words.get(word, 0) < weight:
+                        words[word] = weight
+            self.payloads[key] = payload
+            self._words_of[key] = words
+            for word in words:
+                postings[word].append(key)
+        self._postings = dict(postings)
+        self._vocabulary = sorted(self._postings)
+        self._words_by_trigram = defaultdict(set)
+        for word in self._vocabulary:
+            for trigram in _trigrams(word):
+                self._words_by_trigram[trigram].add(word)
+
+    def __len__(self):
+        return len(self.payloads)
+
+    @staticmethod
+    def _points(term: str, word: str) -> int:
+        if word == term:
+            return 3
+        if word.startswith(term):
+            return 2
+        return 1 if len(term) >= 3 and term in word else 0
+
+    def _matching_words(self, term: str) -> list:
+        """Vocabulary words `term` matches, best first: the word itself, words it prefixes, words containing it."""
+        start = bisect.bisect_left(self._vocabulary, term)
+        end = bisect.bisect_left(self._vocabulary, term[:-1] + chr(ord(term[-1]) + 1), lo=start)
+        # sorted, so the word itself (if present) comes first
+        words = self._vocabulary[start:end]
+        if len(term) >= 3:
+            word_sets = sorted((self._words_by_trigram.get(trigram, set()) for trigram in _trigrams(term)), key=len)
+            words += [word for word in set.intersection(*word_sets) if term in word and not word.startswith(term)]
+        return words
+
+    def _term_score(self, term: str, words: dict) -> int:
+        return max((weight * self._points(term, word) for word, weight in words.items()), default=0)
+
+    def search(self, terms: list, limit: int, accept=None, order=None, candidates: int = None) -> list:
+        """
+        (payload, score) of the best `limit` documents matching every term,
+        ties broken by `order(payload)`. Walks the documents of the most
+        selective term, best matching words first, and checks the other
+        terms against each document's own words; stops after `candidates`
+        matches.
+        """
+        matching = {term: self._matching_words(term) for term in terms}
+        if not all(matching.values()):
+            return []
+        driver = terms[0] if len(terms) == 1 else min(terms, key=lambda term: sum(len(self._postings[word]) for word in matching[term]))
+
+        def keys():
+            seen = set()
+            for word in matching[driver]:
+                for key in self._postings[word]:
+                    if key not in seen:
+                        seen.add(key)
+                        yield key
+
+        results = []
+        for key in keys():
+            words = self._words_of[key]
+            scores = [self._term_score(term, words) for term in terms]
+            if not all(scores) or (accept is not None and not accept(self.payloads[key])):
+                continue
+            results.append((self.payloads[key], sum(scores)))
+            if candidates and len(results) >= candidates:
+                break
+        return heapq.nsmallest(limit, results, key=lambda result: (-result[1], order(result[0]) if order else ()))
+
+
+class LocalSearchIndexes:
+    """
+    The in-process indexes by name. The first search builds an index; after
+    a change to its tables (their table_versions counters, one lookup per
+    search) a background thread rebuilds it while searches keep using the
+    previous one.
+    """
+
+    def __init__(self):
+        self._indexes = {}
+        self._rebuilding = set()
+        # _lock serializes first builds; _rebuilding has its own so marking a
+        # rebuild never waits behind one
+        self._lock = threading.Lock()
+        self._rebuilding_lock = threading.Lock()
+
+    def get(self, name: str, tables: tuple, build, db: Session) -> TrigramIndex:
+        versions = tuple(sorted((row.name, row.version) for row in db.execute(table_versions_statement(tables))))
+        current = self._indexes.get(name)
+        if current is None:
+            with self._lock:
+                current = self._indexes.get(name)
+                if current is None:
+                    current = self._indexes[name] = (versions, build(db))
+        elif current[0] != versions and self._start_rebuild(name):
+            threading.Thread(target=self._rebuild, args=(name, versions, build), name=f"search-index-{name}", daemon=True).start()
+        return current[1]
+
+    def _start_rebuild(self, name: str) -> bool:
+        # Check and mark under the lock, so concurrent searches start one rebuild
+        with self._rebuilding_lock:
+            if name in self._rebuilding:
+                return False
+            self._rebuilding.add(name)
+            return True
+
+    def _rebuild(self, name: str, versions: tuple, build):
+        db = SessionLocal()
+        try:
+            self._indexes[name] = (versions, build(db))
+        finally:
+            db.close()
+            with self._rebuilding_lock:
+                self._rebuilding.discard(name)
+
+    def clear(self):
+        with self._lock:
+            self._indexes.clear()
+
+
+local_indexes = LocalSearchIndexes()
+
+
+def _build_users_index(db: Session) -> TrigramIndex:
+    return TrigramIndex((row.id, [(row.full_name, 2), (row.email, 1)], row) for row in db.execute(_users_statement()))
+
+
+def _build_notices_index(db: Session) -> TrigramIndex:
+    return TrigramIndex((row.id, [(row.title, 2), (row.description, 1)], row) for row in db.execute(select(*NOTICE_COLUMNS)))
+
+
+def _search_users_local(terms: list, role: Optional[str], limit: int, db: Session) -> list:
+    index = local_indexes.get('users', USERS_INDEX_TABLES, _build_users_index, db)
+    accept = (lambda user: user.role == role) if role else None
+    results = index.search(terms, limit, accept=accept, order=lambda user: (user.full_name, str(user.id)), candidates=SEARCH_CANDIDATES)
+    return [{**user._mapping, 'score': points} for user, points in results]
+
+
+def _search_notices_local(terms: list, limit: int, db: Session) -> list:
+    index = local_indexes.get('notices', NOTICES_INDEX_TABLES, _build_notices_index, db)
+    # newest first among equal scores
+    results = index.search(terms, limit, order=lambda notice: -notice.created_at.timestamp() if notice.created_at else 0,
+                           candidates=SEARCH_CANDIDATES)
+    return [{**notice._mapping, 'score': points} for notice, points in results]
+
+
+def search(q: str, db: Session, request: Request, kind: str = 'all', role: Optional[str] = None, limit: int = 10) -> dict:
+    """
+    Ranked prefix search over users (name, email; students with their class)
+    and notices (title, description), for typeahead.
+
+    PostgreSQL matches the GIN-indexed tsvectors of migration 0006; other
+    databases search an in-process trigram index, rebuilt after writes.
+    """
+    require_roles(['admin', 'teacher'], request=request, db=db)
+    terms = search_terms(q)
+    results = {'users': [], 'notices': []}
+    if not terms:
+        return results
+    limit = max(1, min(limit, MAX_SEARCH_LIMIT))
+
+    postgres = db.get_bind().dialect.name == "postgresql"
+    if kind in ('all', 'users'):
+        search_users = _search_users_postgres if postgres else _search_users_local
+        results['users'] = search_users(terms, role, limit, db)
+    if kind in ('all', 'notices'):
+        search_notices = _search_notices_postgres if postgres else _search_notices_local
+        results['notices'] = search_notices(terms, limit, db)
+    return results
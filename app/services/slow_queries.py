@@ -0,0 +1,210 @@
+"""
+Slow-query log.
+
+Every statement the instrumented engines run is timed by the hooks in
+app/services/metrics.py, which pass it to `slow_query_log.observe`
+(registered in app/database.py). Statements slower than
+SLOW_QUERY_THRESHOLD_MS are recorded with their normalized SQL, redacted
+parameters and the service function in app/services that issued them. A sampled share of the slow
+SELECTs (SLOW_QUERY_EXPLAIN_SAMPLE_RATE) is re-run under
+`EXPLAIN (ANALYZE, BUFFERS)` (`EXPLAIN QUERY PLAN` on SQLite) and the plan is
+kept with the record. Records go to an in-memory ring buffer, served at
+GET /admin/slow_queries, and, when SLOW_QUERY_LOG_FILE is set, as JSON lines
+to a size-rotated file.
+"""
+import datetime
+import json
+import logging
+import os
+import random
+import sys
+import threading
+import uuid
+from collections import deque
+from decimal import Decimal
+from logging.handlers import RotatingFileHandler
+
+from app.services.metrics import normalize_sql
+
+# Like PostgreSQL's log_min_duration_statement: 0 records every statement, -1 none
+SLOW_QUERY_THRESHOLD_MS = float(os.getenv("SLOW_QUERY_THRESHOLD_MS", "200"))
+SLOW_QUERY_EXPLAIN_SAMPLE_RATE = float(os.getenv("SLOW_QUERY_EXPLAIN_SAMPLE_RATE", "0"))
+SLOW_QUERY_BUFFER_SIZE = int(os.getenv("SLOW_QUERY_BUFFER_SIZE", "200"))
+SLOW_QUERY_LOG_FILE = os.getenv("SLOW_QUERY_LOG_FILE", "")
+SLOW_QUERY_LOG_MAX_BYTES = int(os.getenv("SLOW_QUERY_LOG_MAX_BYTES", str(10 * 1024 * 1024)))
+SLOW_QUERY_LOG_BACKUP_COUNT = int(os.getenv("SLOW_QUERY_LOG_BACKUP_COUNT", "5"))
+
+_SERVICES_DIR = os.path.dirname(os.path.abspath(__file__))
+# Instrumentation frames between the engine and the service that issued the statement
+_SKIPPED_FILES = {os.path.join(_SERVICES_DIR, name) for name in ("metrics.py", "slow_queries.py", "query_plans.py")}
+
+# Values that can be shown as-is; strings and bytes (emails, password hashes,
+# tokens, free text) are reduced to their type and length
+_SAFE_TYPES = (bool, int, float, Decimal, uuid.UUID, datetime.date, datetime.time, datetime.timedelta)
+
+
+def redact_value(value):
+    if value is None or isinstance(value, _SAFE_TYPES):
+        return value
+    if isinstance(value, (str, bytes, bytearray, memoryview)):
+        return f"<{type(value).__name__}:{len(value)}>"
+    if isinstance(value, (list, tuple)):
+        return [redact_value(item) for item in value]
+    return f"<{type(value).__name__}>"
+
+
+def redact_parameters(parameters, executemany: bool):
+    """Driver-level parameters (a tuple or dict, or a list of them for executemany) with values redacted."""
+    if executemany:
+        parameter_sets = list(parameters or ())
+        first = redact_parameters(parameter_sets[0], False) if parameter_sets else None
+        return {'rows': len(parameter_sets), 'first': first}
+    if isinstance(parameters, dict):
+        return {key: redact_value(value) for key, value in parameters.items()}
+    return [redact_value(value) for value in parameters or ()]
+
+
+def calling_service() -> str:
+    """
+    `module.function:line` of the outermost app/services frame on the stack,
+    i.e. the service entry point rather than helpers such as pagination or
+    the cache wrapper. Async services run their statements in a greenlet
+    whose stack does not reach them, so those are reported as unknown.
+    """
+    found = None
+    frame = sys._getframe(1)
+    while frame is not None:
+        filename = frame.f_code.co_filename
+        if filename.startswith(_SERVICES_DIR) and filename not in _SKIPPED_FILES:
+            found = frame
+        frame = frame.f_back
+    if found is None:
+        return "unknown"
+    return f"{found.f_globals.get('__name__', '?')}.{found.f_code.co_name}:{found.f_lineno}"
+
+
+def _is_select(statement: str) -> bool:
+    # EXPLAIN ANALYZE executes the statement, so never sample writes
+    head = statement.lstrip().split(None, 1)[0].upper() if statement.strip() else ""
+    return head in ("SELECT", "WITH") and not any(
+        keyword in statement.upper() for keyword in ("INSERT ", "UPDATE ", "DELETE ")
+    )
+
+
+def _explain(conn, statement, parameters) -> list[str]:
+    # Imported here: query_plans imports the models, which import app.database
+    from app.services.query_plans import explain_dbapi
+
+    dialect_name = conn.dialect.name
+    dbapi_connection = conn.connection.dbapi_connection
+    if dialect_name != "postgresql":
+        return explain_dbapi(dbapi_connection, dialect_name, statement, parameters)
+
+    # A failing EXPLAIN must not abort the caller's transaction
+    cursor = dbapi_connection.cursor()
+    try:
+        cursor.execute("SAVEPOINT slow_query_explain")
+        try:
+            plan = explain_dbapi(dbapi_connection, dialect_name, statement, parameters, analyze=True)
+        except Exception:
+            cursor.execute("ROLLBACK TO SAVEPOINT slow_query_explain")
+            raise
+        cursor.execute("RELEASE SAVEPOINT slow_query_explain")
+        return plan
+    finally:
+        cursor.close()
+
+
+class SlowQueryLog:
+    def __init__(self, threshold_ms: float, explain_sample_rate: float = 0.0, buffer_size: int = 200, file_logger=None):
+        self.threshold_ms = threshold_ms
+        self.explain_sample_rate = explain_sample_rate
+        self.file_logger = file_logger
+        self._entries = deque(maxlen=buffer_size)
+        self._lock = threading.Lock()
+        self._recorded = 0
+        self._explained = 0
+        self._explain_errors = 0
+
+    def observe(self, conn, cursor, statement, parameters, context, executemany, elapsed):
+        if self.threshold_ms < 0 or conn.info.get("slow_query_explaining"):
+            return
+        duration_ms = elapsed * 1000
+        if duration_ms < self.threshold_ms:
+            return
+
+        entry = {
+            'recorded_at': datetime.datetime.now(datetime.timezone.utc).isoformat(),
+            'duration_ms': round(duration_ms, 3),
+            'statement': normalize_sql(statement),
+            'parameters': redact_parameters(parameters, executemany),
+            'service': calling_service(),
+            'rowcount': cursor.rowcount if cursor.rowcount is not None and cursor.rowcount >= 0 else None,
+            'plan': None,
+        }
+        if (self.explain_sample_rate > 0 and not executemany and _is_select(statement)
+                and random.random() < self.explain_sample_rate):
+            conn.info["slow_query_explaining"] = True
+            try:
+                entry['plan'] = _explain(conn, statement, parameters)
+                with self._lock:
+                    self._explained += 1
+            except Exception as exc:
+                entry['plan_error'] = f"{type(exc).__name__}: {exc}"
+                with self._lock:
+                    self._explain_errors += 1
+            finally:
+                conn.info.pop("slow_query_explaining", None)
+
+        with self._lock:
+            self._entries.append(entry)
+            self._recorded += 1
+        if self.file_logger is not None:
+            self.file_logger.info(json.dumps(entry, default=str))
+
+    def entries(self, limit: int = None) -> list[dict]:
+        """Recorded statements, newest first."""
+        with self._lock:
+            entries = list(reversed(self._entries))
+        return entries[:limit] if limit else entries
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                'threshold_ms': self.threshold_ms,
+                'explain_sample_rate': self.explain_sample_rate,
+                'buffer_size': self._entries.maxlen,
+                'buffered': len(self._entries),
+                'recorded': self._recorded,
+                'explained': self._explained,
+                'explain_errors': self._explain_errors,
+            }
+
+
+def _file_logger():
+    if not SLOW_QUERY_LOG_FILE:
+        return None
+    directory = os.path.dirname(SLOW_QUERY_LOG_FILE)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    file_logger = logging.getLogger("app.slow_queries.file")
+    file_logger.setLevel(logging.INFO)
+    file_logger.propagate = False
+    if not file_logger.handlers:
+        handler = RotatingFileHandler(SLOW_QUERY_LOG_FILE, maxBytes=SLOW_QUERY_LOG_MAX_BYTES,
+                                      backupCount=SLOW_QUERY_LOG_BACKUP_COUNT, encoding="utf-8")
+        handler.setFormatter(logging.Formatter("%(message)s"))
+        file_logger.addHandler(handler)
+    return file_logger
+
+
+slow_query_log = SlowQueryLog(
+    threshold_ms=SLOW_QUERY_THRESHOLD_MS,
+    explain_sample_rate=SLOW_QUERY_EXPLAIN_SAMPLE_RATE,
+    buffer_size=SLOW_QUERY_BUFFER_SIZE,
+    file_logger=_file_logger(),
+)
@@ -0,0 +1,107 @@
+import hashlib
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Optional
+
+from fastapi import Request, Response
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.models.models import TableVersion
+from app.services.upsert import dialect_insert
+
+# Tables each cacheable listing is built from
+CLASSES_LISTING = ('classes',)
+SUBJECTS_LISTING = ('subjects',)
+# names/emails come from users; subject and class names are joined in
+TEACHERS_LISTING = ('users', 'teachers', 'teacher_classes', 'subjects', 'classes')
+
+
+def _bump_statement(db, tables: tuple):
+    now = datetime.now(timezone.utc)
+    insert = dialect_insert(db, TableVersion)
+    stmt = insert.values([{'name': table, 'version': 1, 'updated_at': now} for table in tables])
+    return stmt.on_conflict_do_update(
+        index_elements=[TableVersion.name],
+        set_={'version': TableVersion.version + 1, 'updated_at': now}
+    )
+
+
+def bump_table_versions(db: Session, *tables: str):
+    """
+    Increment the change counter of `tables` in the caller's transaction, so
+    the bump commits (or rolls back) together with the write it describes.
+    Call it before `db.commit()`.
+    """
+    db.execute(_bump_statement(db, tables))
+
+
+async def bump_table_versions_async(db, *tables: str):
+    """Same as `bump_table_versions`, on an AsyncSession."""
+    await db.execute(_bump_statement(db, tables))
+
+
+def table_versions_statement(tables: tuple):
+    return select(TableVersion.name, TableVersion.version, TableVersion.updated_at).where(TableVersion.name.in_(tables))
+
+
+def _validators(rows, tables: tuple, request: Request):
+    versions = {row.name: row.version for row in rows}
+    stamps = [_as_utc(row.updated_at) for row in rows if row.updated_at]
+    # Pages and filters of one listing are different representations
+    key = ";".join(f"{table}={versions.get(table, 0)}" for table in tables) + "|" + request.url.path + "?" + request.url.query
+    etag = 'W/"' + hashlib.sha1(key.encode()).hexdigest() + '"'
+    return etag, max(stamps) if stamps else None
+
+
+def _as_utc(value: datetime) -> datetime:
+    # SQLite hands timestamps back without a timezone
+    return value if value.tzinfo else value.replace(tzinfo=timezone.utc)
+
+
+def _is_fresh(request: Request, etag: str, last_modified: Optional[datetime]) -> bool:
+    if_none_match = request.headers.get('if-none-match')
+    if if_none_match is not None:
+        # If-None-Match takes precedence over If-Modified-Since
+        candidates = [tag.strip() for tag in if_none_match.split(',')]
+        return '*' in candidates or etag in candidates or etag[2:] in candidates
+
+    if_modified_since = request.headers.get('if-modified-since')
+    if if_modified_since and last_modified:
+        try:
+            return last_modified.replace(microsecond=0) <= parsedate_to_datetime(if_modified_since)
+        except (TypeError, ValueError):
+            return False
+    return False
+
+
+def _conditional(rows, tables: tuple, request: Request, response: Optional[Response]) -> Optional[Response]:
+    etag, last_modified = _validators(rows, tables, request)
+    headers = {'ETag': etag, 'Cache-Control': 'private, no-cache'}
+    if last_modified:
+        headers['Last-Modified'] = format_datetime(last_modified, usegmt=True)
+
+    if _is_fresh(request, etag, last_modified):
+        return Response(status_code=304, headers=headers)
+    if response is not None:
+        response.headers.update(headers)
+    return None
+
+
+def not_modified(tables: tuple, db: Session, request: Request, response: Optional[Response] = None) -> Optional[Response]:
+    """
+    Conditional GET for a listing built from `tables`.
+
+    Reads only the version counters (one primary-key lookup) and returns a
+    304 response when the client's If-None-Match / If-Modified-Since still
+    matches, so the listing query is skipped. Otherwise sets ETag and
+    Last-Modified on `response` and returns None.
+    """
+    rows = db.execute(table_versions_statement(tables)).all()
+    return _conditional(rows, tables, request, response)
+
+
+async def not_modified_async(tables: tuple, db, request: Request, response: Optional[Response] = None) -> Optional[Response]:
+    """Same as `not_modified`, on an AsyncSession."""
+    rows = (await db.execute(table_versions_statement(tables))).all()
+    return _conditional(rows, tables, request, response)
@@ -0,0 +1,38 @@
+from sqlalchemy import insert, inspect
+from sqlalchemy.orm import Session
+
+
+def dialect_insert(db: Session, model):
+    """
+    INSERT construct with `on_conflict_do_update`/`on_conflict_do_nothing`
+    for the session's database (PostgreSQL in production, SQLite locally).
+    """
+    dialect = db.get_bind().dialect.name
+    if dialect == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert
+    elif dialect == "sqlite":
+        from sqlalchemy.dialects.sqlite import insert
+    else:
+        raise NotImplementedError(f"Upserts are not supported on {dialect}")
+    return insert(model)
+
+
+def returning_insert(model, columns: list = None):
+    """
+    INSERT of `model` returning `columns` (every mapped column by default)
+    in the order the rows were given. Server defaults such as created_at
+    come back with the row, so nothing has to be refreshed after the commit.
+    """
+    if columns is None:
+        columns = [getattr(model, attr.key) for attr in inspect(model).column_attrs]
+    return insert(model).returning(*columns, sort_by_parameter_order=True)
+
+
+def insert_returning(db: Session, model, rows: list, columns: list = None) -> list:
+    """Insert `rows` (dicts) in one statement; returns a Row per input row, in input order."""
+    return db.execute(returning_insert(model, columns), rows).all()
+
+
+def insert_one(db: Session, model, values: dict, columns: list = None):
+    """`insert_returning` for one row. The Row has attribute access like the ORM object it replaces."""
+    return insert_returning(db, model, [values], columns)[0]
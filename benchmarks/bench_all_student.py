@@ -0,0 +1,130 @@
+"""
+Benchmark for the /admin/all_students read path.
+
+Compares the previous joinedload-based implementation of `all_student`
+against the flat projection query in app/services/admin.py.
+
+Usage:
+    python -m benchmarks.bench_all_student [--students 50000] [--class-size 50] [--teachers-per-class 40]
+
+Runs against a throwaway SQLite file unless BENCH_DATABASE_URL points at a
+scratch database (tables are created there and left in place).
+"""
+
+import argparse
+import os
+import tempfile
+import time
+import uuid
+
+if "BENCH_DATABASE_URL" in os.environ:
+    os.environ["DATABASE_URL"] = os.environ["BENCH_DATABASE_URL"]
+else:
+    os.environ["DATABASE_URL"] = "sqlite:///" + os.path.join(tempfile.mkdtemp(), "bench.db")
+
+from sqlalchemy import insert
+from sqlalchemy.orm import joinedload
+
+from app.database import Base, SessionLocal, engine
+from app.models.models import Class, Student, Subject, Teacher, TeacherClass, User
+from app.services.admin import student_listing
+
+
+def all_student_joinedload(db):
+    """The original implementation, kept here as the baseline."""
+    student_list = []
+    student_profiles = db.query(Student).options(
+        joinedload(Student.user),
+        joinedload(Student.class_).joinedload(Class.teacher_classes).joinedload(TeacherClass.teacher).joinedload(Teacher.user),
+    ).all()
+
+    for student in student_profiles:
+        class_ = student.class_
+        class_teacher_name = None
+        if class_ and class_.teacher_classes:
+            for tc in class_.teacher_classes:
+                if tc.is_class_teacher:
+                    class_teacher_name = tc.teacher.user.full_name
+                    break
+            if class_teacher_name is None:
+                class_teacher_name = class_.teacher_classes[0].teacher.user.full_name
+
+        student_list.append({
+            'id': student.id,
+            'user_id': student.user_id,
+            'roll_number': student.roll_number,
+            'standard': class_.standard if class_ else None,
+            'section': class_.section if class_ else None,
+            'class_teacher': class_teacher_name
+        })
+    return student_list
+
+
+def seed(students: int, class_size: int, teachers_per_class: int):
+    class_count = max(1, students // class_size)
+    teacher_count = max(teachers_per_class, class_count // 5)
+
+    subject_id = uuid.uuid4()
+    classes = [{'id': uuid.uuid4(), 'standard': i // 10 + 1, 'section': f"S{i % 10}"} for i in range(class_count)]
+    teacher_users = [{'id': uuid.uuid4(), 'full_name': f"Teacher {i}", 'email': f"teacher{i}@bench.local",
+                      'password_hash': 'x', 'role': 'teacher'} for i in range(teacher_count)]
+    teachers = [{'id': uuid.uuid4(), 'user_id': u['id'], 'subject_id': subject_id} for u in teacher_users]
+    teacher_classes = []
+    for c_index, class_ in enumerate(classes):
+        for t in range(teachers_per_class):
+            teacher = teachers[(c_index + t) % teacher_count]
+            teacher_classes.append({'id': uuid.uuid4(), 'teacher_id': teacher['id'], 'class_id': class_['id'],
+                                    'is_class_teacher': t == teachers_per_class // 2})
+    student_users = [{'id': uuid.uuid4(), 'full_name': f"Student {i}", 'email': f"student{i}@bench.local",
+                      'password_hash': 'x', 'role': 'student'} for i in range(students)]
+    student_rows = [{'id': uuid.uuid4(), 'user_id': u['id'], 'class_id': classes[i % class_count]['id'],
+                     'roll_number': i // class_count + 1} for i, u in enumerate(student_users)]
+
+    with engine.begin() as conn:
+        conn.execute(insert(Subject), [{'id': subject_id, 'name': 'Mathematics'}])
+        conn.execute(insert(Class), classes)
+        conn.execute(insert(User), teacher_users + student_users)
+        conn.execute(insert(Teacher), teachers)
+        conn.execute(insert(TeacherClass), teacher_classes)
+        conn.execute(insert(Student), student_rows)
+
+
+def timed(label, fn, repeat):
+    best = None
+    result = None
+    for _ in range(repeat):
+        db = SessionLocal()
+        try:
+            start = time.perf_counter()
+            result = fn(db)
+            elapsed = time.perf_counter() - start
+        finally:
+            db.close()
+        best = elapsed if best is None else min(best, elapsed)
+    print(f"{label:<12} {best * 1000:>10.1f} ms  ({len(result)} rows, best of {repeat})")
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--students", type=int, default=50000)
+    parser.add_argument("--class-size", type=int, default=50)
+    parser.add_argument("--teachers-per-class", type=int, default=40)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    Base.metadata.create_all(bind=engine)
+    print(f"Seeding {args.students} students, {args.teachers_per_class} teachers per class...")
+    seed(args.students, args.class_size, args.teachers_per_class)
+
+    old = timed("joinedload", all_student_joinedload, args.repeat)
+    # the uncached query, so every repeat reaches the database
+    new = timed("projection", student_listing.__wrapped__, args.repeat)
+
+    by_id = {row['id']: row for row in new}
+    mismatches = sum(1 for row in old if by_id.get(row['id']) != row)
+    print(f"mismatched rows: {mismatches}")
+
+
+if __name__ == "__main__":
+    main()
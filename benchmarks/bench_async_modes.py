@@ -0,0 +1,133 @@
+"""
+Requests/sec of /admin/all_teachers and /auth/login with DATABASE_ASYNC off and on.
+
+Starts one uvicorn server per mode against the same seeded database and
+drives it with concurrent httpx clients.
+
+Usage:
+    python -m benchmarks.bench_async_modes [--requests 2000] [--concurrency 64] [--teachers 200]
+
+Runs against a throwaway SQLite file unless BENCH_DATABASE_URL points at a
+scratch database. Needs httpx plus aiosqlite (SQLite) or asyncpg (Postgres).
+"""
+
+import argparse
+import asyncio
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+import uuid
+
+if "BENCH_DATABASE_URL" in os.environ:
+    os.environ["DATABASE_URL"] = os.environ["BENCH_DATABASE_URL"]
+else:
+    os.environ["DATABASE_URL"] = "sqlite:///" + os.path.join(tempfile.mkdtemp(), "bench.db")
+os.environ.setdefault("SECRET_KEY", "bench-secret")
+os.environ.setdefault("ALGORITHM", "HS256")
+os.environ.setdefault("ACCESS_TOKEN_EXPIRE_MINUTES", "30")
+os.environ["DATABASE_ASYNC"] = "false"
+
+import httpx
+from sqlalchemy import insert
+
+from app.database import Base, engine
+from app.models.models import Class, Subject, Teacher, TeacherClass, User
+from app.services.auth import get_password_hash
+
+LOGIN_EMAIL = "login@bench.local"
+LOGIN_PASSWORD = "bench-password"
+
+
+def seed(teachers: int):
+    subject_id = uuid.uuid4()
+    classes = [{'id': uuid.uuid4(), 'standard': i // 4 + 1, 'section': "ABCD"[i % 4]} for i in range(40)]
+    users = [{'id': uuid.uuid4(), 'full_name': f"Teacher {i}", 'email': f"teacher{i}@bench.local",
+              'password_hash': 'x', 'role': 'teacher'} for i in range(teachers)]
+    users.append({'id': uuid.uuid4(), 'full_name': "Login User", 'email': LOGIN_EMAIL,
+                  'password_hash': get_password_hash(LOGIN_PASSWORD), 'role': 'admin'})
+    teacher_rows = [{'id': uuid.uuid4(), 'user_id': u['id'], 'subject_id': subject_id} for u in users[:teachers]]
+    teacher_classes = [{'id': uuid.uuid4(), 'teacher_id': t['id'], 'class_id': classes[(i + k) % len(classes)]['id'],
+                        'is_class_teacher': k == 0} for i, t in enumerate(teacher_rows) for k in range(3)]
+
+    with engine.begin() as conn:
+        conn.execute(insert(Subject), [{'id': subject_id, 'name': 'Mathematics'}])
+        conn.execute(insert(Class), classes)
+        conn.execute(insert(User), users)
+        conn.execute(insert(Teacher), teacher_rows)
+        conn.execute(insert(TeacherClass), teacher_classes)
+
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def start_server(async_mode: bool, port: int):
+    env = dict(os.environ, DATABASE_ASYNC="true" if async_mode else "false")
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app", "--port", str(port), "--log-level", "warning"],
+        env=env, stdout=subprocess.DEVNULL
+    )
+    deadline = time.monotonic() + 30
+    while time.monotonic() < deadline:
+        try:
+            httpx.get(f"http://127.0.0.1:{port}/")
+            return server
+        except httpx.TransportError:
+            time.sleep(0.1)
+    server.terminate()
+    raise RuntimeError("uvicorn did not start")
+
+
+async def drive(base_url: str, method: str, path: str, total: int, concurrency: int, **kwargs):
+    remaining = iter(range(total))
+    failures = 0
+
+    async def worker(client):
+        nonlocal failures
+        for _ in remaining:
+            response = await client.request(method, path, **kwargs)
+            if response.status_code != 200:
+                failures += 1
+
+    limits = httpx.Limits(max_connections=concurrency)
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=60) as client:
+        start = time.perf_counter()
+        await asyncio.gather(*(worker(client) for _ in range(concurrency)))
+        elapsed = time.perf_counter() - start
+    return total / elapsed, failures
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--login-requests", type=int, default=300)
+    parser.add_argument("--concurrency", type=int, default=64)
+    parser.add_argument("--teachers", type=int, default=200)
+    args = parser.parse_args()
+
+    Base.metadata.create_all(bind=engine)
+    seed(args.teachers)
+
+    credentials = {"email": LOGIN_EMAIL, "password": LOGIN_PASSWORD}
+    for async_mode in (False, True):
+        port = free_port()
+        server = start_server(async_mode, port)
+        base_url = f"http://127.0.0.1:{port}"
+        try:
+            label = "async" if async_mode else "sync"
+            rps, failures = asyncio.run(drive(base_url, "GET", "/admin/all_teachers", args.requests, args.concurrency))
+            print(f"{label:<6} /admin/all_teachers {rps:>9.1f} req/s  ({failures} failed)")
+            rps, failures = asyncio.run(drive(base_url, "POST", "/auth/login", args.login_requests, args.concurrency, json=credentials))
+            print(f"{label:<6} /auth/login         {rps:>9.1f} req/s  ({failures} failed)")
+        finally:
+            server.terminate()
+            server.wait()
+
+
+if __name__ == "__main__":
+    main()
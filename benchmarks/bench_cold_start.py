@@ -0,0 +1,138 @@
+"""
+Cold-start time of the serverless entry point (api/index.py).
+
+Starts fresh interpreters and measures, for each mode, how long importing
+the app takes and how long the first request then takes (engine creation,
+the first connection and, with lazy routers, importing the route's router):
+
+    eager  LAZY_ROUTERS=false, every router imported at startup
+    lazy   LAZY_ROUTERS=true with a precompiled OpenAPI schema (api/index.py defaults)
+
+With --importtime N it also runs `python -X importtime` on the entry point
+and prints the N modules with the largest self and cumulative import time,
+then every app module.
+
+Usage:
+    python -m benchmarks.bench_cold_start [--runs 5] [--path /health/db] [--importtime 25] [--mode lazy]
+
+Runs against a throwaway SQLite file (tables created) unless
+BENCH_DATABASE_URL points at an existing database.
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Run in each fresh interpreter; a bare ASGI call so no client library is imported
+CHILD = """
+import asyncio, json, sys, time
+started_at = time.perf_counter()
+from api.index import app
+imported_at = time.perf_counter()
+
+async def first_request(path):
+    messages = []
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+    async def send(message):
+        messages.append(message)
+    scope = {"type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1", "method": "GET", "scheme": "http",
+             "path": path, "raw_path": path.encode(), "root_path": "", "query_string": b"", "headers": [],
+             "server": ("bench", 80), "client": ("127.0.0.1", 1)}
+    try:
+        await app(scope, receive, send)
+    except Exception:
+        pass  # re-raised after the 500 response was sent
+    return messages[0]["status"]
+
+status = asyncio.run(first_request(sys.argv[1]))
+finished_at = time.perf_counter()
+print(json.dumps({"import_ms": (imported_at - started_at) * 1000, "first_request_ms": (finished_at - imported_at) * 1000, "status": status}))
+"""
+
+MODES = {
+    'eager': {'LAZY_ROUTERS': "false", 'OPENAPI_SCHEMA_FILE': ""},
+    'lazy': {'LAZY_ROUTERS': "true"},
+}
+
+
+def mode_environment(mode: str, database_url: str, openapi_file: str) -> dict:
+    env = dict(os.environ, DATABASE_URL=database_url)
+    env.setdefault("SECRET_KEY", "bench-secret")
+    env.setdefault("ALGORITHM", "HS256")
+    env.setdefault("ACCESS_TOKEN_EXPIRE_MINUTES", "30")
+    env.update(MODES[mode])
+    if mode == 'lazy':
+        env['OPENAPI_SCHEMA_FILE'] = openapi_file
+    return env
+
+
+def measure(env: dict, path: str) -> dict:
+    started_at = time.perf_counter()
+    output = subprocess.run([sys.executable, "-c", CHILD, path], env=env, cwd=ROOT, capture_output=True, text=True, check=True)
+    result = json.loads(output.stdout.strip().splitlines()[-1])
+    result['process_ms'] = (time.perf_counter() - started_at) * 1000
+    return result
+
+
+def import_profile(env: dict, top: int):
+    output = subprocess.run([sys.executable, "-X", "importtime", "-c", "import api.index"], env=env, cwd=ROOT,
+                            capture_output=True, text=True, check=True)
+    modules = []
+    for line in output.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        modules.append((name.strip(), int(self_us), int(cumulative_us)))
+
+    print(f"\nLargest self import time (top {top}):")
+    for name, self_us, cumulative_us in sorted(modules, key=lambda m: -m[1])[:top]:
+        print(f"  {self_us / 1000:>8.1f} ms  {name}")
+    print(f"\nLargest cumulative import time (top {top}):")
+    for name, self_us, cumulative_us in sorted(modules, key=lambda m: -m[2])[:top]:
+        print(f"  {cumulative_us / 1000:>8.1f} ms  {name}")
+    print("\nApplication modules (self / cumulative):")
+    for name, self_us, cumulative_us in modules:
+        if name == "app" or name.startswith(("app.", "api")):
+            print(f"  {self_us / 1000:>8.1f} / {cumulative_us / 1000:>8.1f} ms  {name}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--path", default="/health/db", help="first request after the import")
+    parser.add_argument("--mode", choices=sorted(MODES), help="only this mode")
+    parser.add_argument("--importtime", type=int, metavar="N", help="also print the N slowest imports")
+    args = parser.parse_args()
+
+    scratch = tempfile.mkdtemp()
+    database_url = os.environ.get("BENCH_DATABASE_URL", "sqlite:///" + os.path.join(scratch, "bench.db"))
+    openapi_file = os.path.join(scratch, "openapi.json")
+    commands = [["openapi", openapi_file]] if "BENCH_DATABASE_URL" in os.environ else [["create"], ["openapi", openapi_file]]
+    for command in commands:
+        subprocess.run([sys.executable, "db_manager.py", *command], cwd=ROOT, check=True, stdout=subprocess.DEVNULL,
+                       env=mode_environment('eager', database_url, openapi_file))
+
+    modes = [args.mode] if args.mode else list(MODES)
+    print(f"{'mode':<6} {'import ms':>10} {'first request ms':>17} {'process ms':>11}   (median of {args.runs}, {args.path})")
+    for mode in modes:
+        env = mode_environment(mode, database_url, openapi_file)
+        measure(env, args.path)  # warm the bytecode cache
+        runs = [measure(env, args.path) for _ in range(args.runs)]
+        median = {key: statistics.median(run[key] for run in runs) for key in ('import_ms', 'first_request_ms', 'process_ms')}
+        print(f"{mode:<6} {median['import_ms']:>10.1f} {median['first_request_ms']:>17.1f} {median['process_ms']:>11.1f}"
+              f"   status {runs[-1]['status']}")
+
+    if args.importtime:
+        import_profile(mode_environment(modes[-1], database_url, openapi_file), args.importtime)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+"""
+Per-row serialization cost of the admin list responses.
+
+Compares the response_model path FastAPI takes for a returned value
+(validate every row against the schema, dump it to JSON-able Python, then
+json.dumps) with the fast path in app/services/fast_json.py, which encodes
+trusted projection rows directly. Covers ORM objects (the old all_users)
+and plain dict rows (all_students) at each size.
+
+Usage:
+    python -m benchmarks.bench_json_serialization [--rows 10000 100000] [--repeat 3]
+
+No database is needed. Install orjson (`fast-json` extra) to measure it as
+well; pydantic-core's encoder is measured either way.
+"""
+
+import argparse
+import json
+import os
+import tempfile
+import time
+import uuid
+
+os.environ.setdefault("DATABASE_URL", "sqlite:///" + os.path.join(tempfile.mkdtemp(), "bench.db"))
+
+from pydantic import TypeAdapter
+from pydantic_core import to_json
+
+from app.models.models import User
+from app.schemas.Users import StudentListItem, UserResponseWithID
+from app.services import fast_json
+
+
+def response_model_path(schema):
+    adapter = TypeAdapter(list[schema])
+
+    def serialize(rows):
+        validated = adapter.validate_python(rows, from_attributes=True)
+        return json.dumps(adapter.dump_python(validated, mode="json"), ensure_ascii=False, separators=(",", ":")).encode()
+    return serialize
+
+
+def user_objects(count: int) -> list:
+    return [User(id=uuid.uuid4(), full_name=f"User {i}", email=f"user{i}@bench.local", role="student") for i in range(count)]
+
+
+def user_rows(count: int) -> list:
+    return [{'id': uuid.uuid4(), 'full_name': f"User {i}", 'email': f"user{i}@bench.local", 'role': "student"} for i in range(count)]
+
+
+def student_rows(count: int) -> list:
+    return [{'id': uuid.uuid4(), 'user_id': uuid.uuid4(), 'roll_number': i % 60 + 1, 'standard': i % 12 + 1,
+             'section': "A", 'class_teacher': f"Teacher {i % 300}"} for i in range(count)]
+
+
+def timed(serialize, rows, repeat: int) -> float:
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        serialize(rows)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, nargs="+", default=[10000, 100000])
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    fast_paths = [("pydantic-core to_json", to_json)]
+    if fast_json.orjson is not None:
+        fast_paths.append(("orjson", fast_json.orjson.dumps))
+
+    for count in args.rows:
+        cases = [
+            ("users: ORM objects -> response_model", response_model_path(UserResponseWithID), user_objects(count)),
+            ("students: dict rows -> response_model", response_model_path(StudentListItem), student_rows(count)),
+        ]
+        for label, serialize in fast_paths:
+            cases.append((f"users: projection rows -> {label}", serialize, user_rows(count)))
+            cases.append((f"students: dict rows -> {label}", serialize, student_rows(count)))
+
+        print(f"\n{count} rows (best of {args.repeat})")
+        for label, serialize, rows in cases:
+            elapsed = timed(serialize, rows, args.repeat)
+            print(f"  {label:<48} {elapsed * 1000:>9.1f} ms  {elapsed / count * 1e6:>6.2f} us/row")
+
+
+if __name__ == "__main__":
+    main()
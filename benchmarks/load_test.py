@@ -0,0 +1,264 @@
+"""
+Load test of the main read and write paths against a synthetic school.
+
+Generates a school with benchmarks.synthetic_school, logs in as its admin,
+a class teacher and a student, then drives each endpoint with concurrent
+httpx clients and reports p50/p95/p99 latency and throughput per endpoint.
+Two transports:
+
+    asgi     the app from app/main.py in this process (httpx.ASGITransport);
+             no network or server overhead, good for comparing code changes
+    uvicorn  a uvicorn server in a subprocess, over real HTTP
+
+Usage:
+    python -m benchmarks.load_test [--transport asgi|uvicorn|both] [--requests 500] [--concurrency 32]
+        [--classes 40 --students-per-class 40 --days 200 ...]
+        [--only all_users notice_feed] [--save-baseline baseline.json] [--baseline baseline.json]
+
+--save-baseline writes the results as JSON; --baseline compares this run
+with a saved one and exits with status 1 when an endpoint's p95 grew or
+its throughput dropped by more than --tolerance (default 20%).
+
+Runs against a throwaway SQLite file unless BENCH_DATABASE_URL points at a
+scratch database (e.g. a local Postgres; the tables are created there and
+must be empty unless --skip-generate is given with the ids of an earlier
+run). Needs httpx.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import platform
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import date
+
+if "BENCH_DATABASE_URL" in os.environ:
+    os.environ["DATABASE_URL"] = os.environ["BENCH_DATABASE_URL"]
+else:
+    os.environ["DATABASE_URL"] = "sqlite:///" + os.path.join(tempfile.mkdtemp(), "bench.db")
+os.environ.setdefault("SECRET_KEY", "bench-secret")
+os.environ.setdefault("ALGORITHM", "HS256")
+os.environ.setdefault("ACCESS_TOKEN_EXPIRE_MINUTES", "30")
+
+import httpx
+
+from app.database import Base, engine
+from app.main import app
+from benchmarks.synthetic_school import add_arguments, generate_from_arguments
+
+
+def scenarios(school: dict) -> list[dict]:
+    """name, method, path, caller role and body of every measured endpoint."""
+    class_id, student_id, test_id = school['class_id'], school['student_id'], school['test_id']
+    return [
+        {'name': 'login', 'method': 'POST', 'path': '/auth/login', 'role': None,
+         'json': {'email': school['student_email'], 'password': school['password']}, 'weight': 0.2},
+        {'name': 'all_users', 'method': 'GET', 'path': '/admin/all_users?limit=50', 'role': 'admin'},
+        {'name': 'all_users_by_role', 'method': 'GET', 'path': '/admin/all_users?role=student&limit=50', 'role': 'admin'},
+        {'name': 'all_teachers', 'method': 'GET', 'path': '/admin/all_teachers', 'role': 'admin'},
+        {'name': 'all_students', 'method': 'GET', 'path': '/admin/all_students', 'role': 'admin', 'weight': 0.2},
+        {'name': 'all_classes', 'method': 'GET', 'path': '/admin/all_classes', 'role': 'admin'},
+        {'name': 'notices', 'method': 'GET', 'path': '/admin/notice', 'role': 'admin'},
+        {'name': 'notice_feed', 'method': 'GET', 'path': '/notices/feed', 'role': 'student'},
+        {'name': 'dashboard', 'method': 'GET', 'path': '/me/dashboard', 'role': 'student'},
+        {'name': 'search_users', 'method': 'GET', 'path': '/search?q=stud&kind=users', 'role': 'admin'},
+        {'name': 'search_notices', 'method': 'GET', 'path': '/search?q=synthetic+not&kind=notices', 'role': 'admin'},
+        {'name': 'class_attendance', 'method': 'GET', 'path': f'/attendance/report/class/{class_id}/students', 'role': 'admin'},
+        {'name': 'class_daily_attendance', 'method': 'GET', 'path': f'/attendance/report/class/{class_id}/daily', 'role': 'admin'},
+        {'name': 'student_attendance', 'method': 'GET', 'path': f'/attendance/report/student/{student_id}', 'role': 'admin'},
+        {'name': 'class_gradebook', 'method': 'GET', 'path': f'/gradebook/class/{class_id}', 'role': 'admin'},
+        {'name': 'mark_attendance', 'method': 'POST', 'path': '/attendance/mark', 'role': 'teacher',
+         'json': {'class_id': class_id, 'date': date.today().isoformat(), 'absent_roll_numbers': [1, 2]}},
+        {'name': 'enter_marks', 'method': 'PUT', 'path': f'/gradebook/tests/{test_id}/marks', 'role': 'teacher',
+         'json': {'marks': [{'roll_number': roll, 'marks_obtained': 10} for roll in range(1, min(school['roll_numbers'], 10) + 1)]}},
+    ]
+
+
+def percentile(sorted_values: list, fraction: float) -> float:
+    # nearest-rank
+    if not sorted_values:
+        return 0.0
+    index = max(0, min(len(sorted_values) - 1, round(fraction * len(sorted_values) + 0.5) - 1))
+    return sorted_values[index]
+
+
+async def drive(client: httpx.AsyncClient, scenario: dict, headers: dict, total: int, concurrency: int) -> dict:
+    remaining = iter(range(total))
+    latencies = []
+    failures = 0
+
+    async def worker():
+        nonlocal failures
+        for _ in remaining:
+            started_at = time.perf_counter()
+            response = await client.request(scenario['method'], scenario['path'], json=scenario.get('json'), headers=headers)
+            latencies.append(time.perf_counter() - started_at)
+            if response.status_code >= 400:
+                failures += 1
+
+    started_at = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started_at
+
+    latencies.sort()
+    return {
+        'requests': total,
+        'failures': failures,
+        'throughput_rps': round(total / elapsed, 1),
+        'p50_ms': round(percentile(latencies, 0.50) * 1000, 2),
+        'p95_ms': round(percentile(latencies, 0.95) * 1000, 2),
+        'p99_ms': round(percentile(latencies, 0.99) * 1000, 2),
+        'max_ms': round(latencies[-1] * 1000, 2) if latencies else 0.0,
+    }
+
+
+async def login(client: httpx.AsyncClient, email: str, password: str) -> dict:
+    response = await client.post('/auth/login', json={'email': email, 'password': password})
+    response.raise_for_status()
+    return {'Authorization': 'Bearer ' + response.json()['token']}
+
+
+async def run_transport(client: httpx.AsyncClient, school: dict, args) -> dict:
+    headers = {
+        None: {},
+        'admin': await login(client, school['admin_email'], school['password']),
+        'teacher': await login(client, school['class_teacher_email'], school['password']),
+        'student': await login(client, school['student_email'], school['password']),
+    }
+    results = {}
+    for scenario in scenarios(school):
+        if args.only and scenario['name'] not in args.only:
+            continue
+        total = max(args.concurrency, int(args.requests * scenario.get('weight', 1)))
+        role_headers = headers[scenario['role']]
+        if args.warmup:
+            await drive(client, scenario, role_headers, args.warmup, min(args.warmup, args.concurrency))
+        results[scenario['name']] = result = await drive(client, scenario, role_headers, total, args.concurrency)
+        print(f"  {scenario['name']:<24} {result['p50_ms']:>9.2f} {result['p95_ms']:>9.2f} {result['p99_ms']:>9.2f}"
+              f" {result['throughput_rps']:>10.1f}  {result['failures']:>5}")
+    return results
+
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def start_server(port: int):
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app", "--port", str(port), "--log-level", "warning"],
+        env=dict(os.environ), stdout=subprocess.DEVNULL
+    )
+    deadline = time.monotonic() + 30
+    while time.monotonic() < deadline:
+        try:
+            httpx.get(f"http://127.0.0.1:{port}/")
+            return server
+        except httpx.TransportError:
+            time.sleep(0.1)
+    server.terminate()
+    raise RuntimeError("uvicorn did not start")
+
+
+async def run_asgi(school: dict, args) -> dict:
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=120) as client:
+        return await run_transport(client, school, args)
+
+
+async def run_uvicorn(school: dict, args) -> dict:
+    port = free_port()
+    server = start_server(port)
+    try:
+        limits = httpx.Limits(max_connections=args.concurrency)
+        async with httpx.AsyncClient(base_url=f"http://127.0.0.1:{port}", limits=limits, timeout=120) as client:
+            return await run_transport(client, school, args)
+    finally:
+        server.terminate()
+        server.wait()
+
+
+def compare(baseline: dict, current: dict, tolerance: float) -> list[str]:
+    """Print the change per endpoint; return the regressions."""
+    regressions = []
+    print(f"\nCompared with baseline (tolerance {tolerance:.0%}):")
+    for transport, results in current['results'].items():
+        for name, result in results.items():
+            before = baseline.get('results', {}).get(transport, {}).get(name)
+            if before is None:
+                continue
+            p95_change = result['p95_ms'] / before['p95_ms'] - 1 if before['p95_ms'] else 0.0
+            rps_change = result['throughput_rps'] / before['throughput_rps'] - 1 if before['throughput_rps'] else 0.0
+            regressed = p95_change > tolerance or rps_change < -tolerance
+            if regressed:
+                regressions.append(f"{transport} {name}")
+            print(f"  {transport:<8} {name:<24} p95 {before['p95_ms']:>8.2f} -> {result['p95_ms']:>8.2f} ms ({p95_change:+.0%})"
+                  f"  rps {before['throughput_rps']:>8.1f} -> {result['throughput_rps']:>8.1f} ({rps_change:+.0%})"
+                  f"{'  REGRESSION' if regressed else ''}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    add_arguments(parser)
+    parser.add_argument("--transport", choices=["asgi", "uvicorn", "both"], default="asgi")
+    parser.add_argument("--requests", type=int, default=500, help="requests per endpoint (fewer for the heavy ones)")
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--warmup", type=int, default=20, help="unmeasured requests per endpoint first")
+    parser.add_argument("--only", nargs="+", help="endpoint names to run")
+    parser.add_argument("--skip-generate", metavar="SCHOOL_JSON", help="reuse the data described by an earlier --save-school file")
+    parser.add_argument("--save-school", metavar="PATH", help="write the generated school's ids, for --skip-generate")
+    parser.add_argument("--save-baseline", metavar="PATH")
+    parser.add_argument("--baseline", metavar="PATH")
+    parser.add_argument("--tolerance", type=float, default=0.2)
+    args = parser.parse_args()
+
+    if args.skip_generate:
+        with open(args.skip_generate) as f:
+            school = json.load(f)
+    else:
+        Base.metadata.create_all(bind=engine)
+        school = generate_from_arguments(args)
+        print(f"Generated school in {school['seconds']}s: " + ", ".join(f"{k}={v}" for k, v in school['counts'].items()))
+        if args.save_school:
+            with open(args.save_school, "w") as f:
+                json.dump(school, f, indent=2)
+
+    transports = ["asgi", "uvicorn"] if args.transport == "both" else [args.transport]
+    results = {}
+    for transport in transports:
+        print(f"\n{transport}: {'endpoint':<22} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'req/s':>10}  {'fail':>5}")
+        runner = run_asgi if transport == "asgi" else run_uvicorn
+        results[transport] = asyncio.run(runner(school, args))
+
+    report = {
+        'meta': {
+            'database': engine.dialect.name,
+            'python': platform.python_version(),
+            'machine': platform.machine(),
+            'concurrency': args.concurrency,
+            'requests': args.requests,
+            'school': school['counts'],
+        },
+        'results': results,
+    }
+    if args.save_baseline:
+        with open(args.save_baseline, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"\nSaved baseline to {args.save_baseline}")
+    if args.baseline:
+        with open(args.baseline) as f:
+            regressions = compare(json.load(f), report, args.tolerance)
+        if regressions:
+            print("Regressed: " + ", ".join(regressions))
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,252 @@
+"""
+Synthetic school generator for benchmarks and load tests.
+
+Fills the configured database with a school of any size: subjects, classes
+across standards 1-12, teachers for every subject (one per class and
+subject, the first subject's teacher being the class teacher), students,
+a school year of daily attendance, tests per class and subject with a
+result for every student, and school/standard/class notices. Rows are
+written with multi-row INSERTs in chunks and the attendance rollups are
+rebuilt at the end. The same seed always produces the same data.
+
+Every generated user has the password SYNTHETIC_PASSWORD; the admin is
+admin@synthetic.school, teachers teacher<N>@synthetic.school and students
+student<N>@synthetic.school.
+
+Usage:
+    python -m benchmarks.synthetic_school [--classes 40] [--students-per-class 40] [--days 200]
+
+Writes to BENCH_DATABASE_URL, or DATABASE_URL, creating the tables first
+(existing rows are left in place; use a scratch database).
+"""
+
+import argparse
+import os
+import random
+import time
+import uuid
+from datetime import date, datetime, timedelta, timezone
+
+if "BENCH_DATABASE_URL" in os.environ:
+    os.environ["DATABASE_URL"] = os.environ["BENCH_DATABASE_URL"]
+
+from sqlalchemy import insert
+
+from app.database import Base, SessionLocal, engine
+from app.models.models import (
+    AttendanceRecord, AttendanceSession, Class, Notice, Student, Subject, Teacher, TeacherClass, Test, TestResult, User,
+)
+from app.services.attendance import rebuild_attendance_rollups
+from app.services.hashing import BULK_IMPORT, get_profile
+from app.services.table_versions import bump_table_versions
+
+SYNTHETIC_PASSWORD = "synthetic-password"
+ADMIN_EMAIL = "admin@synthetic.school"
+
+# Rows per INSERT statement
+CHUNK_SIZE = 5000
+
+SUBJECT_NAMES = ["Mathematics", "Science", "English", "Hindi", "Social Studies", "Computer Science",
+                 "Physics", "Chemistry", "Biology", "History", "Geography", "Art"]
+
+
+def _bulk_insert(conn, model, rows: list):
+    for start in range(0, len(rows), CHUNK_SIZE):
+        conn.execute(insert(model), rows[start:start + CHUNK_SIZE])
+
+
+def _school_days(count: int, end: date) -> list[date]:
+    days = []
+    day = end
+    while len(days) < count:
+        if day.weekday() < 5:
+            days.append(day)
+        day -= timedelta(days=1)
+    return sorted(days)
+
+
+def generate_school(classes: int = 40, students_per_class: int = 40, subjects: int = 6, teachers_per_subject: int = 4,
+                    days: int = 200, tests_per_subject: int = 3, notices: int = 200, absence_rate: float = 0.08,
+                    seed: int = 42) -> dict:
+    """
+    Write a synthetic school to the configured database and return the ids
+    a load test needs (see `benchmarks.load_test`) plus row counts.
+    """
+    rng = random.Random(seed)
+
+    def new_id():
+        return uuid.UUID(int=rng.getrandbits(128), version=4)
+
+    clock = datetime(2026, 1, 1, tzinfo=timezone.utc)
+
+    def created_at():
+        nonlocal clock
+        clock += timedelta(seconds=1)
+        return clock
+
+    password_hash = get_profile(BULK_IMPORT).hash(SYNTHETIC_PASSWORD)
+
+    def user(full_name, email, role):
+        return {'id': new_id(), 'full_name': full_name, 'email': email, 'password_hash': password_hash,
+                'role': role, 'created_at': created_at()}
+
+    admin = user("Synthetic Admin", ADMIN_EMAIL, 'admin')
+    users = [admin]
+
+    subject_rows = []
+    for i in range(subjects):
+        name = SUBJECT_NAMES[i % len(SUBJECT_NAMES)]
+        if i >= len(SUBJECT_NAMES):
+            name += f" {i // len(SUBJECT_NAMES) + 1}"
+        subject_rows.append({'id': new_id(), 'name': name})
+    class_rows = [{'id': new_id(), 'standard': i % 12 + 1, 'section': chr(ord('A') + i // 12), 'created_at': created_at()}
+                  for i in range(classes)]
+
+    # teachers[subject index] -> Teacher rows of that subject
+    teacher_rows = []
+    teachers_by_subject = []
+    for s, subject in enumerate(subject_rows):
+        subject_teachers = []
+        for t in range(teachers_per_subject):
+            number = s * teachers_per_subject + t + 1
+            teacher_user = user(f"Teacher {number}", f"teacher{number}@synthetic.school", 'teacher')
+            users.append(teacher_user)
+            subject_teachers.append({'id': new_id(), 'user_id': teacher_user['id'], 'subject_id': subject['id']})
+        teacher_rows.extend(subject_teachers)
+        teachers_by_subject.append(subject_teachers)
+
+    teacher_class_rows = []
+    # class id -> (subject index -> teacher row)
+    class_teachers = {}
+    for c, class_ in enumerate(class_rows):
+        class_teachers[class_['id']] = {}
+        for s, subject_teachers in enumerate(teachers_by_subject):
+            teacher = subject_teachers[c % len(subject_teachers)]
+            class_teachers[class_['id']][s] = teacher
+            teacher_class_rows.append({'id': new_id(), 'teacher_id': teacher['id'], 'class_id': class_['id'],
+                                       'is_class_teacher': s == 0})
+
+    student_rows = []
+    for c, class_ in enumerate(class_rows):
+        for roll_number in range(1, students_per_class + 1):
+            number = c * students_per_class + roll_number
+            student_user = user(f"Student {number}", f"student{number}@synthetic.school", 'student')
+            users.append(student_user)
+            student_rows.append({'id': new_id(), 'user_id': student_user['id'], 'class_id': class_['id'],
+                                 'roll_number': roll_number})
+
+    students_by_class = {}
+    for student in student_rows:
+        students_by_class.setdefault(student['class_id'], []).append(student)
+
+    started_at = time.perf_counter()
+    counts = {}
+    with engine.begin() as conn:
+        for model, rows in ((User, users), (Subject, subject_rows), (Class, class_rows), (Teacher, teacher_rows),
+                            (TeacherClass, teacher_class_rows), (Student, student_rows)):
+            _bulk_insert(conn, model, rows)
+            counts[model.__tablename__] = len(rows)
+
+        # Attendance is generated and written one day at a time to keep memory flat
+        school_days = _school_days(days, date.today())
+        counts['attendance_sessions'] = counts['attendance_records'] = 0
+        for day in school_days:
+            sessions, records = [], []
+            for class_ in class_rows:
+                session = {'id': new_id(), 'class_id': class_['id'], 'teacher_id': class_teachers[class_['id']][0]['id'], 'date': day}
+                sessions.append(session)
+                records.extend({'id': new_id(), 'session_id': session['id'], 'student_id': student['id'],
+                                'status': 'absent' if rng.random() < absence_rate else 'present'}
+                               for student in students_by_class.get(class_['id'], ()))
+            _bulk_insert(conn, AttendanceSession, sessions)
+            _bulk_insert(conn, AttendanceRecord, records)
+            counts['attendance_sessions'] += len(sessions)
+            counts['attendance_records'] += len(records)
+
+        test_rows, result_rows = [], []
+        for class_ in class_rows:
+            for s, subject in enumerate(subject_rows):
+                for n in range(tests_per_subject):
+                    total_marks = rng.choice((20, 50, 100))
+                    test = {'id': new_id(), 'class_id': class_['id'], 'subject_id': subject['id'],
+                            'teacher_id': class_teachers[class_['id']][s]['id'], 'title': f"{subject['name']} unit {n + 1}",
+                            'total_marks': total_marks, 'test_date': school_days[(n + 1) * len(school_days) // (tests_per_subject + 1)] if school_days else date.today()}
+                    test_rows.append(test)
+                    result_rows.extend({'id': new_id(), 'test_id': test['id'], 'student_id': student['id'],
+                                        'marks_obtained': min(total_marks, max(0, round(rng.gauss(0.7, 0.15) * total_marks)))}
+                                       for student in students_by_class.get(class_['id'], ()))
+        _bulk_insert(conn, Test, test_rows)
+        _bulk_insert(conn, TestResult, result_rows)
+        counts['tests'] = len(test_rows)
+        counts['test_results'] = len(result_rows)
+
+        notice_rows = []
+        for n in range(notices):
+            target = n % 3
+            class_ = rng.choice(class_rows) if class_rows else None
+            notice_rows.append({
+                'id': new_id(), 'title': f"Notice {n + 1}", 'description': f"Synthetic notice number {n + 1}.",
+                'created_by': admin['id'], 'created_at': created_at(),
+                'class_id': class_['id'] if target == 2 and class_ else None,
+                'standard': rng.randint(1, 12) if target == 1 else None,
+            })
+        _bulk_insert(conn, Notice, notice_rows)
+        counts['notices'] = len(notice_rows)
+
+    db = SessionLocal()
+    try:
+        rebuild_attendance_rollups(db)
+        bump_table_versions(db, 'subjects', 'classes', 'teachers', 'teacher_classes', 'users')
+        db.commit()
+    finally:
+        db.close()
+
+    first_class = class_rows[0]['id'] if class_rows else None
+    class_teacher = class_teachers[first_class][0] if first_class and subject_rows else None
+    return {
+        'seed': seed,
+        'seconds': round(time.perf_counter() - started_at, 2),
+        'counts': counts,
+        'admin_email': ADMIN_EMAIL,
+        'password': SYNTHETIC_PASSWORD,
+        'class_id': str(first_class) if first_class else None,
+        'class_teacher_email': next((u['email'] for u in users if class_teacher and u['id'] == class_teacher['user_id']), None),
+        'student_id': str(student_rows[0]['id']) if student_rows else None,
+        'student_email': next((u['email'] for u in users if student_rows and u['id'] == student_rows[0]['user_id']), None),
+        'test_id': str(test_rows[0]['id']) if test_rows else None,
+        'roll_numbers': students_per_class,
+    }
+
+
+def add_arguments(parser: argparse.ArgumentParser):
+    parser.add_argument("--classes", type=int, default=40)
+    parser.add_argument("--students-per-class", type=int, default=40)
+    parser.add_argument("--subjects", type=int, default=6)
+    parser.add_argument("--teachers-per-subject", type=int, default=4)
+    parser.add_argument("--days", type=int, default=200, help="school days of attendance")
+    parser.add_argument("--tests-per-subject", type=int, default=3)
+    parser.add_argument("--notices", type=int, default=200)
+    parser.add_argument("--seed", type=int, default=42)
+
+
+def generate_from_arguments(args) -> dict:
+    return generate_school(classes=args.classes, students_per_class=args.students_per_class, subjects=args.subjects,
+                           teachers_per_subject=args.teachers_per_subject, days=args.days,
+                           tests_per_subject=args.tests_per_subject, notices=args.notices, seed=args.seed)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    add_arguments(parser)
+    args = parser.parse_args()
+
+    Base.metadata.create_all(bind=engine)
+    summary = generate_from_arguments(args)
+    print(f"Generated in {summary['seconds']}s:")
+    for table, count in summary['counts'].items():
+        print(f"  {table:<22} {count:>10}")
+    print(f"Log in as {summary['admin_email']} / {summary['password']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -3,16 +3,21 @@ Database manager for School Management System.
 Provides utilities for database initialization, seeding, and management.
 """
 
-from sqlalchemy import text
 from app.database import engine, SessionLocal, Base
 from app.models.models import (
     User, Class, Subject, Teacher, Student, TeacherClass, 
     Notice, AttendanceSession, AttendanceRecord, Test, TestResult,
-    UserRole
+    AttendanceStudentMonthly, AttendanceClassDaily, UserRole
 )
+from app.services.hashing import get_profile, BULK_IMPORT
+from app.services.table_versions import bump_table_versions
+import os
+import secrets
 import uuid
 from datetime import datetime
 
+ALEMBIC_INI = os.path.join(os.path.dirname(os.path.abspath(__file__)), "alembic.ini")
+
 class DatabaseManager:
     def __init__(self):
         self.engine = engine
@@ -22,9 +27,57 @@ class DatabaseManager:
         """Create all database tables."""
         print("Creating database tables...")
         Base.metadata.create_all(bind=self.engine)
+        # The tables match the latest migration, so later `migrate` runs start from here
+        self.stamp("head")
         print("✅ Database tables created successfully!")
         self._print_table_info()
 
+    def _alembic_config(self):
+        from alembic.config import Config
+        return Config(ALEMBIC_INI)
+
+    def migrate(self, revision="head", explain=False):
+        """Apply schema migrations up to `revision`, optionally showing query plans before and after."""
+        from alembic import command
+        if explain:
+            self.explain_hot_queries("before migrating")
+        print(f"🔄 Migrating database to {revision}...")
+        command.upgrade(self._alembic_config(), revision)
+        print("✅ Migrations applied.")
+        if explain:
+            self.explain_hot_queries("after migrating")
+
+    def downgrade(self, revision):
+        """Revert schema migrations down to `revision`."""
+        from alembic import command
+        command.downgrade(self._alembic_config(), revision)
+
+    def stamp(self, revision="head"):
+        """Record `revision` as applied without running it (for databases created with create_all)."""
+        from alembic import command
+        command.stamp(self._alembic_config(), revision)
+
+    def explain_hot_queries(self, label="current schema"):
+        """Print the query plan of the hot lookups, to check they use indexes."""
+        from app.services.query_plans import explain, hot_queries
+        print(f"\n🔎 Query plans ({label}):")
+        with self.engine.connect() as conn:
+            for name, statement in hot_queries().items():
+                print(f"  • {name}")
+                for line in explain(conn, statement):
+                    print(f"      {line}")
+
+    def write_openapi_schema(self, path=None):
+        """Write the OpenAPI schema to `path` (default OPENAPI_SCHEMA_FILE), to be served without generating it."""
+        import json
+        from fastapi import FastAPI
+        from app.main import app, include_routers
+        path = path or os.getenv("OPENAPI_SCHEMA_FILE") or "openapi.json"
+        include_routers()
+        with open(path, "w") as f:
+            json.dump(FastAPI.openapi(app), f)
+        print(f"✅ OpenAPI schema written to {path}")
+
     def drop_tables(self):
         """Drop all database tables. Use with caution!"""
         print("⚠️  Dropping all database tables...")
@@ -39,15 +92,16 @@ class DatabaseManager:
         print("✅ Database reset complete.")
 
     def check_connection(self):
-        """Test database connection."""
-        try:
-            with self.engine.connect() as conn:
-                result = conn.execute(text("SELECT 1"))
-                print("✅ Database connection successful!")
-                return True
-        except Exception as e:
-            print(f"❌ Database connection failed: {e}")
-            return False
+        """Test database connection (the same probe as GET /health/db)."""
+        from app.services.db_health import probe
+        result = probe(self.engine)
+        if result['ok']:
+            print(f"✅ Database connection successful! ({result['profile']} pool, "
+                  f"checkout {result['checkout_ms']} ms, SELECT 1 {result['query_ms']} ms)")
+            return True
+        # probe logged the exception (to stderr when logging is not configured)
+        print("❌ Database connection failed, see the logged error.")
+        return False
 
     def _print_table_info(self):
         """Print information about created tables."""
@@ -116,18 +170,31 @@ class DatabaseManager:
             # Create admin user
             existing_admin = db.query(User).filter(User.role == UserRole.admin).first()
             if not existing_admin:
+                # Never a well-known default: without SEED_ADMIN_PASSWORD a random
+                # one is generated and shown once below
+                admin_password = os.getenv("SEED_ADMIN_PASSWORD")
+                generated = not admin_password
+                if generated:
+                    admin_password = secrets.token_urlsafe(16)
+                # Cheap bulk-import hash, upgraded to the interactive profile on first login
                 admin_user = User(
                     id=uuid.uuid4(),
                     full_name="System Administrator",
                     email="admin@school.com",
-                    password_hash="$2b$12$placeholder_hash",  # In real app, hash the password
+                    password_hash=get_profile(BULK_IMPORT).hash(admin_password),
                     role=UserRole.admin
                 )
                 db.add(admin_user)
-                print("  ✅ Created admin user (email: admin@school.com)")
+                if generated:
+                    print(f"  ✅ Created admin user (email: admin@school.com, generated password: {admin_password})")
+                    print("     It is not stored anywhere else; note it now or set SEED_ADMIN_PASSWORD before seeding")
+                else:
+                    print("  ✅ Created admin user (email: admin@school.com, password from SEED_ADMIN_PASSWORD)")
             else:
                 print("  ℹ️  Admin user already exists")
 
+            # Invalidate ETags handed out for the reference-data listings
+            bump_table_versions(db, 'subjects', 'classes')
             db.commit()
             print("✅ Basic data seeding completed!")
             
@@ -138,6 +205,21 @@ class DatabaseManager:
         finally:
             db.close()
 
+    def rebuild_rollups(self):
+        """Recompute the attendance rollup tables from attendance_records."""
+        from app.services.attendance import rebuild_attendance_rollups
+        print("🔄 Rebuilding attendance rollups...")
+        db = self.SessionLocal()
+        try:
+            rebuild_attendance_rollups(db)
+            print("✅ Attendance rollups rebuilt.")
+        except Exception as e:
+            db.rollback()
+            print(f"❌ Error rebuilding rollups: {e}")
+            raise
+        finally:
+            db.close()
+
     def get_table_counts(self):
         """Get record counts for all tables."""
         db = self.SessionLocal()
@@ -152,6 +234,8 @@ class DatabaseManager:
                 'notices': Notice,
                 'attendance_sessions': AttendanceSession,
                 'attendance_records': AttendanceRecord,
+                'attendance_student_monthly': AttendanceStudentMonthly,
+                'attendance_class_daily': AttendanceClassDaily,
                 'tests': Test,
                 'test_results': TestResult
             }
@@ -183,6 +267,12 @@ def main():
         print("  check     - Check database connection")
         print("  counts    - Show record counts")
         print("  init      - Create tables and seed basic data")
+        print("  rollups   - Rebuild attendance rollup tables")
+        print("  migrate   - Apply migrations up to head (or a given revision); --explain shows plans before/after")
+        print("  downgrade - Revert migrations down to a given revision")
+        print("  stamp     - Mark a revision as applied without running it (e.g. stamp 0001)")
+        print("  explain   - Show query plans of the hot lookups")
+        print("  openapi   - Write the OpenAPI schema to a file (default OPENAPI_SCHEMA_FILE), e.g. openapi api/openapi.json")
         return
     
     command = sys.argv[1].lower()
@@ -199,6 +289,22 @@ def main():
         db_manager.check_connection()
     elif command == "counts":
         db_manager.get_table_counts()
+    elif command == "migrate":
+        args = [arg for arg in sys.argv[2:] if arg != "--explain"]
+        db_manager.migrate(args[0] if args else "head", explain="--explain" in sys.argv)
+    elif command == "downgrade":
+        if len(sys.argv) < 3:
+            print("Usage: python db_manager.py downgrade <revision>")
+            return
+        db_manager.downgrade(sys.argv[2])
+    elif command == "stamp":
+        db_manager.stamp(sys.argv[2] if len(sys.argv) > 2 else "head")
+    elif command == "explain":
+        db_manager.explain_hot_queries()
+    elif command == "openapi":
+        db_manager.write_openapi_schema(sys.argv[2] if len(sys.argv) > 2 else None)
+    elif command == "rollups":
+        db_manager.rebuild_rollups()
     elif command == "init":
         if db_manager.check_connection():
             db_manager.create_tables()
@@ -0,0 +1,119 @@
+"""baseline schema
+
+The tables as originally created by `python db_manager.py create`. Databases
+built that way before migrations existed should be marked with
+`python db_manager.py stamp 0001` and then upgraded.
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-18 00:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = '0001'
+down_revision: Union[str, Sequence[str], None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Same type as the models: native uuid on PostgreSQL, CHAR(32) elsewhere
+UUID = sa.Uuid()
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'users',
+        sa.Column('id', UUID, primary_key=True),
+        sa.Column('full_name', sa.String(), nullable=False),
+        sa.Column('email', sa.String(), nullable=False, unique=True),
+        sa.Column('password_hash', sa.String(), nullable=False),
+        sa.Column('role', sa.Enum('admin', 'teacher', 'student', name='userrole'), nullable=False),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now()),
+    )
+    op.create_table(
+        'classes',
+        sa.Column('id', UUID, primary_key=True),
+        sa.Column('standard', sa.Integer(), nullable=False),
+        sa.Column('section', sa.String(), nullable=False),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now()),
+    )
+    op.create_table(
+        'subjects',
+        sa.Column('id', UUID, primary_key=True),
+        sa.Column('name', sa.String(), nullable=False),
+    )
+    op.create_table(
+        'teachers',
+        sa.Column('id', UUID, primary_key=True),
+        sa.Column('user_id', UUID, sa.ForeignKey('users.id'), nullable=False),
+        sa.Column('subject_id', UUID, sa.ForeignKey('subjects.id'), nullable=False),
+    )
+    op.create_table(
+        'students',
+        sa.Column('id', UUID, primary_key=True),
+        sa.Column('user_id', UUID, sa.ForeignKey('users.id'), nullable=False),
+        sa.Column('class_id', UUID, sa.ForeignKey('classes.id'), nullable=False),
+        sa.Column('roll_number', sa.Integer(), nullable=False),
+    )
+    op.create_table(
+        'teacher_classes',
+        sa.Column('id', UUID, primary_key=True),
+        sa.Column('teacher_id', UUID, sa.ForeignKey('teachers.id'), nullable=False),
+        sa.Column('class_id', UUID, sa.ForeignKey('classes.id'), nullable=False),
+        sa.Column('is_class_teacher', sa.Boolean()),
+    )
+    op.create_table(
+        'notices',
+        sa.Column('id', UUID, primary_key=True),
+        sa.Column('title', sa.String(), nullable=False),
+        sa.Column('description', sa.Text(), nullable=False),
+        sa.Column('created_by', UUID, sa.ForeignKey('users.id'), nullable=False),
+        sa.Column('class_id', UUID, sa.ForeignKey('classes.id'), nullable=True),
+        sa.Column('standard', sa.Integer(), nullable=True),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now()),
+    )
+    op.create_table(
+        'attendance_sessions',
+        sa.Column('id', UUID, primary_key=True),
+        sa.Column('class_id', UUID, sa.ForeignKey('classes.id'), nullable=False),
+        sa.Column('teacher_id', UUID, sa.ForeignKey('teachers.id'), nullable=False),
+        sa.Column('date', sa.Date(), nullable=False),
+    )
+    op.create_table(
+        'attendance_records',
+        sa.Column('id', UUID, primary_key=True),
+        sa.Column('session_id', UUID, sa.ForeignKey('attendance_sessions.id'), nullable=False),
+        sa.Column('student_id', UUID, sa.ForeignKey('students.id'), nullable=False),
+        sa.Column('status', sa.Enum('present', 'absent', name='attendancestatus'), nullable=False),
+    )
+    op.create_table(
+        'tests',
+        sa.Column('id', UUID, primary_key=True),
+        sa.Column('class_id', UUID, sa.ForeignKey('classes.id'), nullable=False),
+        sa.Column('subject_id', UUID, sa.ForeignKey('subjects.id'), nullable=False),
+        sa.Column('teacher_id', UUID, sa.ForeignKey('teachers.id'), nullable=False),
+        sa.Column('title', sa.String(), nullable=False),
+        sa.Column('total_marks', sa.Integer(), nullable=False),
+        sa.Column('test_date', sa.Date(), nullable=False),
+    )
+    op.create_table(
+        'test_results',
+        sa.Column('id', UUID, primary_key=True),
+        sa.Column('test_id', UUID, sa.ForeignKey('tests.id'), nullable=False),
+        sa.Column('student_id', UUID, sa.ForeignKey('students.id'), nullable=False),
+        sa.Column('marks_obtained', sa.Integer(), nullable=False),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for table in ('test_results', 'tests', 'attendance_records', 'attendance_sessions', 'notices',
+                  'teacher_classes', 'students', 'teachers', 'subjects', 'classes', 'users'):
+        op.drop_table(table)
+    sa.Enum(name='attendancestatus').drop(op.get_bind(), checkfirst=True)
+    sa.Enum(name='userrole').drop(op.get_bind(), checkfirst=True)
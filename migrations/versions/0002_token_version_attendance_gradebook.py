@@ -0,0 +1,63 @@
+"""token version, attendance and gradebook constraints, attendance rollups
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-18 00:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = '0002'
+down_revision: Union[str, Sequence[str], None] = '0001'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Same type as the models: native uuid on PostgreSQL, CHAR(32) elsewhere
+UUID = sa.Uuid()
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    with op.batch_alter_table('users') as batch:
+        batch.add_column(sa.Column('token_version', sa.Integer(), nullable=False, server_default='0'))
+
+    with op.batch_alter_table('attendance_sessions') as batch:
+        batch.create_unique_constraint('uq_attendance_sessions_class_date', ['class_id', 'date'])
+    with op.batch_alter_table('attendance_records') as batch:
+        batch.create_unique_constraint('uq_attendance_records_session_student', ['session_id', 'student_id'])
+    with op.batch_alter_table('test_results') as batch:
+        batch.create_unique_constraint('uq_test_results_test_student', ['test_id', 'student_id'])
+
+    op.create_table(
+        'attendance_student_monthly',
+        sa.Column('student_id', UUID, sa.ForeignKey('students.id'), primary_key=True),
+        sa.Column('month', sa.Date(), primary_key=True),
+        sa.Column('present_count', sa.Integer(), nullable=False),
+        sa.Column('absent_count', sa.Integer(), nullable=False),
+    )
+    op.create_table(
+        'attendance_class_daily',
+        sa.Column('class_id', UUID, sa.ForeignKey('classes.id'), primary_key=True),
+        sa.Column('date', sa.Date(), primary_key=True),
+        sa.Column('present_count', sa.Integer(), nullable=False),
+        sa.Column('absent_count', sa.Integer(), nullable=False),
+    )
+    # Existing attendance, if any, is folded in with `python db_manager.py rollups`
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('attendance_class_daily')
+    op.drop_table('attendance_student_monthly')
+    with op.batch_alter_table('test_results') as batch:
+        batch.drop_constraint('uq_test_results_test_student', type_='unique')
+    with op.batch_alter_table('attendance_records') as batch:
+        batch.drop_constraint('uq_attendance_records_session_student', type_='unique')
+    with op.batch_alter_table('attendance_sessions') as batch:
+        batch.drop_constraint('uq_attendance_sessions_class_date', type_='unique')
+    with op.batch_alter_table('users') as batch:
+        batch.drop_column('token_version')
@@ -0,0 +1,70 @@
+"""indexes for foreign keys and lookup predicates, uniqueness constraints
+
+Adds the functional index on lower(email) used by login/register, keyset
+indexes for the admin listings, and unique constraints that the create and
+assign services now rely on instead of check-then-insert.
+
+Fails if existing rows already violate one of the unique constraints
+(duplicate emails differing only in case, duplicate classes, repeated
+assignments); clean those up first.
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-18 00:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = '0003'
+down_revision: Union[str, Sequence[str], None] = '0002'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+UNIQUE_CONSTRAINTS = [
+    ('classes', 'uq_classes_standard_section', ['standard', 'section']),
+    ('teachers', 'uq_teachers_user_subject', ['user_id', 'subject_id']),
+    ('students', 'uq_students_user_id', ['user_id']),
+    ('teacher_classes', 'uq_teacher_classes_teacher_class', ['teacher_id', 'class_id']),
+]
+
+INDEXES = [
+    ('users', 'ix_users_created_at_id', ['created_at', 'id'], {}),
+    ('users', 'ix_users_role_created_at_id', ['role', 'created_at', 'id'], {}),
+    ('classes', 'ix_classes_created_at_id', ['created_at', 'id'], {}),
+    ('subjects', 'ix_subjects_name_id', ['name', 'id'], {}),
+    ('teachers', 'ix_teachers_subject_id', ['subject_id'], {}),
+    ('students', 'ix_students_class_id_roll_number', ['class_id', 'roll_number'], {'postgresql_include': ['id']}),
+    ('teacher_classes', 'ix_teacher_classes_class_id', ['class_id'], {}),
+    ('notices', 'ix_notices_created_at_id', ['created_at', 'id'], {}),
+    ('notices', 'ix_notices_created_by', ['created_by'], {}),
+    ('attendance_sessions', 'ix_attendance_sessions_teacher_id', ['teacher_id'], {}),
+    ('attendance_records', 'ix_attendance_records_student_id', ['student_id'], {}),
+    ('tests', 'ix_tests_class_id_test_date', ['class_id', 'test_date'], {}),
+    ('tests', 'ix_tests_subject_id', ['subject_id'], {}),
+    ('tests', 'ix_tests_teacher_id', ['teacher_id'], {}),
+    ('test_results', 'ix_test_results_student_id', ['student_id'], {}),
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('ix_users_email_lower', 'users', [sa.text('lower(email)')], unique=True)
+    for table, name, columns, kwargs in INDEXES:
+        op.create_index(name, table, columns, **kwargs)
+    for table, name, columns in UNIQUE_CONSTRAINTS:
+        with op.batch_alter_table(table) as batch:
+            batch.create_unique_constraint(name, columns)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for table, name, _ in reversed(UNIQUE_CONSTRAINTS):
+        with op.batch_alter_table(table) as batch:
+            batch.drop_constraint(name, type_='unique')
+    for table, name, _, _ in reversed(INDEXES):
+        op.drop_index(name, table_name=table)
+    op.drop_index('ix_users_email_lower', table_name='users')
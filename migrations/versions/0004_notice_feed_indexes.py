@@ -0,0 +1,31 @@
+"""notice feed indexes
+
+Composite indexes behind GET /notices/feed, which reads the newest notices
+of each class and standard a user belongs to.
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-18 00:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = '0004'
+down_revision: Union[str, Sequence[str], None] = '0003'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('ix_notices_class_id_created_at', 'notices', ['class_id', 'created_at', 'id'])
+    op.create_index('ix_notices_standard_created_at', 'notices', ['standard', 'created_at', 'id'])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_notices_standard_created_at', table_name='notices')
+    op.drop_index('ix_notices_class_id_created_at', table_name='notices')
@@ -0,0 +1,41 @@
+"""search indexes
+
+GIN indexes on the tsvector expressions GET /search matches users and
+notices with (app.models.models.user_search_vector / notice_search_vector).
+PostgreSQL only; on SQLite the search uses an in-process index.
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2026-10-18 00:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = '0006'
+down_revision: Union[str, Sequence[str], None] = '0005'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+USERS_SEARCH = "to_tsvector('simple'::regconfig, full_name || ' ' || translate(email, '@._-', '    '))"
+NOTICES_SEARCH = ("(setweight(to_tsvector('english'::regconfig, title), 'A') || "
+                  "setweight(to_tsvector('english'::regconfig, description), 'B'))")
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+    op.create_index('ix_users_search', 'users', [sa.text(USERS_SEARCH)], postgresql_using='gin')
+    op.create_index('ix_notices_search', 'notices', [sa.text(NOTICES_SEARCH)], postgresql_using='gin')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+    op.drop_index('ix_notices_search', table_name='notices')
+    op.drop_index('ix_users_search', table_name='users')
@@ -0,0 +1,39 @@
+"""created_at precision on SQLite
+
+created_at is now set client-side (app.models.models.utcnow). On SQLite,
+rows written by the CURRENT_TIMESTAMP server default hold
+'YYYY-MM-DD HH:MM:SS' while bound datetimes are 'YYYY-MM-DD HH:MM:SS.ffffff',
+so text comparison of keyset cursors skipped rows; pad the existing values.
+Nothing to do on PostgreSQL, where the column is a real timestamp.
+
+Revision ID: 0007
+Revises: 0006
+Create Date: 2026-10-18 00:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = '0007'
+down_revision: Union[str, Sequence[str], None] = '0006'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+TABLES = ('users', 'classes', 'notices')
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    if op.get_bind().dialect.name != 'sqlite':
+        return
+    for table in TABLES:
+        op.execute(sa.text(f"UPDATE {table} SET created_at = created_at || '.000000' WHERE length(created_at) = 19"))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    # The padded values compare correctly either way
+    pass
@@ -0,0 +1,43 @@
+"""notice search with the 'simple' config
+
+Rebuilds ix_notices_search over 'simple' tsvectors instead of 'english'
+(app.models.models.notice_search_vector). Typeahead sends partial words
+as prefix queries, and English stemming of the stored words made many
+of them miss. PostgreSQL only.
+
+Revision ID: 0008
+Revises: 0007
+Create Date: 2026-10-18 00:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = '0008'
+down_revision: Union[str, Sequence[str], None] = '0007'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def notices_search(config: str) -> str:
+    return (f"(setweight(to_tsvector('{config}'::regconfig, title), 'A') || "
+            f"setweight(to_tsvector('{config}'::regconfig, description), 'B'))")
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+    op.drop_index('ix_notices_search', table_name='notices')
+    op.create_index('ix_notices_search', 'notices', [sa.text(notices_search('simple'))], postgresql_using='gin')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+    op.drop_index('ix_notices_search', table_name='notices')
+    op.create_index('ix_notices_search', 'notices', [sa.text(notices_search('english'))], postgresql_using='gin')
@@ -0,0 +1,102 @@
+import os
+import tempfile
+import uuid
+
+# Configure before anything under app/ is imported: a throwaway SQLite file
+# and cheap hashing parameters
+os.environ["DATABASE_URL"] = "sqlite:///" + os.path.join(tempfile.mkdtemp(), "test.db")
+os.environ.setdefault("SECRET_KEY", "test-secret-key-for-the-pytest-suite-only")
+os.environ.setdefault("ALGORITHM", "HS256")
+os.environ.setdefault("ACCESS_TOKEN_EXPIRE_MINUTES", "30")
+os.environ["DATABASE_ASYNC"] = "false"
+os.environ["DB_POOL_PROFILE"] = "server"
+os.environ["LAZY_ROUTERS"] = "false"
+os.environ.setdefault("ARGON2_TIME_COST", "1")
+os.environ.setdefault("ARGON2_MEMORY_COST", "8192")
+
+import pytest
+from fastapi.testclient import TestClient
+from starlette.requests import Request
+
+from app.database import Base, SessionLocal, get_engine
+from app.main import app
+from app.models.models import User, UserRole
+from app.services.auth import get_principal
+from app.services.hashing import BULK_IMPORT, get_profile
+
+PASSWORD = "test-password"
+
+
+@pytest.fixture(scope="session", autouse=True)
+def database():
+    engine = get_engine()
+    Base.metadata.create_all(bind=engine)
+    yield engine
+    Base.metadata.drop_all(bind=engine)
+
+
+@pytest.fixture
+def db():
+    session = SessionLocal()
+    try:
+        yield session
+    finally:
+        session.close()
+
+
+@pytest.fixture(scope="session")
+def client():
+    with TestClient(app) as client:
+        yield client
+
+
+def unique_email(prefix: str = "user") -> str:
+    return f"{prefix}-{uuid.uuid4().hex[:12]}@example.com"
+
+
+def create_user(role: UserRole = UserRole.admin, full_name: str = "Test User", email: str = None) -> User:
+    db = SessionLocal()
+    try:
+        user = User(full_name=full_name, email=email or unique_email(role.value), role=role,
+                    password_hash=get_profile(BULK_IMPORT).hash(PASSWORD))
+        db.add(user)
+        db.commit()
+        db.refresh(user)
+        db.expunge(user)
+        return user
+    finally:
+        db.close()
+
+
+def auth_headers(client: TestClient, user: User) -> dict:
+    response = client.post('/auth/login', json={'email': user.email, 'password': PASSWORD})
+    assert response.status_code == 200, response.text
+    return {'Authorization': 'Bearer ' + response.json()['token']}
+
+
+@pytest.fixture(scope="session")
+def admin(database):
+    return create_user(UserRole.admin, full_name="Test Admin")
+
+
+@pytest.fixture(scope="session")
+def admin_headers(client, admin):
+    return auth_headers(client, admin)
+
+
+def service_request(headers: dict) -> Request:
+    """A Request carrying `headers`, for calling services directly; its principal is cached first."""
+    raw_headers = [(name.lower().encode(), value.encode()) for name, value in headers.items()]
+    request = Request({'type': 'http', 'method': 'GET', 'path': '/', 'headers': raw_headers, 'query_string': b''})
+    # Warm the principal cache, so require_roles issues no SELECT of its own
+    db = SessionLocal()
+    try:
+        get_principal(request, db)
+    finally:
+        db.close()
+    return request
+
+
+@pytest.fixture
+def admin_request(admin_headers):
+    return service_request(admin_headers)
@@ -0,0 +1,14 @@
+from conftest import PASSWORD, create_user
+from app.models.models import UserRole
+from app.schemas.Users import UserLogin
+from app.services import auth
+
+
+def test_login_does_not_write_the_credentials(db, capsys):
+    user = create_user(UserRole.student)
+
+    result = auth.login(UserLogin(email=user.email, password=PASSWORD), db=db)
+
+    assert result['user']['id'] == user.id
+    captured = capsys.readouterr()
+    assert PASSWORD not in captured.out + captured.err
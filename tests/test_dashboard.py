@@ -0,0 +1,91 @@
+import threading
+import uuid
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import NullPool, QueuePool
+
+from conftest import auth_headers, create_user, service_request
+from app.database import SessionLocal
+from app.models.models import UserRole
+from app.schemas.Class import ClassCreate
+from app.schemas.Subject import SubjectCreate
+from app.schemas.Users import TeacherAssignClass, TeacherAssignSubject
+from app.services import admin as admin_services, dashboard
+
+
+def teacher_with_class(client, admin_request):
+    db = SessionLocal()
+    try:
+        teacher = create_user(UserRole.teacher)
+        subject = admin_services.create_subject(SubjectCreate(name=f"Subject {uuid.uuid4().hex[:8]}"), db=db, request=admin_request)
+        admin_services.assign_subjects_to_teachers([TeacherAssignSubject(teacher_id=teacher.id, subject_id=subject.id)], db=db, request=admin_request)
+        new_class = admin_services.create_class(ClassCreate(standard=200 + uuid.uuid4().int % 1000, section=uuid.uuid4().hex[:4]), db=db, request=admin_request)
+        admin_services.assign_classes_to_teachers([TeacherAssignClass(teacher_id=teacher.id, class_id=new_class.id)], db=db, request=admin_request)
+    finally:
+        db.close()
+    return service_request(auth_headers(client, teacher))
+
+
+def test_section_workers_leave_a_pooled_connection():
+    def pool(poolclass, **options):
+        return poolclass(creator=lambda: None, **options)
+
+    assert dashboard.section_workers(pool(QueuePool, pool_size=5), requested=4) == 4
+    assert dashboard.section_workers(pool(QueuePool, pool_size=3), requested=4) == 2
+    assert dashboard.section_workers(pool(QueuePool, pool_size=1), requested=4) == 0
+    assert dashboard.section_workers(pool(NullPool), requested=4) == 4
+
+
+def test_request_session_released_before_sections(client, admin_request, db, monkeypatch):
+    request = teacher_with_class(client, admin_request)
+    request_session_connected = []
+    in_own_session = dashboard._in_own_session
+
+    def recording(fn):
+        request_session_connected.append(db.in_transaction())
+        return in_own_session(fn)
+    monkeypatch.setattr(dashboard, "_in_own_session", recording)
+
+    result = dashboard.dashboard(db=db, request=request)
+
+    assert len(result['classes']) == 1
+    assert request_session_connected and not any(request_session_connected)
+
+
+def test_concurrent_dashboards_do_not_exhaust_a_small_pool(client, admin_request, database, monkeypatch):
+    # Two connections, one section worker: before the request sessions gave
+    # their connection back, two concurrent dashboards held both and their
+    # sections waited out the pool timeout
+    engine = create_engine(database.url, poolclass=QueuePool, pool_size=2, max_overflow=0, pool_timeout=2)
+    Session = sessionmaker(bind=engine, autoflush=False)
+    monkeypatch.setattr(dashboard, "SessionLocal", Session)
+    monkeypatch.setattr(dashboard, "get_engine", lambda: engine)
+    monkeypatch.setattr(dashboard, "_executors", {})
+    requests = [teacher_with_class(client, admin_request) for _ in range(6)]
+    barrier = threading.Barrier(len(requests))
+    errors = []
+
+    def load(request):
+        db = Session()
+        try:
+            barrier.wait()
+            dashboard.dashboard(db=db, request=request)
+        except Exception as e:
+            errors.append(e)
+        finally:
+            db.close()
+
+    threads = [threading.Thread(target=load, args=(request,)) for request in requests]
+    try:
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join(timeout=30)
+    finally:
+        if dashboard._executors.get('sections'):
+            dashboard._executors['sections'].shutdown()
+        engine.dispose()
+
+    assert errors == []
@@ -0,0 +1,52 @@
+import os
+import re
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.database import Base
+from app.models.models import User, UserRole
+from app.services.hashing import get_profile, INTERACTIVE
+from db_manager import DatabaseManager
+
+
+@pytest.fixture
+def manager(tmp_path):
+    # A fresh database, so seeding sees no existing admin
+    engine = create_engine("sqlite:///" + os.path.join(tmp_path, "seed.db"))
+    Base.metadata.create_all(bind=engine)
+    manager = DatabaseManager()
+    manager.engine = engine
+    manager.SessionLocal = sessionmaker(bind=engine)
+    yield manager
+    engine.dispose()
+
+
+def seeded_admin(manager) -> User:
+    db = manager.SessionLocal()
+    try:
+        return db.query(User).filter(User.role == UserRole.admin).one()
+    finally:
+        db.close()
+
+
+def test_seed_generates_admin_password_when_unset(manager, monkeypatch, capsys):
+    monkeypatch.delenv("SEED_ADMIN_PASSWORD", raising=False)
+    manager.seed_basic_data()
+
+    output = capsys.readouterr().out
+    password = re.search(r"generated password: (\S+)\)", output).group(1)
+    assert "from SEED_ADMIN_PASSWORD" not in output
+    assert get_profile(INTERACTIVE).verify(password, seeded_admin(manager).password_hash)
+    assert not get_profile(INTERACTIVE).verify("ChangeMe@123", seeded_admin(manager).password_hash)
+
+
+def test_seed_uses_seed_admin_password(manager, monkeypatch, capsys):
+    monkeypatch.setenv("SEED_ADMIN_PASSWORD", "from-the-environment")
+    manager.seed_basic_data()
+
+    output = capsys.readouterr().out
+    assert "password from SEED_ADMIN_PASSWORD" in output
+    assert "from-the-environment" not in output
+    assert get_profile(INTERACTIVE).verify("from-the-environment", seeded_admin(manager).password_hash)
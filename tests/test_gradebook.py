@@ -0,0 +1,46 @@
+import uuid
+from datetime import date
+
+from conftest import auth_headers, create_user, service_request
+from app.database import SessionLocal
+from app.models.models import UserRole
+from app.schemas.Class import ClassCreate
+from app.schemas import Gradebook as gradebook_schemas
+from app.schemas.Subject import SubjectCreate
+from app.schemas.Users import StudentAssignClass, TeacherAssignClass, TeacherAssignSubject
+from app.services import admin as admin_services, gradebook
+
+
+def test_missed_test_counts_as_zero(client, admin_request, db):
+    teacher = create_user(UserRole.teacher)
+    subject = admin_services.create_subject(SubjectCreate(name=f"Subject {uuid.uuid4().hex[:8]}"), db=db, request=admin_request)
+    admin_services.assign_subjects_to_teachers([TeacherAssignSubject(teacher_id=teacher.id, subject_id=subject.id)], db=db, request=admin_request)
+    new_class = admin_services.create_class(ClassCreate(standard=300 + uuid.uuid4().int % 1000, section=uuid.uuid4().hex[:4]), db=db, request=admin_request)
+    admin_services.assign_classes_to_teachers([TeacherAssignClass(teacher_id=teacher.id, class_id=new_class.id)], db=db, request=admin_request)
+    students = [create_user(UserRole.student) for _ in range(2)]
+    admin_services.assign_classes_to_students([
+        StudentAssignClass(student_id=student.id, class_id=new_class.id, roll_number=roll_number)
+        for roll_number, student in enumerate(students, start=1)
+    ], db=db, request=admin_request)
+
+    teacher_request = service_request(auth_headers(client, teacher))
+    tests = [
+        gradebook.create_test(gradebook_schemas.TestCreate(class_id=new_class.id, subject_id=subject.id, title=title, total_marks=100,
+                                         test_date=date(2026, 1, day)), db=db, request=teacher_request)
+        for day, title in ((10, "Unit 1"), (20, "Unit 2"))
+    ]
+    # Roll 1 scores 90 in the first test and misses the second; roll 2 scores 80 in both
+    def marks(*entries):
+        return gradebook_schemas.TestMarks(marks=[gradebook_schemas.MarksEntry(roll_number=roll, marks_obtained=obtained)
+                                                  for roll, obtained in entries])
+    gradebook.enter_marks(tests[0].id, marks((1, 90), (2, 80)), db=db, request=teacher_request)
+    gradebook.enter_marks(tests[1].id, marks((2, 80)), db=db, request=teacher_request)
+
+    result = gradebook.class_gradebook(new_class.id, db=db, request=teacher_request)
+
+    by_roll = {student['roll_number']: student for student in result['students']}
+    assert (by_roll[1]['obtained'], by_roll[1]['total'], by_roll[1]['missed'], by_roll[1]['percentage']) == (90, 200, 1, 45.0)
+    assert (by_roll[2]['obtained'], by_roll[2]['total'], by_roll[2]['missed'], by_roll[2]['percentage']) == (160, 200, 0, 80.0)
+    assert (by_roll[2]['rank'], by_roll[1]['rank']) == (1, 2)
+    assert [(s['total'], s['missed']) for s in by_roll[1]['subjects']] == [(200, 1)]
+    assert result['class_average'] == 62.5
@@ -0,0 +1,37 @@
+import logging
+import os
+
+from sqlalchemy import create_engine
+
+from app.services.db_health import probe
+
+
+def test_public_health_hides_pool_details(client):
+    response = client.get('/health/db')
+
+    assert response.status_code == 200
+    assert response.json() == {'ok': True}
+
+
+def test_failed_probe_logs_the_error_and_reports_unavailable(tmp_path, caplog):
+    missing = os.path.join(tmp_path, "no-such-dir", "school.db")
+    engine = create_engine("sqlite:///" + missing)
+
+    with caplog.at_level(logging.WARNING, logger="app.services.db_health"):
+        result = probe(engine)
+
+    assert (result['ok'], result['error']) == (False, 'unavailable')
+    assert "no-such-dir" not in str(result)
+    assert "unable to open database file" in caplog.text
+
+
+def test_admin_db_health_has_the_pool(client, admin_headers):
+    response = client.get('/admin/db_health', headers=admin_headers)
+
+    assert response.status_code == 200
+    assert response.json()['ok'] is True
+    assert 'pool' in response.json()
+
+
+def test_admin_db_health_requires_admin(client):
+    assert client.get('/admin/db_health').status_code == 401
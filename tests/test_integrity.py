@@ -0,0 +1,72 @@
+import asyncio
+
+import pytest
+from fastapi import HTTPException
+from sqlalchemy.exc import IntegrityError
+
+from conftest import PASSWORD, create_user, unique_email
+from app.models.models import User, UserRole
+from app.schemas.Users import UserCreate
+from app.services.integrity import is_unique_violation
+
+
+def test_sqlite_unique_index_violation(db):
+    email = create_user(UserRole.student).email
+    db.add(User(full_name="Duplicate", email=email.upper(), password_hash="x", role=UserRole.student))
+    with pytest.raises(IntegrityError) as raised:
+        db.flush()
+    db.rollback()
+
+    assert is_unique_violation(raised.value, 'ix_users_email_lower')
+    assert not is_unique_violation(raised.value, 'uq_classes_standard_section')
+
+
+class UniqueViolationError(Exception):
+    # Shaped like asyncpg.exceptions.UniqueViolationError
+    def __init__(self, constraint_name):
+        super().__init__("duplicate key value violates unique constraint")
+        self.constraint_name = constraint_name
+
+
+def test_asyncpg_unique_violation():
+    # SQLAlchemy's asyncpg adapter raises its own IntegrityError from asyncpg's
+    adapted = Exception("<class 'asyncpg.exceptions.UniqueViolationError'>")
+    adapted.__cause__ = UniqueViolationError('ix_users_email_lower')
+    error = IntegrityError("INSERT INTO users ...", {}, adapted)
+
+    assert is_unique_violation(error, 'ix_users_email_lower')
+    assert not is_unique_violation(error, 'users_email_key')
+
+
+def test_async_register_maps_concurrent_duplicate_to_401(database, monkeypatch):
+    pytest.importorskip("aiosqlite")
+    from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+    from app.database import async_database_url
+    from app.services import async_auth
+
+    email = create_user(UserRole.student).email
+    # As if the other registration committed after this one's lookup
+    async def not_found(email, db):
+        return None
+    monkeypatch.setattr(async_auth, "_user_by_email", not_found)
+
+    async def register():
+        engine = create_async_engine(async_database_url(str(database.url)))
+        try:
+            async with async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)() as db:
+                await async_auth.register(UserCreate(full_name="Duplicate", email=email, password=PASSWORD, role="student"), db=db)
+        finally:
+            await engine.dispose()
+
+    with pytest.raises(HTTPException) as raised:
+        asyncio.run(register())
+    assert raised.value.status_code == 401
+    assert raised.value.detail == "Email Already Used"
+
+
+def test_register_duplicate_email_is_401(client, admin_headers):
+    body = {'full_name': "Twice", 'email': unique_email("student"), 'password': PASSWORD}
+    assert client.post('/admin/register_student', json=body, headers=admin_headers).status_code == 201
+
+    response = client.post('/admin/register_student', json={**body, 'email': body['email'].upper()}, headers=admin_headers)
+    assert response.status_code == 401
@@ -0,0 +1,29 @@
+import os
+import warnings
+
+from alembic import command
+from alembic.autogenerate import compare_metadata
+from alembic.config import Config
+from alembic.migration import MigrationContext
+from sqlalchemy import create_engine
+
+from app.database import Base
+from db_manager import ALEMBIC_INI
+
+
+def test_migrations_match_models(tmp_path):
+    engine = create_engine("sqlite:///" + os.path.join(tmp_path, "migrated.db"))
+    config = Config(ALEMBIC_INI)
+    try:
+        with engine.begin() as connection:
+            config.attributes["connection"] = connection
+            command.upgrade(config, "head")
+
+        with engine.connect() as connection, warnings.catch_warnings():
+            # SQLite cannot reflect expression indexes, so those are skipped either way
+            warnings.simplefilter("ignore")
+            diff = compare_metadata(MigrationContext.configure(connection), Base.metadata)
+    finally:
+        engine.dispose()
+
+    assert diff == []
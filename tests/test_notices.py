@@ -0,0 +1,26 @@
+def notice(admin, **target):
+    return {'title': "Notice", 'description': "Body", 'created_by': str(admin.id), 'class_id': None, 'standard': None, **target}
+
+
+def test_standard_zero_is_a_target(client, admin, admin_headers):
+    response = client.post('/admin/notice', json=notice(admin, title="Nursery", standard=0), headers=admin_headers)
+    assert response.status_code == 201, response.text
+    assert response.json()['standard'] == 0
+
+    listed = client.get('/admin/notice', params={'standard': 0}, headers=admin_headers).json()['items']
+    assert [item['title'] for item in listed] == ["Nursery"]
+
+
+def test_class_and_standard_zero_are_exclusive(client, admin, admin_headers):
+    class_id = client.post('/admin/create_class', json={'standard': 0, 'section': "N"}, headers=admin_headers)
+    assert class_id.status_code == 201
+    class_id = client.get('/admin/all_classes', params={'standard': 0, 'section': "N"}, headers=admin_headers).json()['items'][0]['id']
+
+    response = client.post('/admin/notice', json=notice(admin, class_id=class_id, standard=0), headers=admin_headers)
+    assert response.status_code == 400
+
+
+def test_school_wide_notice(client, admin, admin_headers):
+    response = client.post('/admin/notice', json=notice(admin, title="Everyone"), headers=admin_headers)
+    assert response.status_code == 201
+    assert response.json()['class_id'] is None and response.json()['standard'] is None
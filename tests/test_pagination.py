@@ -0,0 +1,61 @@
+import pytest
+
+from conftest import create_user
+from app.models.models import UserRole
+
+
+def walk(client, url: str, headers: dict, max_pages: int = 50, **params) -> list:
+    """Every item of a keyset-paginated listing, following next_cursor to the end."""
+    items, cursor = [], None
+    for _ in range(max_pages):
+        response = client.get(url, params={**params, **({'cursor': cursor} if cursor else {})}, headers=headers)
+        assert response.status_code == 200, response.text
+        page = response.json()
+        items += page['items']
+        cursor = page['next_cursor']
+        if cursor is None:
+            return items
+    pytest.fail(f"{url} did not reach its last page in {max_pages} pages")
+
+
+@pytest.mark.parametrize("limit", [1, 2, 4, 6, 10])
+def test_all_classes_walks_every_page(client, admin_headers, limit):
+    # Created within the same second, so only the id breaks the created_at ties
+    standard = 90 + limit
+    for section in "ABCDEF":
+        assert client.post('/admin/create_class', json={'standard': standard, 'section': section}, headers=admin_headers).status_code == 201
+
+    items = walk(client, '/admin/all_classes', admin_headers, limit=limit, standard=standard)
+
+    assert sorted(item['section'] for item in items) == list("ABCDEF")
+    assert len({item['id'] for item in items}) == 6
+
+
+def test_all_users_walks_every_page(client, admin_headers):
+    created = {str(create_user(UserRole.teacher, full_name=f"Paged Teacher {n}").id) for n in range(7)}
+
+    items = walk(client, '/admin/all_users', admin_headers, limit=3, role='teacher')
+
+    ids = [item['id'] for item in items]
+    assert len(ids) == len(set(ids))
+    assert created <= set(ids)
+
+
+def test_all_notices_walks_every_page_newest_first(client, admin, admin_headers):
+    admin_id = str(admin.id)
+    created = [client.post('/admin/notice', json={'title': f"Paged notice {n}", 'description': "walk", 'created_by': admin_id,
+                                                  'class_id': None, 'standard': None},
+                           headers=admin_headers).json()['id'] for n in range(5)]
+
+    items = walk(client, '/admin/notice', admin_headers, limit=2, created_by=admin_id)
+
+    ids = [item['id'] for item in items]
+    assert len(ids) == len(set(ids))
+    assert set(created) <= set(ids)
+    # Newest first
+    assert [i for i in ids if i in created] == created[::-1]
+
+
+def test_invalid_cursor_is_rejected(client, admin_headers):
+    response = client.get('/admin/all_classes', params={'cursor': "not-a-cursor"}, headers=admin_headers)
+    assert response.status_code == 400
@@ -0,0 +1,132 @@
+import threading
+import time
+import uuid
+
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.schema import CreateIndex
+
+from conftest import unique_email
+from app.database import SessionLocal
+from app.models.models import Notice
+from app.services import search
+from app.services.table_versions import bump_table_versions
+
+
+class CapturingSession:
+    """Stands in for a PostgreSQL session: keeps the statement instead of running it."""
+
+    def __init__(self):
+        self.statements = []
+
+    def execute(self, statement):
+        self.statements.append(statement)
+        return self
+
+    def all(self):
+        return []
+
+
+def postgres_sql(statement) -> str:
+    return str(statement.compile(dialect=postgresql.dialect(), compile_kwargs={"literal_binds": True}))
+
+
+def test_postgres_notice_search_uses_the_simple_index_expression():
+    db = CapturingSession()
+    search._search_notices_postgres(['examinat'], 5, db)
+    sql = postgres_sql(db.statements[0])
+
+    index = next(index for index in Notice.__table__.indexes if index.name == 'ix_notices_search')
+    expression = str(CreateIndex(index).compile(dialect=postgresql.dialect())).split("USING gin (", 1)[1].rsplit(")", 1)[0]
+    assert "english" not in sql
+    assert "to_tsquery('simple'::regconfig, 'examinat:*')" in sql
+    assert expression in sql.replace("notices.", "")
+
+
+def test_postgres_candidates_are_ordered_before_the_limit():
+    db = CapturingSession()
+    search._search_notices_postgres(['exam'], 5, db)
+    search._search_users_postgres(['stud'], None, 5, db)
+    notices_sql, users_sql = (postgres_sql(statement) for statement in db.statements)
+
+    assert f"ORDER BY notices.created_at DESC, notices.id DESC \n LIMIT {search.SEARCH_CANDIDATES})" in notices_sql
+    assert f"ORDER BY users.created_at DESC, users.id DESC \n LIMIT {search.SEARCH_CANDIDATES})" in users_sql
+
+
+def wait_for(condition, seconds: float = 5):
+    # The in-process index is rebuilt in the background after a write
+    deadline = time.monotonic() + seconds
+    while not condition():
+        assert time.monotonic() < deadline
+        time.sleep(0.05)
+
+
+def test_search_matches_prefixes_and_ranks_titles_first(client, admin, admin_headers):
+    word = "zq" + uuid.uuid4().hex[:6]
+    for title, description in [(f"About {word}ination", "body"), ("Other", f"mentions {word}ination")]:
+        response = client.post('/admin/notice', json={'title': title, 'description': description, 'created_by': str(admin.id),
+                                                      'class_id': None, 'standard': None}, headers=admin_headers)
+        assert response.status_code == 201
+
+    def titles():
+        response = client.get('/search', params={'q': word[:-1], 'kind': 'notices'}, headers=admin_headers)
+        assert response.status_code == 200
+        return [notice['title'] for notice in response.json()['notices']]
+    wait_for(lambda: len(titles()) == 2)
+    assert titles() == [f"About {word}ination", "Other"]
+
+
+def test_search_users_by_email_word_and_role(client, admin_headers):
+    name = "Quillon" + uuid.uuid4().hex[:6]
+    email = unique_email("teacher")
+    response = client.post('/auth/register', json={'full_name': f"{name} Teacher", 'email': email, 'password': "pw", 'role': "teacher"})
+    assert response.status_code == 201
+
+    def users(**params):
+        response = client.get('/search', params={'kind': 'users', **params}, headers=admin_headers)
+        assert response.status_code == 200
+        return [user['email'] for user in response.json()['users']]
+    wait_for(lambda: users(q=name.lower()) == [email])
+    assert users(q=email.split("@")[0]) == [email]
+    assert users(q=name, role='admin') == []
+
+
+def test_search_requires_admin_or_teacher(client):
+    assert client.get('/search', params={'q': "x"}).status_code == 401
+
+
+def test_concurrent_searches_start_one_rebuild(database):
+    builds = []
+    release = threading.Event()
+    indexes = search.LocalSearchIndexes()
+    tables = (f"search_test_{uuid.uuid4().hex[:8]}",)
+
+    def build(db):
+        builds.append(threading.current_thread().name)
+        if len(builds) > 1:
+            release.wait(5)
+        return search.TrigramIndex([])
+
+    db = SessionLocal()
+    try:
+        indexes.get('test', tables, build, db)
+        bump_table_versions(db, *tables)
+        db.commit()
+    finally:
+        db.close()
+
+    def get():
+        session = SessionLocal()
+        try:
+            indexes.get('test', tables, build, session)
+        finally:
+            session.close()
+
+    threads = [threading.Thread(target=get) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    release.set()
+    wait_for(lambda: not indexes._rebuilding)
+
+    assert len(builds) == 2
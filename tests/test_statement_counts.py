@@ -0,0 +1,98 @@
+"""
+The create and assign services build their responses from INSERT ...
+RETURNING: one INSERT into the target table, and no SELECT after it to
+reload what was just written.
+"""
+import re
+import uuid
+
+from conftest import PASSWORD, create_user, unique_email
+from app.models.models import UserRole
+from app.schemas.Class import ClassCreate
+from app.schemas.Notice import NoticeCreate
+from app.schemas.Subject import SubjectCreate
+from app.schemas.Users import StudentAssignClass, TeacherAssignClass, TeacherAssignSubject, UserCreate
+from app.services import admin as admin_services, auth
+from app.services.metrics import recording_statements
+
+_INSERT_INTO = re.compile(r"\s*INSERT INTO (\w+)", re.IGNORECASE)
+
+
+def assert_one_insert_returning(stats, table: str):
+    statements = list(stats.statement_counts)
+    inserts = [i for i, statement in enumerate(statements) if (match := _INSERT_INTO.match(statement)) and match.group(1) == table]
+    assert len(inserts) == 1, statements
+    insert = statements[inserts[0]]
+    assert stats.statement_counts[insert] == 1, statements
+    assert "RETURNING" in insert.upper()
+    follow_ups = [statement for statement in statements[inserts[0] + 1:] if statement.lstrip().upper().startswith("SELECT")]
+    assert follow_ups == []
+
+
+def new_class(db, admin_request):
+    return admin_services.create_class(ClassCreate(standard=50 + uuid.uuid4().int % 1000, section=uuid.uuid4().hex[:4]), db=db, request=admin_request)
+
+
+def test_register(db):
+    with recording_statements() as stats:
+        user = auth.register(UserCreate(full_name="Counted", email=unique_email(), password=PASSWORD, role="student"), db=db)
+    assert user.id and user.created_at
+    assert_one_insert_returning(stats, 'users')
+
+
+def test_create_class(db, admin_request):
+    with recording_statements() as stats:
+        created = new_class(db, admin_request)
+    assert created.standard >= 50
+    assert_one_insert_returning(stats, 'classes')
+
+
+def test_create_subject(db, admin_request):
+    with recording_statements() as stats:
+        created = admin_services.create_subject(SubjectCreate(name=f"Subject {uuid.uuid4().hex[:8]}"), db=db, request=admin_request)
+    assert created.name.startswith("Subject")
+    assert_one_insert_returning(stats, 'subjects')
+
+
+def test_create_notice(db, admin, admin_request):
+    class_id = new_class(db, admin_request).id
+    notice = NoticeCreate(title="Counted", description="notice", created_by=admin.id, class_id=class_id, standard=None)
+    with recording_statements() as stats:
+        created = admin_services.create_notice(noticedata=notice, db=db, request=admin_request)
+    assert created.id and created.class_id == class_id
+    assert_one_insert_returning(stats, 'notices')
+
+
+def test_assign_subjects_to_teachers(db, admin_request):
+    subject = admin_services.create_subject(SubjectCreate(name=f"Subject {uuid.uuid4().hex[:8]}"), db=db, request=admin_request)
+    teachers = [create_user(UserRole.teacher) for _ in range(3)]
+    assignments = [TeacherAssignSubject(teacher_id=teacher.id, subject_id=subject.id) for teacher in teachers]
+
+    with recording_statements() as stats:
+        created = admin_services.assign_subjects_to_teachers(assignments, db=db, request=admin_request)
+    assert [row.user_id for row in created] == [teacher.id for teacher in teachers]
+    assert_one_insert_returning(stats, 'teachers')
+
+
+def test_assign_classes_to_teachers(db, admin_request):
+    subject = admin_services.create_subject(SubjectCreate(name=f"Subject {uuid.uuid4().hex[:8]}"), db=db, request=admin_request)
+    teachers = [create_user(UserRole.teacher) for _ in range(3)]
+    admin_services.assign_subjects_to_teachers([TeacherAssignSubject(teacher_id=t.id, subject_id=subject.id) for t in teachers], db=db, request=admin_request)
+    class_id = new_class(db, admin_request).id
+    assignments = [TeacherAssignClass(teacher_id=teacher.id, class_id=class_id) for teacher in teachers]
+
+    with recording_statements() as stats:
+        created = admin_services.assign_classes_to_teachers(assignments, db=db, request=admin_request)
+    assert len(created) == 3 and {row.class_id for row in created} == {class_id}
+    assert_one_insert_returning(stats, 'teacher_classes')
+
+
+def test_assign_classes_to_students(db, admin_request):
+    class_id = new_class(db, admin_request).id
+    students = [create_user(UserRole.student) for _ in range(3)]
+    assignments = [StudentAssignClass(student_id=student.id, class_id=class_id, roll_number=n) for n, student in enumerate(students, 1)]
+
+    with recording_statements() as stats:
+        created = admin_services.assign_classes_to_students(assignments, db=db, request=admin_request)
+    assert [row.roll_number for row in created] == [1, 2, 3]
+    assert_one_insert_returning(stats, 'students')
@@ -0,0 +1,64 @@
+import uuid
+
+import pytest
+from fastapi import HTTPException
+
+from conftest import create_user
+from app.models.models import UserRole
+from app.schemas.Class import ClassCreate
+from app.schemas.Subject import SubjectCreate
+from app.schemas.Users import TeacherAssignClass, TeacherAssignSubject
+from app.services import admin as admin_services
+
+
+@pytest.fixture
+def teacher_of_two_subjects(db, admin_request):
+    teacher = create_user(UserRole.teacher)
+    subjects = [admin_services.create_subject(SubjectCreate(name=f"Subject {uuid.uuid4().hex[:8]}"), db=db, request=admin_request)
+                for _ in range(2)]
+    profiles = admin_services.assign_subjects_to_teachers(
+        [TeacherAssignSubject(teacher_id=teacher.id, subject_id=subject.id) for subject in subjects], db=db, request=admin_request)
+    new_class = admin_services.create_class(ClassCreate(standard=400 + uuid.uuid4().int % 1000, section=uuid.uuid4().hex[:4]),
+                                            db=db, request=admin_request)
+    return teacher, {profile.subject_id: profile.id for profile in profiles}, new_class
+
+
+def assign(db, admin_request, **assignment):
+    return admin_services.assign_class_to_teacher(TeacherAssignClass(**assignment), db=db, request=admin_request)
+
+
+def test_subject_picks_its_profile(db, admin_request, teacher_of_two_subjects):
+    teacher, profiles, new_class = teacher_of_two_subjects
+
+    created = [assign(db, admin_request, teacher_id=teacher.id, class_id=new_class.id, subject_id=subject_id) for subject_id in profiles]
+
+    assert [row.teacher_id for row in created] == list(profiles.values())
+    with pytest.raises(HTTPException) as raised:
+        assign(db, admin_request, teacher_id=teacher.id, class_id=new_class.id, subject_id=next(iter(profiles)))
+    assert raised.value.status_code == 208
+
+
+def test_without_subject_any_profile_is_a_duplicate(db, admin_request, teacher_of_two_subjects):
+    teacher, profiles, new_class = teacher_of_two_subjects
+    # Through the profile a subject-less assignment would not pick
+    assign(db, admin_request, teacher_id=teacher.id, class_id=new_class.id, subject_id=max(profiles, key=profiles.get))
+
+    with pytest.raises(HTTPException) as raised:
+        assign(db, admin_request, teacher_id=teacher.id, class_id=new_class.id)
+    assert raised.value.status_code == 208
+
+
+def test_without_subject_the_first_profile_is_assigned(db, admin_request, teacher_of_two_subjects):
+    teacher, profiles, new_class = teacher_of_two_subjects
+
+    created = assign(db, admin_request, teacher_id=teacher.id, class_id=new_class.id)
+
+    assert created.teacher_id == min(profiles.values())
+
+
+def test_subject_the_teacher_does_not_teach_is_404(db, admin_request, teacher_of_two_subjects):
+    teacher, _, new_class = teacher_of_two_subjects
+
+    with pytest.raises(HTTPException) as raised:
+        assign(db, admin_request, teacher_id=teacher.id, class_id=new_class.id, subject_id=uuid.uuid4())
+    assert raised.value.status_code == 404